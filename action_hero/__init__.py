@@ -1,68 +1,89 @@
-from action_hero.utils import PipelineAction, DebugAction
-from action_hero.net import (
-    EmailIsValidAction,
-    IPIsValidIPAddressAction,
-    IPIsValidIPv4AddressAction,
-    IPIsValidIPv6AddressAction,
-    URLIsNotReachableAction,
-    URLIsReachableAction,
-    URLWithHTTPResponseStatusCodeAction,
-)
-from action_hero.path import (
-    DirectoryDoesNotExistAction,
-    DirectoryExistsAction,
-    DirectoryIsExecutableAction,
-    DirectoryIsNotExecutableAction,
-    DirectoryIsNotReadableAction,
-    DirectoryIsNotWritableAction,
-    DirectoryIsReadableAction,
-    DirectoryIsValidAction,
-    DirectoryIsWritableAction,
-    EnsureDirectoryAction,
-    EnsureFileAction,
-    FileDoesNotExistAction,
-    FileExistsAction,
-    FileHasExtensionAction,
-    FileIsEmptyAction,
-    FileIsExecutableAction,
-    FileIsNotEmptyAction,
-    FileIsNotExecutableAction,
-    FileIsNotReadableAction,
-    FileIsNotWritableAction,
-    FileIsReadableAction,
-    FileIsWritableAction,
-    PathDoesNotExistsAction,
-    PathExistsAction,
-    PathIsExecutableAction,
-    PathIsNotExecutableAction,
-    PathIsNotReadableAction,
-    PathIsNotWritableAction,
-    PathIsReadableAction,
-    PathIsValidAction,
-    PathIsWritableAction,
-    ResolvePathAction,
-)
-from action_hero.types import (
-    IsConvertibleToFloatAction,
-    IsConvertibleToIntAction,
-    IsConvertibleToUUIDAction,
-    IsFalsyAction,
-    IsTruthyAction,
-)
-from action_hero.misc import (
-    ChoicesAction,
-    CollectIntoDictAction,
-    CollectIntoListAction,
-    CollectIntoTupleAction,
-    ConfirmAction,
-    GetInputAction,
-    GetSecretInputAction,
-    LoadJSONFromFileAction,
-    LoadPickleFromFileAction,
-    LoadYAMLFromFileAction,
-    NotifyAndContinueAction,
-    NotifyAndExitAction,
-)
+"""Make powerful CLIs with argparse actions that pack a punch!
+
+Actions are resolved lazily from their submodules on first attribute access,
+so importing one action only loads the submodule that defines it. e.g.
+`from action_hero import FileIsReadableAction` does not import `requests` or
+`yaml`.
+
+"""
+import importlib
+
+
+# Submodule that each action in the catalog is defined in
+_catalog = {
+    "utils": ["PipelineAction", "DebugAction"],
+    "net": [
+        "EmailIsValidAction",
+        "IPIsValidIPAddressAction",
+        "IPIsValidIPv4AddressAction",
+        "IPIsValidIPv6AddressAction",
+        "URLIsNotReachableAction",
+        "URLIsReachableAction",
+        "URLWithHTTPResponseStatusCodeAction",
+    ],
+    "path": [
+        "DirectoryDoesNotExistAction",
+        "DirectoryExistsAction",
+        "DirectoryIsExecutableAction",
+        "DirectoryIsNotExecutableAction",
+        "DirectoryIsNotReadableAction",
+        "DirectoryIsNotWritableAction",
+        "DirectoryIsReadableAction",
+        "DirectoryIsValidAction",
+        "DirectoryIsWritableAction",
+        "EnsureDirectoryAction",
+        "EnsureFileAction",
+        "FileDoesNotExistAction",
+        "FileExistsAction",
+        "FileHasExtensionAction",
+        "FileIsEmptyAction",
+        "FileIsExecutableAction",
+        "FileIsNotEmptyAction",
+        "FileIsNotExecutableAction",
+        "FileIsNotReadableAction",
+        "FileIsNotWritableAction",
+        "FileIsReadableAction",
+        "FileIsValidAction",
+        "FileIsWritableAction",
+        "PathDoesNotExistsAction",
+        "PathExistsAction",
+        "PathIsExecutableAction",
+        "PathIsNotExecutableAction",
+        "PathIsNotReadableAction",
+        "PathIsNotWritableAction",
+        "PathIsReadableAction",
+        "PathIsValidAction",
+        "PathIsWritableAction",
+        "ResolvePathAction",
+    ],
+    "types": [
+        "IsConvertibleToFloatAction",
+        "IsConvertibleToIntAction",
+        "IsConvertibleToUUIDAction",
+        "IsFalsyAction",
+        "IsTruthyAction",
+    ],
+    "misc": [
+        "ChoicesAction",
+        "ChoicesFromFileAction",
+        "ChoicesFromSortedFileAction",
+        "CollectIntoDictAction",
+        "CollectIntoListAction",
+        "CollectIntoTupleAction",
+        "ConfirmAction",
+        "GetInputAction",
+        "GetSecretInputAction",
+        "LoadJSONFromFileAction",
+        "LoadPickleFromFileAction",
+        "LoadYAMLFromFileAction",
+        "NotifyAndContinueAction",
+        "NotifyAndExitAction",
+    ],
+}
+
+_module_for_name = {
+    name: module for module, names in _catalog.items() for name in names
+}
 
 
 __all__ = [
@@ -119,6 +140,8 @@ __all__ = [
     "IsTruthyAction",
     # misc
     "ChoicesAction",
+    "ChoicesFromFileAction",
+    "ChoicesFromSortedFileAction",
     "CollectIntoDictAction",
     "CollectIntoListAction",
     "CollectIntoTupleAction",
@@ -131,3 +154,33 @@ __all__ = [
     "NotifyAndContinueAction",
     "NotifyAndExitAction",
 ]
+
+
+def __getattr__(name):
+    """Import the catalog action name from its submodule on first access
+
+    The resolved action is saved in the module globals so later lookups don't
+    come through here again.
+
+    Raises:
+        AttributeError: When name is not in the catalog. `from action_hero
+            import name` turns this into an ImportError.
+
+    """
+    try:
+        module = _module_for_name[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        ) from None
+
+    action = getattr(
+        importlib.import_module("{}.{}".format(__name__, module)), name
+    )
+    globals()[name] = action
+    return action
+
+
+def __dir__():
+    """Return module attributes including the not yet loaded catalog"""
+    return sorted(set(globals()) | set(__all__))
@@ -5,10 +5,13 @@ from action_hero.utils import (
     DisplayMessageAndGetInputAction,
     LoadSerializedFileAction,
 )
+from action_hero.misc_utils import FileChoices, SortedFileChoices
 
 
 __all__ = [
     "ChoicesAction",
+    "ChoicesFromFileAction",
+    "ChoicesFromSortedFileAction",
     "CollectIntoDictAction",
     "CollectIntoListAction",
     "CollectIntoTupleAction",
@@ -32,6 +35,59 @@ class ChoicesAction(CheckPresentInValuesAction):
     error_message = "Value(s) not in allowed choices"
 
 
+class ChoicesFromFileAction(ChoicesAction):
+    """Limit options to choices listed one per line in a file
+
+    action_values is a list of the path of the file. Failures come with
+    suggestions of the closest choices.
+
+    Attributes:
+        choices_type (type): Loads choices from the file. See misc_utils.
+
+    """
+
+    choices_type = FileChoices
+
+    def _build_action_values_index(self):
+        if len(self.action_values) != 1 or not isinstance(
+            self.action_values[0], str
+        ):
+            raise ValueError(
+                "action_values has to be a list of the path of one file"
+            )
+        if self.type not in (None, str):
+            raise ValueError("Choices from a file can only be of type str")
+
+        self._chosen_type = str
+        self._action_values_index = self.choices_type(self.action_values[0])
+
+    def _failure_message(self, failures):
+        """Return error message with suggestions for each failure"""
+        reported = []
+        for failure in failures:
+            suggestions = self._action_values_index.suggest(str(failure))
+            if suggestions:
+                reported.append(
+                    "{} (did you mean {}?)".format(
+                        failure, " or ".join(suggestions)
+                    )
+                )
+            else:
+                reported.append(str(failure))
+        return "{}: {}".format(self.error_message, ", ".join(reported))
+
+
+class ChoicesFromSortedFileAction(ChoicesFromFileAction):
+    """Limit options to choices listed one per line in a sorted file
+
+    The file is searched in place, so choices aren't loaded into memory.
+    Lines have to be sorted by their bytes e.g. with `LC_ALL=C sort`.
+
+    """
+
+    choices_type = SortedFileChoices
+
+
 class NotifyAndContinueAction(DisplayMessageAndExitAction):
     """Display message from action_value(s) and continue"""
 
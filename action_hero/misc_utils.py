@@ -0,0 +1,231 @@
+import collections
+import functools
+import mmap
+import os
+import threading
+
+from action_hero.utils import current_parse_scope
+
+
+__all__ = ["FileChoices", "SortedFileChoices", "trigrams"]
+
+
+def trigrams(value):
+    """Return set of 3 character substrings of value padded with spaces
+
+    Padding lets values shorter than 3 characters have trigrams too, and
+    weighs the start and end of value.
+
+    """
+    padded = "  {} ".format(value)
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _closest(value, candidates, limit):
+    """Return up to limit candidates most similar to value, best first"""
+    import difflib
+
+    scored = []
+    for candidate in candidates:
+        ratio = difflib.SequenceMatcher(None, value, candidate).ratio()
+        if ratio >= 0.6:
+            scored.append((-ratio, candidate))
+    return [candidate for _, candidate in sorted(scored)[:limit]]
+
+
+class FileChoices:
+    """Choices listed one per line in a file, loaded into a set
+
+    The file is read on the first lookup, not when created. Suggestions come
+    from a trigram index built on the first suggest(), so only choices
+    sharing trigrams with a value are compared with it.
+
+    Args:
+        path (str): Path of UTF-8 file with one choice per line
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._choices = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._choices is None:
+            with self._lock:
+                if self._choices is None:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._choices = frozenset(
+                            line.rstrip("\r\n") for line in f
+                        )
+        return self._choices
+
+    def __contains__(self, value):
+        return value in self._load()
+
+    def __len__(self):
+        return len(self._load())
+
+    def _trigram_index(self):
+        if self._index is None:
+            choices = self._load()
+            with self._lock:
+                if self._index is None:
+                    index = collections.defaultdict(list)
+                    for choice in choices:
+                        for trigram in trigrams(choice):
+                            index[trigram].append(choice)
+                    self._index = index
+        return self._index
+
+    def suggest(self, value, limit=3):
+        """Return up to limit choices closest to value, best first
+
+        Candidates are the choices sharing the most trigrams with value.
+        Trigrams that most choices share, e.g. of a common prefix, say little
+        about closeness and are skipped once rarer ones found candidates.
+
+        """
+        index = self._trigram_index()
+        postings = sorted(
+            (index[t] for t in trigrams(value) if t in index), key=len
+        )
+        common = max(len(self._load()) // 10, 100)
+
+        shared = collections.Counter()
+        for posting in postings:
+            if len(posting) > common and shared:
+                break
+            shared.update(posting)
+        candidates = [choice for choice, _ in shared.most_common(limit * 10)]
+        return _closest(value, candidates, limit)
+
+
+def _map_file(path):
+    """Return contents of file at path mapped into memory"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be memory mapped
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _unmap(data):
+    """Unmap data returned by _map_file"""
+    if isinstance(data, mmap.mmap):
+        data.close()
+
+
+def _line(data, start):
+    """Return line of data starting at offset start and the offset it ends
+    at"""
+    end = data.find(b"\n", start)
+    if end == -1:
+        end = len(data)
+    return data[start:end].rstrip(b"\r"), end
+
+
+def _bisect(data, target):
+    """Return offset of first line of sorted data not less than target, and
+    whether that line is target"""
+    low, high = 0, len(data)
+    while low < high:
+        middle = (low + high) // 2
+        start = data.rfind(b"\n", low, middle) + 1 or low
+        line, end = _line(data, start)
+        if line < target:
+            low = end + 1
+        else:
+            high = start
+    return low, low < len(data) and _line(data, low)[0] == target
+
+
+class SortedFileChoices:
+    """Choices listed one per line in a sorted file, searched in place
+
+    The file is memory mapped and searched with a binary search over its
+    bytes, so choices are never loaded into memory and files with millions
+    of lines are cheap to use. Lines have to be sorted by their UTF-8 bytes,
+    e.g. with `LC_ALL=C sort`.
+
+    Suggestions are the choices around where value would be in the file,
+    i.e. those sharing the longest prefix with value.
+
+    Within a parse the file is mapped once per ParseScope and unmapped when
+    the scope closes, so parses in other threads never have it unmapped
+    under them. Outside a parse it stays mapped until close(). Use it as a
+    context manager to close it then.
+
+    Args:
+        path (str): Path of sorted UTF-8 file with one choice per line
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        self._lock = threading.Lock()
+
+    def _map(self):
+        """Return the file's contents mapped into memory"""
+        scope = current_parse_scope()
+        if scope is not None:
+            return scope.get(
+                ("sorted_file_choices", self.path),
+                functools.partial(_map_file, self.path),
+                close=_unmap,
+            )
+
+        with self._lock:
+            if self._mmap is None:
+                self._mmap = _map_file(self.path)
+            return self._mmap
+
+    def __contains__(self, value):
+        if not isinstance(value, str):
+            return False
+        return _bisect(self._map(), value.encode("utf-8"))[1]
+
+    def suggest(self, value, limit=3):
+        """Return up to limit choices closest to value, best first
+
+        Candidates are the lines around where value would be in the file.
+
+        """
+        data = self._map()
+        offset, _ = _bisect(data, value.encode("utf-8"))
+
+        candidates = []
+        # Lines after
+        start = offset
+        while start < len(data) and len(candidates) < limit * 5:
+            line, end = _line(data, start)
+            candidates.append(line)
+            start = end + 1
+        # Lines before
+        end = offset - 1
+        for _ in range(limit * 5):
+            if end < 0:
+                break
+            start = data.rfind(b"\n", 0, end) + 1
+            candidates.append(_line(data, start)[0])
+            end = start - 1
+
+        return _closest(
+            value,
+            [line.decode("utf-8", "replace") for line in candidates],
+            limit,
+        )
+
+    def close(self):
+        """Unmap the file mapped outside a parse"""
+        with self._lock:
+            _unmap(self._mmap)
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
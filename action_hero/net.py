@@ -1,7 +1,19 @@
+import collections
+import contextvars
+import functools
+import numbers
+import time
+
 from action_hero.utils import CheckAction, CheckPresentInValuesAction
 
 from action_hero.net_utils import (
+    DEFAULT_TIMEOUT,
+    PROBES,
+    DeadlineExceeded,
+    call_with_request_options,
+    current_request_options,
     is_reachable_url,
+    request_options,
     is_valid_ip_address,
     is_valid_ipv4_address,
     is_valid_ipv6_address,
@@ -49,14 +61,225 @@ class IPIsValidIPAddressAction(CheckAction):
     error_message = "Invalid ip address(es)"
 
 
-class URLIsReachableAction(CheckAction):
+# Ways of running requests over values. See _URLActionMixin.engine
+ENGINES = ["requests", "asyncio"]
+
+# Values left unchecked by the URL action call in progress, as its deadline
+# passed
+_values_not_checked = contextvars.ContextVar("action_hero_values_not_checked")
+
+
+def _is_positive_number(value):
+    return isinstance(value, numbers.Real) and value > 0
+
+
+class _URLActionMixin:
+    """Request options for actions that make HTTP requests to their values
+
+    Requests are made with the pooled session shared by all network actions
+    within one parse, so connections to a host are kept alive and reused.
+
+    Attributes:
+        max_connections_per_host (int): Most connections kept open to one
+            host. Can be passed in with add_argument.
+        probe (str): How URLs are requested, one of net_utils.PROBES. "head"
+            and "stream" don't download response bodies. Can be passed in
+            with add_argument.
+        timeout (float/(float, float)): Seconds to wait for a connection and
+            for each response, as one value for both or a (connect, read)
+            tuple. Can be passed in with add_argument.
+        deadline (float): Seconds one call of the action may spend over all
+            its values. Values not checked by then are reported as failures
+            that were not checked. None for no deadline. Can be passed in
+            with add_argument.
+        engine (str): How requests are made over lists of values, one of
+            ENGINES:
+            "requests": One at a time with requests, or with workers
+            "asyncio": All at once with asyncio before checking, reading
+                only the status line and headers of each response
+            Can be passed in with add_argument.
+        concurrency (int): Most requests in flight at once across all hosts
+            with the "asyncio" engine. Can be passed in with add_argument.
+        cache (net_cache_utils.URLCache): Persistent cache of status codes
+            used instead of requesting URLs checked recently. None for no
+            cache. Can be passed in with add_argument, also as True for the
+            default cache in the user's cache directory.
+
+    """
+
+    max_connections_per_host = 10
+    probe = "get"
+    timeout = DEFAULT_TIMEOUT
+    deadline = None
+    engine = "requests"
+    concurrency = 100
+    cache = None
+
+    def __init__(
+        self,
+        *args,
+        max_connections_per_host=None,
+        probe=None,
+        timeout=None,
+        deadline=None,
+        engine=None,
+        concurrency=None,
+        cache=None,
+        **kwargs
+    ):
+        if max_connections_per_host is not None:
+            if (
+                not isinstance(max_connections_per_host, int)
+                or max_connections_per_host < 1
+            ):
+                raise ValueError(
+                    "max_connections_per_host has to be a positive int"
+                )
+            self.max_connections_per_host = max_connections_per_host
+
+        if probe is not None:
+            if probe not in PROBES:
+                raise ValueError(
+                    "probe has to be one of: {}".format(", ".join(PROBES))
+                )
+            self.probe = probe
+
+        if timeout is not None:
+            if not (
+                _is_positive_number(timeout)
+                or isinstance(timeout, tuple)
+                and len(timeout) == 2
+                and all(_is_positive_number(t) for t in timeout)
+            ):
+                raise ValueError(
+                    "timeout has to be a positive number or a tuple of two "
+                    "positive numbers (connect, read)"
+                )
+            self.timeout = timeout
+
+        if deadline is not None:
+            if not _is_positive_number(deadline):
+                raise ValueError("deadline has to be a positive number")
+            self.deadline = deadline
+
+        if engine is not None:
+            if engine not in ENGINES:
+                raise ValueError(
+                    "engine has to be one of: {}".format(", ".join(ENGINES))
+                )
+            self.engine = engine
+
+        if concurrency is not None:
+            if not isinstance(concurrency, int) or concurrency < 1:
+                raise ValueError("concurrency has to be a positive int")
+            self.concurrency = concurrency
+
+        if cache is not None and cache is not False:
+            # Import sqlite3 on first use to keep importing net cheap
+            from action_hero.net_cache_utils import (
+                URLCache,
+                default_url_cache,
+            )
+
+            if cache is True:
+                cache = default_url_cache()
+            elif not isinstance(cache, URLCache):
+                raise ValueError(
+                    "cache has to be True or a net_cache_utils.URLCache"
+                )
+            self.cache = cache
+
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def _run_user_func(cls, value, memo_cache=None):
+        """Runs cls.func over value, noting value as not checked once the
+        deadline has passed"""
+        try:
+            return super()._run_user_func(value, memo_cache)
+        except DeadlineExceeded:
+            _values_not_checked.get().append(value)
+            # None is neither truthy nor an expected status code, so the
+            # value counts as a failure
+            return None
+
+    def _process_func(self):
+        """Return func run in worker processes with the request options of
+        this call, as worker processes are shared between actions"""
+        return functools.partial(
+            call_with_request_options,
+            current_request_options(),
+            super()._process_func(),
+        )
+
+    def _failure_message(self, failures):
+        """Return error message listing failures apart from values that
+        weren't checked before the deadline"""
+        not_checked = _values_not_checked.get()
+        if not not_checked:
+            return super()._failure_message(failures)
+
+        # Split failures into those checked and those not checked
+        not_checked_counts = collections.Counter(not_checked)
+        checked_failures = []
+        not_checked_failures = []
+        for value in failures:
+            if not_checked_counts[value] > 0:
+                not_checked_counts[value] -= 1
+                not_checked_failures.append(value)
+            else:
+                checked_failures.append(value)
+
+        messages = []
+        if checked_failures:
+            messages.append(super()._failure_message(checked_failures))
+        messages.append(
+            "Value(s) not checked (deadline): {}".format(
+                ", ".join(not_checked_failures)
+            )
+        )
+        return "; ".join(messages)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        deadline = (
+            None if self.deadline is None else time.monotonic() + self.deadline
+        )
+        token = _values_not_checked.set([])
+        try:
+            with request_options(
+                max_connections_per_host=self.max_connections_per_host,
+                probe=self.probe,
+                timeout=self.timeout,
+                deadline=deadline,
+                cache=self.cache,
+            ):
+                status_codes = None
+                if self.engine == "asyncio" and isinstance(values, list):
+                    # Import asyncio on first use to keep importing net cheap
+                    from action_hero.net_async_utils import (
+                        fetch_status_codes,
+                    )
+
+                    status_codes = fetch_status_codes(
+                        values, concurrency=self.concurrency
+                    )
+
+                with request_options(status_codes=status_codes):
+                    super().__call__(
+                        parser, namespace, values, option_string
+                    )
+        finally:
+            _values_not_checked.reset(token)
+
+
+class URLIsReachableAction(_URLActionMixin, CheckAction):
     """Check if URL is reachable"""
 
     func = is_reachable_url
     error_message = "Unreachable URL(s)"
 
 
-class URLIsNotReachableAction(CheckAction):
+class URLIsNotReachableAction(_URLActionMixin, CheckAction):
     """Check if URL is not reachable"""
 
     def func(value):
@@ -65,7 +288,9 @@ class URLIsNotReachableAction(CheckAction):
     error_message = "Reachable URL(s)"
 
 
-class URLWithHTTPResponseStatusCodeAction(CheckPresentInValuesAction):
+class URLWithHTTPResponseStatusCodeAction(
+    _URLActionMixin, CheckPresentInValuesAction
+):
     """Check if supplied URL responds with status code in action_values"""
 
     func = status_code_from_response_to_request_url
@@ -0,0 +1,284 @@
+import asyncio
+import collections
+import concurrent.futures
+import contextvars
+import functools
+import ssl
+import time
+import urllib.parse
+
+from action_hero.net_utils import (
+    _HEAD_REJECTED_STATUS_CODES,
+    current_request_options,
+)
+
+
+__all__ = ["DEFAULT_CONCURRENCY", "fetch_status_codes"]
+
+
+# Most requests in flight at once across all hosts
+DEFAULT_CONCURRENCY = 100
+
+# Status codes of responses redirecting to their Location header
+_REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+
+# Most redirects followed for one URL, as with requests
+_MAX_REDIRECTS = 30
+
+# Exceptions that make a URL unreachable, like a RequestException would
+_REQUEST_ERRORS = (
+    OSError,
+    EOFError,
+    ValueError,
+    asyncio.TimeoutError,
+    asyncio.LimitOverrunError,
+)
+
+
+# Characters left unquoted in request targets, apart from letters and digits
+_SAFE_PATH_CHARACTERS = "/%:@!$&'()*+,;=~"
+
+
+class _TooManyRedirects(ValueError):
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def _default_ssl_context():
+    return ssl.create_default_context()
+
+
+def _split_timeout(timeout):
+    """Return timeout as a (connect, read) tuple"""
+    return timeout if isinstance(timeout, tuple) else (timeout, timeout)
+
+
+def _host_key(parts):
+    return parts.scheme, parts.hostname, parts.port
+
+
+def _request_target(parts):
+    """Return path and query of URL quoted for the request line, as requests
+    quotes them"""
+    target = urllib.parse.quote(parts.path or "/", safe=_SAFE_PATH_CHARACTERS)
+    if parts.query:
+        target += "?" + urllib.parse.quote(
+            parts.query, safe=_SAFE_PATH_CHARACTERS + "?"
+        )
+    return target
+
+
+def _host_header(parts):
+    """Return host and port of URL for the Host header, with international
+    host names IDNA encoded"""
+    host = parts.hostname
+    if ":" in host:
+        # IPv6 addresses keep their brackets
+        host = "[{}]".format(host)
+    else:
+        host = host.encode("idna").decode("ascii")
+    if parts.port is not None:
+        host += ":{}".format(parts.port)
+    return host
+
+
+async def _fetch_response_head(method, parts):
+    """Return status code and Location header of response to request
+
+    Only the status line and headers of the response are read. The
+    connection is closed after.
+
+    Args:
+        method (str): HTTP method of the request
+        parts (urllib.parse.SplitResult): URL to request
+
+    """
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("Unsupported URL: {}".format(parts.geturl()))
+
+    https = parts.scheme == "https"
+    connect_timeout, read_timeout = _split_timeout(
+        current_request_options().remaining_timeout()
+    )
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            parts.hostname,
+            parts.port or (443 if https else 80),
+            ssl=_default_ssl_context() if https else None,
+        ),
+        connect_timeout,
+    )
+    try:
+        writer.write(
+            (
+                "{} {} HTTP/1.1\r\n"
+                "Host: {}\r\n"
+                "User-Agent: action_hero\r\n"
+                "Accept: */*\r\n"
+                "Connection: close\r\n"
+                "\r\n"
+            )
+            .format(method, _request_target(parts), _host_header(parts))
+            .encode("ascii")
+        )
+        head = await asyncio.wait_for(
+            reader.readuntil(b"\r\n\r\n"), read_timeout
+        )
+    finally:
+        writer.close()
+
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    version, status_code = (status_line.split(None, 2) + [""])[:2]
+    if not version.startswith("HTTP/") or not status_code.isdigit():
+        raise ValueError("Invalid status line: {}".format(status_line))
+
+    location = None
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "location":
+            location = value.strip()
+    return int(status_code), location
+
+
+async def _fetch_status_code(url, limit, host_limits):
+    """Return status code of response to requesting url
+
+    Redirects are followed and HEAD requests rejected by the server are
+    retried as GET, as _probe does with requests.
+
+    """
+    method = "HEAD" if current_request_options().probe == "head" else "GET"
+    async with limit:
+        for _ in range(_MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            async with host_limits[_host_key(parts)]:
+                status_code, location = await _fetch_response_head(
+                    method, parts
+                )
+
+            if method == "HEAD" and (
+                status_code in _HEAD_REJECTED_STATUS_CODES
+            ):
+                method = "GET"
+            elif status_code in _REDIRECT_STATUS_CODES and location:
+                url = urllib.parse.urljoin(url, location)
+            else:
+                return status_code
+
+    raise _TooManyRedirects("Exceeded {} redirects".format(_MAX_REDIRECTS))
+
+
+async def _fetch_status_code_or_none(url, limit, host_limits):
+    """Return status code of response to requesting url, None on failure
+
+    Raises:
+        DeadlineExceeded: When the deadline passed before or while requesting
+
+    """
+    try:
+        return await _fetch_status_code(url, limit, host_limits)
+    except _REQUEST_ERRORS:
+        # Raise DeadlineExceeded instead when the deadline came first
+        current_request_options().remaining_timeout()
+        return None
+
+
+async def _fetch_status_codes(urls, concurrency):
+    max_connections_per_host = (
+        current_request_options().max_connections_per_host
+    )
+    limit = asyncio.Semaphore(concurrency)
+    host_limits = collections.defaultdict(
+        lambda: asyncio.Semaphore(max_connections_per_host)
+    )
+    tasks = {
+        url: asyncio.ensure_future(
+            _fetch_status_code_or_none(url, limit, host_limits)
+        )
+        for url in urls
+    }
+    if not tasks:
+        return {}
+
+    deadline = current_request_options().deadline
+    done, pending = await asyncio.wait(
+        tasks.values(),
+        timeout=None
+        if deadline is None
+        else max(deadline - time.monotonic(), 0),
+    )
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    return {
+        url: task.result()
+        for url, task in tasks.items()
+        if task in done and task.exception() is None
+    }
+
+
+def _run_in_new_event_loop(coroutine):
+    """Return result of running coroutine to completion on a new event loop
+
+    The loop runs in this thread unless one is running here already, e.g.
+    when parse_args is called from a coroutine, in which case it runs in
+    another thread.
+
+    """
+
+    def run():
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+
+    context = contextvars.copy_context()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(context.run, run).result()
+
+
+def fetch_status_codes(urls, concurrency=DEFAULT_CONCURRENCY):
+    """Return status codes of responses to requesting urls concurrently
+
+    Requests are made with asyncio streams on an event loop of their own, as
+    set by RequestOptions: up to max_connections_per_host at once to any one
+    host, with the probe, timeout and deadline in effect. Only the status
+    line and headers of each response are read, whatever the probe. Urls in
+    the cache in effect aren't requested, and those requested are cached.
+
+    Args:
+        urls (iterable[str]): URLs to request
+        concurrency (int): Most requests in flight at once across all hosts
+
+    Returns:
+        dict[str, int]: Status code per url, None for urls that could not be
+            requested. Urls not requested before the deadline are left out.
+
+    """
+    options = current_request_options()
+    urls = set(urls)
+
+    cached = {}
+    if options.cache is not None:
+        for url in urls:
+            try:
+                cached[url] = options.cache.get(url, options.probe)
+            except KeyError:
+                pass
+
+    status_codes = _run_in_new_event_loop(
+        _fetch_status_codes(urls.difference(cached), concurrency)
+    )
+    if options.cache is not None and status_codes:
+        options.cache.set_many(options.probe, status_codes)
+
+    status_codes.update(cached)
+    return status_codes
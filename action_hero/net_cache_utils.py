@@ -0,0 +1,262 @@
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+
+__all__ = ["URLCache", "default_url_cache", "user_cache_directory"]
+
+
+def user_cache_directory():
+    """Return directory for action_hero's caches in the user's cache dir
+
+    That is %LOCALAPPDATA% on Windows, ~/Library/Caches on macOS and
+    $XDG_CACHE_HOME, or ~/.cache, elsewhere.
+
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            os.path.join("~", "AppData", "Local")
+        )
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            os.path.join("~", ".cache")
+        )
+    return os.path.join(base, "action_hero")
+
+
+class URLCache:
+    """Persistent cache of status codes of responses to URLs
+
+    Entries live in a sqlite database, keyed by URL and the probe it was
+    requested with, so they outlive the process and are shared by every
+    process using the same file. Entries expire after ttl seconds, or
+    negative_ttl seconds for URLs that couldn't be requested or responded
+    with an error. Once there are more than max_entries, expired and then
+    the least recently used entries are evicted down to nine tenths of
+    max_entries, so evicting is rare however many URLs are cached.
+
+    Hits are remembered in memory and written to the database in one go,
+    along with the next entries cached or once ACCESSES_KEPT have been
+    remembered.
+
+    A cache that can't be read or written is treated as empty, so it never
+    makes a check fail.
+
+    Args:
+        path (str): Path of the database file. Defaults to urls.sqlite3 in
+            user_cache_directory().
+        ttl (float): Seconds successful responses are cached for
+        negative_ttl (float): Seconds failures are cached for
+        max_entries (int): Most entries kept
+
+    """
+
+    # Most hits remembered before their access times are written
+    ACCESSES_KEPT = 1000
+
+    def __init__(
+        self, path=None, ttl=300, negative_ttl=60, max_entries=10000
+    ):
+        if path is None:
+            path = os.path.join(user_cache_directory(), "urls.sqlite3")
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._connection = None
+        # Entries in the database, counting ones written since the last
+        # eviction. Other processes writing to it make it an estimate.
+        self._entries = 0
+        # Access time per (url, probe) of hits not written yet
+        self._accessed = {}
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Return connection to the database, creating it on first use"""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Lookups come from worker threads too, serialised by _lock
+            connection = sqlite3.connect(
+                self.path, timeout=5, check_same_thread=False
+            )
+            with connection:
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.execute("PRAGMA synchronous = NORMAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS urls ("
+                    "url TEXT NOT NULL, "
+                    "probe TEXT NOT NULL, "
+                    "status_code INTEGER, "
+                    "expires REAL NOT NULL, "
+                    "accessed REAL NOT NULL, "
+                    "PRIMARY KEY (url, probe))"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS urls_accessed "
+                    "ON urls (accessed)"
+                )
+            self._entries = connection.execute(
+                "SELECT COUNT(*) FROM urls"
+            ).fetchone()[0]
+            self._connection = connection
+        return self._connection
+
+    def _write_accesses(self, connection):
+        """Write access times of remembered hits, within a transaction"""
+        if self._accessed:
+            connection.executemany(
+                "UPDATE urls SET accessed = ? "
+                "WHERE url = ? AND probe = ? AND accessed < ?",
+                [
+                    (accessed, url, probe, accessed)
+                    for (url, probe), accessed in self._accessed.items()
+                ],
+            )
+            self._accessed.clear()
+
+    def _evict(self, connection, now):
+        """Evict expired, then least recently used, entries down to nine
+        tenths of max_entries, within a transaction"""
+        connection.execute("DELETE FROM urls WHERE expires <= ?", (now,))
+        connection.execute(
+            "DELETE FROM urls WHERE rowid IN ("
+            "SELECT rowid FROM urls ORDER BY accessed DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_entries - self.max_entries // 10,),
+        )
+        self._entries = connection.execute(
+            "SELECT COUNT(*) FROM urls"
+        ).fetchone()[0]
+
+    def _is_negative(self, status_code):
+        return status_code is None or 400 <= status_code < 600
+
+    def get(self, url, probe):
+        """Return cached status code of url, None if it couldn't be requested
+
+        Raises:
+            KeyError: When url isn't cached or its entry has expired
+
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT status_code FROM urls "
+                    "WHERE url = ? AND probe = ? AND expires > ?",
+                    (url, probe, now),
+                ).fetchone()
+                if row is not None:
+                    self._accessed[(url, probe)] = now
+                    if len(self._accessed) >= self.ACCESSES_KEPT:
+                        with connection:
+                            self._write_accesses(connection)
+        except (OSError, sqlite3.Error):
+            row = None
+
+        if row is None:
+            raise KeyError((url, probe))
+        return row[0]
+
+    def set(self, url, probe, status_code):
+        """Cache status code of url, None if it couldn't be requested"""
+        self.set_many(probe, {url: status_code})
+
+    def set_many(self, probe, status_codes):
+        """Cache status codes of urls in one transaction
+
+        Args:
+            probe (str): Probe the urls were requested with
+            status_codes (dict[str, int]): Status code per url
+
+        """
+        now = time.time()
+        rows = [
+            (
+                url,
+                probe,
+                status_code,
+                now
+                + (
+                    self.negative_ttl
+                    if self._is_negative(status_code)
+                    else self.ttl
+                ),
+                now,
+            )
+            for url, status_code in status_codes.items()
+        ]
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    self._write_accesses(connection)
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO urls "
+                        "(url, probe, status_code, expires, accessed) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    # Replaced entries are counted too, overestimating
+                    self._entries += len(rows)
+                    if self._entries > self.max_entries:
+                        self._evict(connection, now)
+        except (OSError, sqlite3.Error):
+            pass
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM urls")
+            self._entries = 0
+            self._accessed.clear()
+
+    def __len__(self):
+        with self._lock:
+            return (
+                self._connect()
+                .execute("SELECT COUNT(*) FROM urls")
+                .fetchone()[0]
+            )
+
+    def close(self):
+        """Write access times of remembered hits and close connection to the
+        database"""
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    with self._connection:
+                        self._write_accesses(self._connection)
+                except sqlite3.Error:
+                    pass
+                self._connection.close()
+                self._connection = None
+
+
+_default_url_cache = None
+_default_url_cache_lock = threading.Lock()
+
+
+def default_url_cache():
+    """Return URLCache with default settings shared within this process
+
+    It is closed at exit, which writes the access times of its hits.
+
+    """
+    global _default_url_cache
+    with _default_url_cache_lock:
+        if _default_url_cache is None:
+            _default_url_cache = URLCache()
+            atexit.register(_default_url_cache.close)
+        return _default_url_cache
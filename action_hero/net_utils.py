@@ -1,18 +1,309 @@
+import contextlib
+import contextvars
 import ipaddress
 import re
+import time
+
+from action_hero.utils import current_parse_scope
 
-import requests
 
 __all__ = [
+    "DEFAULT_TIMEOUT",
+    "DeadlineExceeded",
+    "PROBES",
+    "RequestOptions",
+    "call_with_request_options",
+    "create_session",
+    "current_request_options",
+    "get_session",
     "is_reachable_url",
     "is_valid_email",
     "is_valid_ip_address",
     "is_valid_ipv4_address",
     "is_valid_ipv6_address",
+    "request_options",
+    "session_factory",
     "status_code_from_response_to_request_url",
 ]
 
 
+# Seconds to wait for a connection and then for the response to a request
+DEFAULT_TIMEOUT = (10, 30)
+
+# Ways of requesting a URL. See RequestOptions.probe
+PROBES = ["get", "head", "stream"]
+
+# Status codes servers reject HEAD requests with
+_HEAD_REJECTED_STATUS_CODES = (405, 501)
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of making a request once the deadline has passed"""
+
+
+class RequestOptions:
+    """Options for HTTP requests made by the functions in this module
+
+    Network actions set these for the duration of their call with
+    request_options, so the functions they run over values pick them up.
+
+    Attributes:
+        max_connections_per_host (int): Most connections kept open to one
+            host by the pooled session
+        probe (str): How a URL is requested, one of PROBES:
+            "get": GET the whole response
+            "head": HEAD, falling back to "stream" when HEAD is rejected
+            "stream": GET and close the response after its headers arrive
+        timeout (float/(float, float)): Seconds to wait for a connection and
+            for the response, as one value for both or a (connect, read)
+            tuple
+        deadline (float): time.monotonic() after which no more requests are
+            made and DeadlineExceeded is raised instead. None for no
+            deadline.
+        status_codes (dict[str, int]): Status codes of URLs fetched ahead,
+            e.g. by net_async_utils.fetch_status_codes, used instead of
+            requesting those URLs again. None when nothing was fetched.
+        cache (net_cache_utils.URLCache): Cache of status codes consulted
+            before making a request and updated after. None for no cache.
+
+    """
+
+    __slots__ = (
+        "max_connections_per_host",
+        "probe",
+        "timeout",
+        "deadline",
+        "status_codes",
+        "cache",
+    )
+
+    def __init__(
+        self,
+        max_connections_per_host=10,
+        probe="get",
+        timeout=DEFAULT_TIMEOUT,
+        deadline=None,
+        status_codes=None,
+        cache=None,
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.probe = probe
+        self.timeout = timeout
+        self.deadline = deadline
+        self.status_codes = status_codes
+        self.cache = cache
+
+    def remaining_timeout(self):
+        """Return timeout shortened to end by the deadline
+
+        Raises:
+            DeadlineExceeded: When the deadline has passed
+
+        """
+        if self.deadline is None:
+            return self.timeout
+
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded()
+
+        if isinstance(self.timeout, tuple):
+            return tuple(min(t, remaining) for t in self.timeout)
+        return min(self.timeout, remaining)
+
+    def replace(self, **options):
+        """Return copy of these options with options replaced"""
+        replaced = RequestOptions.__new__(RequestOptions)
+        for name in self.__slots__:
+            setattr(replaced, name, options.pop(name, getattr(self, name)))
+        if options:
+            raise ValueError(
+                "Unknown request option(s): {}".format(", ".join(options))
+            )
+        return replaced
+
+
+_request_options = contextvars.ContextVar(
+    "action_hero_request_options", default=RequestOptions()
+)
+
+
+def current_request_options():
+    """Return RequestOptions in effect"""
+    return _request_options.get()
+
+
+@contextlib.contextmanager
+def request_options(**options):
+    """Context manager that sets request options for requests made within
+
+    Options not given keep their current value.
+
+    """
+    token = _request_options.set(_request_options.get().replace(**options))
+    try:
+        yield
+    finally:
+        _request_options.reset(token)
+
+
+def call_with_request_options(options, func, value):
+    """Return func(value) with options, a RequestOptions, in effect
+
+    Used to run func in worker processes, which don't share the request
+    options of the action running it.
+
+    """
+    token = _request_options.set(options)
+    try:
+        return func(value)
+    finally:
+        _request_options.reset(token)
+
+
+def create_session(max_connections_per_host=10, max_hosts=100):
+    """Return requests.Session pooling connections per host
+
+    Args:
+        max_connections_per_host (int): Most connections kept open to one
+            host. Requests wait for a free connection beyond that.
+        max_hosts (int): Most hosts to keep connection pools for
+
+    """
+    import requests
+
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=max_hosts,
+        pool_maxsize=max_connections_per_host,
+        pool_block=True,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Called with max_connections_per_host to create the session requests are
+# made with. Replace it to plug in another transport with the interface of
+# requests.Session.
+session_factory = create_session
+
+
+def get_session():
+    """Return pooled session of the parse in progress, or None when not
+    parsing
+
+    All network actions within one ParseScope share this session, and so
+    share kept alive connections and the host lookups made for them. It is
+    closed along with the ParseScope.
+
+    """
+    scope = current_parse_scope()
+    if scope is None:
+        return None
+
+    options = current_request_options()
+    max_connections_per_host = options.max_connections_per_host
+    return scope.get(
+        ("http_session", max_connections_per_host),
+        lambda: session_factory(
+            max_connections_per_host=max_connections_per_host
+        ),
+    )
+
+
+def _request(method, url, **kwargs):
+    """Return response to request made with the session of the parse
+
+    Outside a parse, a session is created for the request and closed after.
+    Requests time out as set in RequestOptions.
+
+    Raises:
+        DeadlineExceeded: When the deadline passed before or while making the
+            request
+
+    """
+    import requests
+
+    options = current_request_options()
+    kwargs["timeout"] = options.remaining_timeout()
+
+    try:
+        session = get_session()
+        if session is not None:
+            return session.request(method, url, **kwargs)
+
+        with contextlib.closing(
+            session_factory(
+                max_connections_per_host=options.max_connections_per_host
+            )
+        ) as session:
+            return session.request(method, url, **kwargs)
+
+    except requests.exceptions.Timeout:
+        # Timed out because the deadline came first
+        options.remaining_timeout()
+        raise
+
+
+def _probe(url):
+    """Return response to requesting url as set by RequestOptions.probe
+
+    Responses of "head" and "stream" probes have no body.
+
+    """
+    probe = current_request_options().probe
+    if probe == "get":
+        return _request("GET", url)
+
+    if probe == "head":
+        response = _request("HEAD", url, allow_redirects=True)
+        if response.status_code not in _HEAD_REJECTED_STATUS_CODES:
+            return response
+
+    # Stream the response and close it before any of the body is read
+    response = _request("GET", url, stream=True)
+    response.close()
+    return response
+
+
+def _status_code(url):
+    """Return status code of response to requesting url, or None when url
+    couldn't be requested
+
+    Status codes fetched ahead and cached, as set by RequestOptions, are
+    used before making a request. Requests made are cached.
+
+    """
+    # Import requests on first use to keep importing net_utils cheap
+    import requests
+
+    options = current_request_options()
+    if options.status_codes is not None and url in options.status_codes:
+        return options.status_codes[url]
+
+    cache = options.cache
+    if cache is not None:
+        try:
+            status_code = cache.get(url, options.probe)
+        except KeyError:
+            pass
+        else:
+            from action_hero.profile_utils import count_cache_hit
+
+            count_cache_hit()
+            return status_code
+
+    try:
+        status_code = _probe(url).status_code
+    except requests.exceptions.RequestException:
+        status_code = None
+
+    if cache is not None:
+        cache.set(url, options.probe, status_code)
+    return status_code
+
+
 def is_valid_email(email):
     """Return True if email is valid
 
@@ -53,21 +344,12 @@ def is_valid_ip_address(ip):
 
 def is_reachable_url(url):
     """Return True if url is reachable"""
-
-    try:
-        # raise_for_status() raises an exception on fail, else None
-        requests.get(url).raise_for_status()
-        return True
-
-    except requests.exceptions.RequestException:
-        return False
+    status_code = _status_code(url)
+    # Like raise_for_status(), deem 4xx and 5xx responses failures
+    return status_code is not None and not 400 <= status_code < 600
 
 
 def status_code_from_response_to_request_url(url):
     """Return status code from response to request url"""
-
-    try:
-        return str(requests.get(url).status_code)
-
-    except requests.exceptions.RequestException:
-        return None
+    status_code = _status_code(url)
+    return None if status_code is None else str(status_code)
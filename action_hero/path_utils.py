@@ -1,13 +1,21 @@
 import os
 import stat
 import pathlib
+import threading
+
+from action_hero.utils import current_parse_scope, invalidate_memoized
 
 
 __all__ = [
+    "PathStatus",
+    "StatCache",
     "add_execute_permission",
     "create_directory",
     "create_file",
     "get_extension",
+    "get_path_status",
+    "get_stat_cache",
+    "invalidate_path_status",
     "is_empty_file",
     "is_executable_directory",
     "is_executable_file",
@@ -30,9 +38,25 @@ __all__ = [
     "remove_read_permission",
     "remove_write_permission",
     "resolve_path",
+    "stat_path",
 ]
 
 
+# Owner, group and other permission bits that grant each os.access mode
+_PERMISSION_BITS = {
+    os.R_OK: (stat.S_IRUSR, stat.S_IRGRP, stat.S_IROTH),
+    os.W_OK: (stat.S_IWUSR, stat.S_IWGRP, stat.S_IWOTH),
+    os.X_OK: (stat.S_IXUSR, stat.S_IXGRP, stat.S_IXOTH),
+}
+
+# Longest allowed file name in bytes on each device (by st_dev). Filled
+# lazily.
+_maximum_name_lengths = {}
+
+# Assumed longest file name when the file system can't be asked
+_DEFAULT_MAXIMUM_NAME_LENGTH = 255
+
+
 def get_extension(path):
     """Get file extension/prefix
 
@@ -66,6 +90,7 @@ def create_file(path):
         path (str): Path to create file
     """
     pathlib.Path(path).touch(exist_ok=True)
+    invalidate_path_status(path)
 
 
 def create_directory(path):
@@ -78,6 +103,275 @@ def create_directory(path):
         FileExistsError: Raised if path is already present
     """
     os.mkdir(path)
+    invalidate_path_status(path)
+
+
+def stat_path(path):
+    """Return os.stat_result of path or None if path can't be stat'ed"""
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _process_uid():
+    """Return real user id of process, which os.access checks against"""
+    return os.getuid()
+
+
+def _maximum_name_length(directory, device):
+    """Return longest allowed file name in bytes inside directory
+
+    Result is remembered per device so there is one os.pathconf per device.
+
+    """
+    try:
+        return _maximum_name_lengths[device]
+    except KeyError:
+        pass
+    try:
+        name_max = os.pathconf(directory, "PC_NAME_MAX")
+    except (AttributeError, OSError, ValueError):
+        name_max = None
+    if not name_max or name_max < 0:
+        name_max = _DEFAULT_MAXIMUM_NAME_LENGTH
+    _maximum_name_lengths[device] = name_max
+    return name_max
+
+
+class PathStatus:
+    """Path predicates evaluated from one os.stat of path
+
+    Existence, type, size and permissions are all answered from the same
+    stat_result and the process's real user id, which is the id os.access
+    checks against. os.access is only called when the answer could depend on
+    group membership, an access control list, capabilities or the mount i.e.
+    for root, when the permission bits would grant writing, and when the
+    process does not own the path and the group or other permission bits
+    would grant access. Where the user id is not available
+    (e.g. Windows) os.access is always used.
+
+    When created by a StatCache, the user id and os.access results come from
+    that cache and its counters are updated.
+
+    Attributes:
+        path (str): Path whose status this is
+        stat_result (os.stat_result): Result of os.stat(path) or None if
+            path can't be stat'ed
+
+    """
+
+    __slots__ = ("path", "stat_result", "_cache")
+
+    def __init__(self, path, stat_result=None, cache=None):
+        self.path = path
+        self._cache = cache
+        if stat_result is None:
+            stat_result = stat_path(path)
+            if cache is not None:
+                cache.count("stat")
+        self.stat_result = stat_result
+
+    @property
+    def exists(self):
+        """True if path exists"""
+        return self.stat_result is not None
+
+    @property
+    def is_file(self):
+        """True if path is an existing file"""
+        return self.exists and stat.S_ISREG(self.stat_result.st_mode)
+
+    @property
+    def is_directory(self):
+        """True if path is an existing directory"""
+        return self.exists and stat.S_ISDIR(self.stat_result.st_mode)
+
+    @property
+    def is_empty_file(self):
+        """True if path is an existing file of size 0"""
+        return self.is_file and self.stat_result.st_size == 0
+
+    @property
+    def is_readable(self):
+        """True if path has read permission for the process"""
+        return self.has_access(os.R_OK)
+
+    @property
+    def is_writable(self):
+        """True if path has write permission for the process"""
+        return self.has_access(os.W_OK)
+
+    @property
+    def is_executable(self):
+        """True if path has execute permission for the process"""
+        return self.has_access(os.X_OK)
+
+    def _access(self, mode):
+        """Return os.access(path, mode) for answers stat can't give"""
+        if self._cache is not None:
+            return self._cache.access(self.path, mode)
+        return os.access(self.path, mode)
+
+    def _uid(self):
+        """Return real user id os.access checks permissions with"""
+        if self._cache is not None:
+            return self._cache.uid()
+        return _process_uid()
+
+    def has_access(self, mode):
+        """Return True if path has permission mode for the process
+
+        Args:
+            mode (int): One of os.R_OK, os.W_OK or os.X_OK
+
+        """
+        if not self.exists:
+            return False
+
+        if not hasattr(os, "getuid"):
+            return self._access(mode)
+
+        st_mode = self.stat_result.st_mode
+
+        uid = self._uid()
+
+        # What root may do depends on its capabilities, which the mode bits
+        # don't tell
+        if uid == 0:
+            return self._access(mode)
+
+        owner_bit, group_bit, other_bit = _PERMISSION_BITS[mode]
+
+        # Access control lists never change the owner's permissions. Though
+        # a read only mount can deny writing, which only os.access knows as
+        # a bind mount shares the device of the file system it mounts.
+        if self.stat_result.st_uid == uid:
+            if not st_mode & owner_bit:
+                return False
+            return mode != os.W_OK or self._access(mode)
+
+        # With an access control list the group bits are the mask over all
+        # group and named user entries. So when neither group nor other bits
+        # grant access, nothing does.
+        if not st_mode & (group_bit | other_bit):
+            return False
+
+        # Otherwise an access control list could grant or deny access
+        return self._access(mode)
+
+
+class StatCache:
+    """PathStatus and os.access results per path, with syscall counters
+
+    A StatCache is shared by all actions within one ParseScope (see
+    get_stat_cache) so every path is stat'ed at most once per parse. Paths
+    that are created or have their permissions changed while parsing must be
+    invalidated.
+
+    Attributes:
+        counts (dict[str, int]): Number of "stat" and "access" syscalls
+            made and number of "hits" answered from the cache
+
+    """
+
+    def __init__(self):
+        self.counts = {"stat": 0, "access": 0, "hits": 0}
+        self._statuses = {}
+        self._accesses = {}
+        self._uid = None
+        self._lock = threading.Lock()
+
+    @property
+    def syscalls(self):
+        """Total number of stat and access syscalls made"""
+        return self.counts["stat"] + self.counts["access"]
+
+    def count(self, name):
+        """Increase counter name by one"""
+        with self._lock:
+            self.counts[name] += 1
+
+    def status(self, path):
+        """Return cached PathStatus of path, stat'ing path on first use"""
+        try:
+            status = self._statuses[path]
+        except KeyError:
+            status = self._statuses[path] = PathStatus(path, cache=self)
+        else:
+            self.count("hits")
+            from action_hero.profile_utils import count_cache_hit
+
+            count_cache_hit()
+        return status
+
+    def access(self, path, mode):
+        """Return cached os.access(path, mode)"""
+        key = (path, mode)
+        try:
+            result = self._accesses[key]
+        except KeyError:
+            self.count("access")
+            result = self._accesses[key] = os.access(path, mode)
+        else:
+            self.count("hits")
+            from action_hero.profile_utils import count_cache_hit
+
+            count_cache_hit()
+        return result
+
+    def uid(self):
+        """Return real user id of process, fetched once per cache"""
+        if self._uid is None:
+            self._uid = _process_uid()
+        return self._uid
+
+    def invalidate(self, path):
+        """Forget everything cached about path"""
+        self._statuses.pop(path, None)
+        for mode in _PERMISSION_BITS:
+            self._accesses.pop((path, mode), None)
+
+    def clear(self):
+        """Forget everything cached"""
+        self._statuses.clear()
+        self._accesses.clear()
+        self._uid = None
+
+
+def get_stat_cache():
+    """Return StatCache of the parse in progress or None
+
+    e.g. `get_stat_cache().counts` within parse_scope() after parse_args
+    gives the syscalls made by path actions during that parse.
+
+    """
+    scope = current_parse_scope()
+    if scope is None:
+        return None
+    return scope.get("stat_cache", StatCache)
+
+
+def get_path_status(path):
+    """Return PathStatus of path
+
+    Within an action_hero action call, the PathStatus comes from the
+    StatCache of the parse in progress.
+
+    """
+    cache = get_stat_cache()
+    if cache is None:
+        return PathStatus(path)
+    return cache.status(path)
+
+
+def invalidate_path_status(path):
+    """Forget cached status of path in the parse in progress, if any, and
+    memoized results of funcs for path"""
+    cache = get_stat_cache()
+    if cache is not None:
+        cache.invalidate(path)
+    invalidate_memoized(path)
 
 
 def is_symbolic_link(path):
@@ -87,62 +381,68 @@ def is_symbolic_link(path):
 
 def is_existing_directory(path):
     """Returns True if path is an existing directory"""
-    return os.path.isdir(path)
+    return get_path_status(path).is_directory
 
 
 def is_readable_directory(path):
     """Returns True if path is a directory with read permissible flag set"""
-    return is_existing_directory(path) and is_readable_path(path)
+    status = get_path_status(path)
+    return status.is_directory and status.is_readable
 
 
 def is_writable_directory(path):
     """Returns True if path is a directory with write permissible flag set"""
-    return is_existing_directory(path) and is_writable_path(path)
+    status = get_path_status(path)
+    return status.is_directory and status.is_writable
 
 
 def is_executable_directory(path):
     """Returns True if path is a directory with execute permissible flag set"""
-    return is_existing_directory(path) and is_executable_path(path)
+    status = get_path_status(path)
+    return status.is_directory and status.is_executable
 
 
 def is_existing_file(path):
     """Returns True if path is an existing file"""
-    return os.path.isfile(path)
+    return get_path_status(path).is_file
 
 
 def is_readable_file(path):
     """Returns True if path is a file with read permissible flag set"""
-    return is_existing_file(path) and is_readable_path(path)
+    status = get_path_status(path)
+    return status.is_file and status.is_readable
 
 
 def is_writable_file(path):
     """Returns True if path is a file with write permissible flag set"""
-    return is_existing_file(path) and is_writable_path(path)
+    status = get_path_status(path)
+    return status.is_file and status.is_writable
 
 
 def is_executable_file(path):
     """Return True if path is a file with execute permissible flag set"""
-    return is_existing_file(path) and is_executable_path(path)
+    status = get_path_status(path)
+    return status.is_file and status.is_executable
 
 
 def is_existing_path(path):
     """Returns True if path exists"""
-    return os.path.exists(path)
+    return get_path_status(path).exists
 
 
 def is_writable_path(path):
     """Returns True if path has write permissible flag set"""
-    return os.access(path, os.W_OK)
+    return get_path_status(path).is_writable
 
 
 def is_readable_path(path):
     """Returns True if path has read permission flag set"""
-    return os.access(path, os.R_OK)
+    return get_path_status(path).is_readable
 
 
 def is_executable_path(path):
     """Returns True if path has execute permission flag set"""
-    return os.access(path, os.X_OK)
+    return get_path_status(path).is_executable
 
 
 def resolve_path(path):
@@ -154,34 +454,64 @@ def resolve_path(path):
 def is_existing_or_creatable_path(path):
     """Returns True if path already exists or is creatable by current User
 
-    This solution is a work-around, in that, an ignorable tempfile with a
-    shortlife is created and removed.
-    Source: https://stackoverflow.com/a/48499049/225903
+    Nothing is created to find out. Instead, the nearest existing ancestor of
+    path is found and path is deemed creatable when that ancestor is a
+    directory the process can write to and search (write and execute
+    permissions), and every name still to be created fits within the file
+    system's name length limit. Ancestors are those of path as given, not
+    normalised, so ".." after a missing directory makes path uncreatable as
+    it would for the OS.
 
-    For a better, although far more complicated solution, read:
-    https://stackoverflow.com/a/34102855/225903
+    Within a parse, ancestors come from the StatCache so paths sharing an
+    ancestor cost one stat of that ancestor between them.
 
     Args:
         path (str): Path to check for existence or creatability
 
     """
-    try:
-        # Mode x: Open for exclusive creation, fail if the path already exists
-        with open(path, mode="x") as _:
-            # Raises OSError if:
-            # Condition 1. file exists
-            # Condition 2. Unable to create at path
-
-            # Else successfully able to create at path
-            return True
-
-    except OSError:
-        # Handle Condition 1. Path exists
-        if os.path.isfile(path) or os.path.isdir(path):
-            return True
-        # Handle Condition 2. Unable to create at path
+    if get_path_status(path).exists:
+        return True
+
+    path = os.fspath(path)
+    separators = (os.sep, os.altsep) if os.altsep else (os.sep,)
+    if isinstance(path, bytes):
+        separators = tuple(os.fsencode(sep) for sep in separators)
+        null = b"\0"
+        pardir = os.fsencode(os.pardir)
+        cwd = os.getcwdb
+    else:
+        null = "\0"
+        pardir = os.pardir
+        cwd = os.getcwd
+
+    # A trailing separator only names a directory that already exists and
+    # null characters are never allowed in a path
+    if not path or path.endswith(separators) or null in path:
         return False
 
+    # Walk up to the nearest existing ancestor, collecting missing names.
+    # os.path.abspath would drop ".." along with a missing name before it.
+    missing_names = []
+    ancestor = path if os.path.isabs(path) else os.path.join(cwd(), path)
+    while True:
+        missing_names.append(os.path.basename(ancestor))
+        parent = os.path.dirname(ancestor)
+        if parent == ancestor:
+            return False
+        ancestor = parent
+        status = get_path_status(ancestor)
+        if status.exists:
+            break
+
+    if not status.is_directory or pardir in missing_names:
+        return False
+
+    name_max = _maximum_name_length(ancestor, status.stat_result.st_dev)
+    if any(len(os.fsencode(name)) > name_max for name in missing_names):
+        return False
+
+    return status.is_writable and status.is_executable
+
 
 def is_valid_path(path):
     """Returns True if path already exists or is creatable by current User"""
@@ -221,6 +551,7 @@ def remove_write_permission(path):
 
     current_permissions = stat.S_IMODE(os.lstat(path).st_mode)
     os.chmod(path, current_permissions & NO_WRITING)
+    invalidate_path_status(path)
 
 
 def remove_read_permission(path):
@@ -239,6 +570,7 @@ def remove_read_permission(path):
 
     current_permissions = stat.S_IMODE(os.lstat(path).st_mode)
     os.chmod(path, current_permissions & NO_READING)
+    invalidate_path_status(path)
 
 
 def remove_execute_permission(path):
@@ -260,6 +592,7 @@ def remove_execute_permission(path):
 
     current_permissions = stat.S_IMODE(os.lstat(path).st_mode)
     os.chmod(path, current_permissions & NO_EXECUTING)
+    invalidate_path_status(path)
 
 
 def add_execute_permission(path):
@@ -279,8 +612,9 @@ def add_execute_permission(path):
 
     current_permissions = stat.S_IMODE(os.lstat(path).st_mode)
     os.chmod(path, current_permissions | EXECUTING)
+    invalidate_path_status(path)
 
 
 def is_empty_file(path):
     """Returns True if file is empty"""
-    return is_existing_file(path) and os.stat(path).st_size == 0
+    return get_path_status(path).is_empty_file
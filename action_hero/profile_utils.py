@@ -0,0 +1,349 @@
+import argparse
+import atexit
+import contextlib
+import contextvars
+import os
+import sys
+import threading
+import time
+
+
+__all__ = [
+    "ActionProfile",
+    "CallStats",
+    "ProfileRegistry",
+    "count_cache_hit",
+    "count_failures",
+    "current_call_stats",
+    "profile_registry",
+    "profiled_call",
+    "profiled_stages",
+]
+
+
+class CallStats:
+    """Measurements of one action call, or of one PipelineAction child over
+    the values of one call
+
+    Attributes:
+        name (str): Name the call is recorded under
+        action (argparse.Action): Action called
+        seconds (float): Wall time spent
+        values (int): Number of values processed
+        failures (int): Number of values that failed
+        cache_hits (int): Number of results answered from a cache
+
+    """
+
+    __slots__ = (
+        "name",
+        "action",
+        "seconds",
+        "values",
+        "failures",
+        "cache_hits",
+        "_lock",
+    )
+
+    def __init__(self, name, action, values=0):
+        self.name = name
+        self.action = action
+        self.seconds = 0.0
+        self.values = values
+        self.failures = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+
+    def count_cache_hit(self):
+        # Worker threads of the call count hits concurrently
+        with self._lock:
+            self.cache_hits += 1
+
+
+class ActionProfile:
+    """Measurements of all calls recorded under one name
+
+    Attributes:
+        name (str): Option string and action class e.g.
+            "--urls URLIsReachableAction". PipelineAction children are
+            named after their pipeline e.g.
+            "--file PipelineAction > FileExistsAction".
+        calls (int): Number of calls
+        seconds (float): Total wall time of calls
+        values (int): Total number of values processed
+        failures (int): Total number of values that failed
+        cache_hits (int): Total number of results answered from a cache
+
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.values = 0
+        self.failures = 0
+        self.cache_hits = 0
+
+    @property
+    def seconds_per_value(self):
+        """Mean wall time per value processed"""
+        return self.seconds / self.values if self.values else 0.0
+
+    def as_dict(self):
+        """Return measurements as a dict fit for json"""
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "values": self.values,
+            "seconds_per_value": self.seconds_per_value,
+            "failures": self.failures,
+            "cache_hits": self.cache_hits,
+        }
+
+
+class ProfileRegistry:
+    """ActionProfile per name, recorded while enabled
+
+    action_hero actions record every call while profile_registry is
+    enabled. Checking whether it is enabled is all that is done otherwise.
+
+    Attributes:
+        enabled (bool): Whether calls are recorded
+
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._profiles = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Record calls from now on"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording calls. Recorded calls are kept."""
+        self.enabled = False
+
+    def record(self, stats):
+        """Add CallStats of one call to the ActionProfile of its name"""
+        with self._lock:
+            profile = self._profiles.get(stats.name)
+            if profile is None:
+                profile = self._profiles[stats.name] = ActionProfile(
+                    stats.name
+                )
+            profile.calls += 1
+            profile.seconds += stats.seconds
+            profile.values += stats.values
+            profile.failures += stats.failures
+            profile.cache_hits += stats.cache_hits
+
+    def profiles(self):
+        """Return ActionProfiles recorded, slowest first"""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return sorted(profiles, key=lambda profile: -profile.seconds)
+
+    def clear(self):
+        """Forget all recorded calls"""
+        with self._lock:
+            self._profiles.clear()
+
+    def to_json(self):
+        """Return recorded ActionProfiles as a json list, slowest first"""
+        import json
+
+        return json.dumps(
+            [profile.as_dict() for profile in self.profiles()], indent=2
+        )
+
+    def format_table(self):
+        """Return recorded ActionProfiles as a table, slowest first"""
+        rows = [
+            (
+                "action",
+                "calls",
+                "ms",
+                "ms/value",
+                "values",
+                "failures",
+                "cache hits",
+            )
+        ]
+        for profile in self.profiles():
+            rows.append(
+                (
+                    profile.name,
+                    str(profile.calls),
+                    "{:.3f}".format(profile.seconds * 1000),
+                    "{:.3f}".format(profile.seconds_per_value * 1000),
+                    str(profile.values),
+                    str(profile.failures),
+                    str(profile.cache_hits),
+                )
+            )
+
+        widths = [max(map(len, column)) for column in zip(*rows)]
+        return "\n".join(
+            "  ".join(
+                # Left align names, right align numbers
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        )
+
+
+# Calls of every action_hero action are recorded here while it is enabled
+profile_registry = ProfileRegistry()
+
+# CallStats of the action_hero action call in progress, if any
+_current_call_stats = contextvars.ContextVar(
+    "action_hero_call_stats", default=None
+)
+
+
+@contextlib.contextmanager
+def profiled_call(action, values):
+    """Record wall time, values processed, failures and cache hits of the
+    action call within, as a child of the call in progress if any
+
+    Args:
+        action (argparse.Action): Action being called
+        values (list or object): Values action is called with
+
+    """
+    parent = _current_call_stats.get()
+    if parent is not None and parent.action is action:
+        # A __call__ calling the __call__ it overrides is the same call
+        yield parent
+        return
+
+    if parent is not None:
+        name = "{} > {}".format(parent.name, type(action).__name__)
+    else:
+        name = "{} {}".format(
+            action.option_strings[0]
+            if action.option_strings
+            else action.dest,
+            type(action).__name__,
+        )
+
+    if isinstance(values, list):
+        count = len(values)
+    else:
+        count = 0 if values is None else 1
+
+    stats = CallStats(name, action, count)
+    token = _current_call_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        yield stats
+    except argparse.ArgumentError:
+        # Errors not raised with _raise_failures still fail one value
+        stats.failures = stats.failures or 1
+        raise
+    finally:
+        stats.seconds = time.perf_counter() - start
+        _current_call_stats.reset(token)
+        profile_registry.record(stats)
+
+
+def _profiled_stage(stats, kind, func):
+    """Return func recording each call into stats"""
+
+    def profiled_func(value):
+        token = _current_call_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            result = func(value)
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.values += 1
+            _current_call_stats.reset(token)
+        if kind == "check" and not result:
+            stats.failures += 1
+        return result
+
+    profiled_func.stats = stats
+    return profiled_func
+
+
+@contextlib.contextmanager
+def profiled_stages(stages):
+    """Yield PipelineAction stages recording each as a child of the call in
+    progress
+
+    Args:
+        stages (list): (child, kind, func) stages streamed through together
+
+    """
+    parent = _current_call_stats.get()
+    profiled = []
+    for child, kind, func in stages:
+        stats = CallStats(
+            "{} > {}".format(parent.name, type(child).__name__), child
+        )
+        profiled.append((child, kind, _profiled_stage(stats, kind, func)))
+
+    try:
+        yield profiled
+    finally:
+        for _, _, func in profiled:
+            profile_registry.record(func.stats)
+
+
+def current_call_stats():
+    """Return CallStats of the action call being profiled or None"""
+    return _current_call_stats.get()
+
+
+def count_cache_hit():
+    """Count a result answered from a cache in the call being profiled"""
+    stats = _current_call_stats.get()
+    if stats is not None:
+        stats.count_cache_hit()
+
+
+def count_failures(count):
+    """Count failing values in the call being profiled"""
+    stats = _current_call_stats.get()
+    if stats is not None:
+        stats.failures = count
+
+
+def _write_summary(format, path=None):
+    """Write recorded ActionProfiles as a table or json to path or stderr"""
+    summary = (
+        profile_registry.to_json()
+        if format == "json"
+        else profile_registry.format_table()
+    )
+    if path:
+        with open(path, "w") as f:
+            f.write(summary + "\n")
+    else:
+        print(summary, file=sys.stderr)
+
+
+def _enable_from_environment():
+    """Enable profiling when ACTION_HERO_PROFILE is set
+
+    ACTION_HERO_PROFILE=table, or any other value, writes a table of what
+    was recorded at exit, and ACTION_HERO_PROFILE=json writes json instead.
+    They're written to stderr, or to the file at ACTION_HERO_PROFILE_FILE.
+
+    """
+    format = os.environ.get("ACTION_HERO_PROFILE")
+    if not format or format == "0":
+        return
+
+    profile_registry.enable()
+    atexit.register(
+        _write_summary, format, os.environ.get("ACTION_HERO_PROFILE_FILE")
+    )
+
+
+_enable_from_environment()
@@ -0,0 +1,246 @@
+import os
+import sys
+import weakref
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "StreamedValues",
+    "ValuesSpill",
+    "chunked",
+    "has_value_source",
+    "is_file_source",
+    "is_value_source",
+    "iter_values",
+    "spill_values",
+    "streamed_source",
+]
+
+
+# Values run through an action at a time when streamed
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def is_value_source(value):
+    """Return True if value is "-" for stdin or "@path" of a file of values"""
+    return isinstance(value, str) and (
+        value == "-" or (value.startswith("@") and len(value) > 1)
+    )
+
+
+def is_file_source(value):
+    """Return True if value is "@path" of a file of values"""
+    return is_value_source(value) and value != "-"
+
+
+def has_value_source(values):
+    """Return True if values, a list or one value, has a value source"""
+    if isinstance(values, list):
+        return any(is_value_source(value) for value in values)
+    return is_value_source(values)
+
+
+def _read_lines(f):
+    """Yield non-empty lines of file object f without line endings"""
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line:
+            yield line
+
+
+def _read_file(path):
+    with open(path, encoding="utf-8") as f:
+        yield from _read_lines(f)
+
+
+def _read_pickled_chunks(path):
+    """Yield chunks of values pickled one after the other into path"""
+    import pickle
+
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def iter_values(values):
+    """Yield values, a list or one value, with each value source replaced by
+    the values read from it line by line"""
+    for value in values if isinstance(values, list) else [values]:
+        if value == "-":
+            yield from _read_lines(sys.stdin)
+        elif is_file_source(value):
+            yield from _read_file(value[1:])
+        else:
+            yield value
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items of iterable, in order"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class StreamedValues:
+    """Values read from files each time they are iterated over
+
+    Stored in dest by actions streaming values, so they are never all in
+    memory at once.
+
+    Args:
+        paths (list[str]): Files with one value per line, or of pickled
+            chunks of values when pickled
+        func (func): Called with each chunk of values read, returning the
+            values to yield instead, i.e. mapped lazily while iterating
+        chunk_size (int): Number of values func is called with at a time
+        temporary (bool): Whether files are removed on close() or when
+            StreamedValues is garbage collected
+        pickled (bool): Whether files hold pickled chunks written by
+            ValuesSpill instead of lines
+
+    """
+
+    def __init__(
+        self,
+        paths,
+        func=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        temporary=False,
+        pickled=False,
+    ):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.func = func
+        self.chunk_size = chunk_size
+        self.pickled = pickled
+        self._finalizer = weakref.finalize(
+            self, _remove_files, self.paths if temporary else []
+        )
+
+    def _chunks(self):
+        """Yield values read from paths in lists"""
+        if self.pickled:
+            for path in self.paths:
+                yield from _read_pickled_chunks(path)
+        else:
+            yield from chunked(
+                (value for path in self.paths for value in _read_file(path)),
+                self.chunk_size,
+            )
+
+    def __iter__(self):
+        for chunk in self._chunks():
+            yield from chunk if self.func is None else self.func(chunk)
+
+    def __repr__(self):
+        return "StreamedValues({!r})".format(self.paths)
+
+    def close(self):
+        """Remove temporary files"""
+        self._finalizer()
+
+
+class ValuesSpill:
+    """Temporary file values are pickled to a chunk at a time
+
+    Values come back as they were written, whatever their type, so values
+    have to be picklable.
+
+    """
+
+    def __init__(self):
+        import tempfile
+
+        fd, self.path = tempfile.mkstemp(
+            prefix="action_hero-values-", suffix=".pickle"
+        )
+        self._file = open(fd, "wb")
+
+    def write(self, values):
+        """Append a chunk of values to the file"""
+        import pickle
+
+        values = list(values)
+        if values:
+            pickle.dump(values, self._file, pickle.HIGHEST_PROTOCOL)
+
+    def finish(self, func=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Return StreamedValues reading the values written, which removes
+        the file once done with"""
+        self._file.close()
+        return StreamedValues(
+            [self.path],
+            func=func,
+            chunk_size=chunk_size,
+            temporary=True,
+            pickled=True,
+        )
+
+    def discard(self):
+        """Remove the file"""
+        self._file.close()
+        _remove_files([self.path])
+
+
+def spill_values(values, run_chunk=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return StreamedValues of values, read from their sources, run through
+    run_chunk a chunk at a time and written to a temporary file
+
+    Args:
+        values (list or str): Values and value sources
+        run_chunk (func): Called with each list of up to chunk_size values,
+            returning the values to write instead
+        chunk_size (int): Number of values read at a time
+
+    """
+    spill = ValuesSpill()
+    try:
+        for chunk in chunked(iter_values(values), chunk_size):
+            spill.write(chunk if run_chunk is None else run_chunk(chunk))
+    except BaseException:
+        spill.discard()
+        raise
+    return spill.finish(chunk_size=chunk_size)
+
+
+def streamed_source(values, func=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return StreamedValues reading values from their sources each time
+    they're iterated over, mapped lazily with func if given
+
+    Files are read in place when all values are "@path" sources. Otherwise
+    values are copied to a temporary file first, as stdin can only be read
+    once.
+
+    Args:
+        values (list or str): Values and value sources
+        func (func): Called with each chunk of values read, returning the
+            values to yield instead
+        chunk_size (int): Number of values func is called with at a time
+
+    """
+    sources = values if isinstance(values, list) else [values]
+    if all(is_file_source(value) for value in sources):
+        return StreamedValues(
+            [value[1:] for value in sources],
+            func=func,
+            chunk_size=chunk_size,
+        )
+
+    spilled = spill_values(values, chunk_size=chunk_size)
+    spilled.func = func
+    return spilled
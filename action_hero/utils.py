@@ -1,21 +1,14 @@
 import argparse
+import collections
 import contextlib
+import contextvars
 import functools
-import getpass
 import io
-import json
-import pickle
+import os
 import sys
-import unittest
-import yaml
-
-try:
-    from yaml import CLoader as Loader
-except ImportError:
-    from yaml import Loader
-
-
-import requests
+import threading
+import time
+import weakref
 
 
 __all__ = [
@@ -26,11 +19,19 @@ __all__ = [
     "DebugAction",
     "DisplayMessageAndExitAction",
     "DisplayMessageAndGetInputAction",
+    "FailedValuesError",
     "LoadSerializedFileAction",
     "MapAction",
     "MapAndReplaceAction",
+    "MemoCache",
+    "ParseScope",
     "PipelineAction",
     "capture_output",
+    "current_parse_scope",
+    "default_memo_cache",
+    "get_memo_cache",
+    "invalidate_memoized",
+    "parse_scope",
     "run_only_when_modules_loaded",
     "run_only_when_when_internet_is_up",
 ]
@@ -69,37 +70,572 @@ def run_only_when_modules_loaded(modules=["argparse"]):
     return run_only_when_modules_loaded_wrapper
 
 
-def run_only_when_when_internet_is_up(urls=["http://www.google.com"]):
+def _is_connectable(address, timeout):
+    """Return True if a TCP connection to address (host, port) can be made"""
+    import socket
+
+    try:
+        with socket.create_connection(address, timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _is_internet_up(urls, timeout):
+    """Return True if TCP connections can be made to the hosts of all urls
+
+    Hosts are connected to concurrently, each once however many urls share
+    it.
+
+    """
+    import urllib.parse
+
+    addresses = set()
+    for url in urls:
+        try:
+            parts = urllib.parse.urlsplit(url)
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+        except ValueError:
+            return False
+        if not parts.hostname:
+            return False
+        addresses.add((parts.hostname, port))
+
+    if len(addresses) < 2:
+        return all(_is_connectable(a, timeout) for a in addresses)
+
+    # Imported on first use as it imports logging
+    import concurrent.futures
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(addresses)
+    ) as executor:
+        return all(
+            executor.map(lambda a: _is_connectable(a, timeout), addresses)
+        )
+
+
+# Results of _is_internet_up as {(urls, timeout): (is_up, expires)}, with
+# expires a time.monotonic()
+_internet_up_results = {}
+
+
+def run_only_when_when_internet_is_up(
+    urls=["http://www.google.com"], timeout=5, ttl=60
+):
     """Decorator that runs wrapped function when the internet is up.
 
-    Connection is checked by checking connection to values in urls
+    Connection is checked by making TCP connections to the hosts of values in
+    urls, concurrently. The result is remembered for ttl seconds, so calls
+    within that time don't touch the network.
 
     Args:
         urls (list[str]): List of urls to check for when checking for
         connection
+        timeout (float): Seconds to wait for a connection to each url before
+            deeming the internet down
+        ttl (float): Seconds the result of a check is reused for
 
     """
-
     def run_only_when_when_internet_is_up_wrapper(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Do network check
-            try:
-                [requests.get(url).raise_for_status() for url in urls]
+            key = (tuple(urls), timeout)
+            is_up, expires = _internet_up_results.get(key, (False, 0))
+            if expires <= time.monotonic():
+                is_up = _is_internet_up(urls, timeout)
+                _internet_up_results[key] = (is_up, time.monotonic() + ttl)
 
+            if is_up:
                 func(*args, **kwargs)
 
-            # Do nothing on response error
-            except requests.exceptions.RequestException:
-                pass
-
         return wrapper
 
     return run_only_when_when_internet_is_up_wrapper
 
 
+class ParseScope:
+    """Resources shared by action_hero actions while parsing
+
+    Every action_hero action call opens a ParseScope that is closed when the
+    call returns, unless one is open already. Open one with parse_scope()
+    around parse_args to share it between all arguments of the parse.
+
+    Resources are anything worth sharing between actions e.g. caches and
+    connection pools. Resources are closed with the scope by the close func
+    they were created with, or their close method if they have one.
+
+    Attributes:
+        started (float): time.perf_counter() when the scope was created,
+            i.e. when the parse or the action call opening it started
+
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._resources = {}
+        self._closers = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, factory, close=None):
+        """Return resource for key, creating it with factory() on first use
+
+        Args:
+            key (hashable): Name of resource
+            factory (callable): Called without arguments to create resource
+            close (callable): Called with resource when the scope is closed.
+                Defaults to calling its close method, if any.
+
+        """
+        try:
+            return self._resources[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if key not in self._resources:
+                self._resources[key] = factory()
+                if close is not None:
+                    self._closers[key] = close
+            return self._resources[key]
+
+    def close(self):
+        """Close resources that can be closed and forget all resources"""
+        with self._lock:
+            resources = list(self._resources.items())
+            closers = self._closers
+            self._resources = {}
+            self._closers = {}
+
+        for key, resource in resources:
+            if key in closers:
+                closers[key](resource)
+            elif callable(getattr(resource, "close", None)):
+                resource.close()
+
+
+# ParseScope of the parse or action_hero action call in progress, if any
+_current_parse_scope = contextvars.ContextVar(
+    "action_hero_parse_scope", default=None
+)
+
+
+@contextlib.contextmanager
+def parse_scope():
+    """Share one ParseScope between all action_hero actions called within,
+    closing it on exit
+
+    e.g. wrap parse_args to share caches and pools between its arguments:
+
+        with parse_scope():
+            args = parser.parse_args()
+
+    Yields the ParseScope already open when nested.
+
+    """
+    scope = _current_parse_scope.get()
+    if scope is not None:
+        yield scope
+        return
+
+    scope = ParseScope()
+    token = _current_parse_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_parse_scope.reset(token)
+        scope.close()
+
+
+def current_parse_scope():
+    """Return ParseScope of the parse or action_hero action call in progress
+    or None"""
+    return _current_parse_scope.get()
+
+
+def _call_within_parse_scope(call):
+    """Wrap an action's __call__ to run within a ParseScope
+
+    Calls within an open ParseScope, e.g. within parse_scope() or children
+    of a PipelineAction, use it. Otherwise the call opens one closed when it
+    returns. Calls are recorded in profile_registry while it is enabled.
+
+    """
+
+    @functools.wraps(call)
+    def wrapper(self, parser, namespace, values, option_string=None):
+        # Imported on first use, which also enables profiling when
+        # ACTION_HERO_PROFILE is set
+        from action_hero.profile_utils import profile_registry, profiled_call
+
+        if profile_registry.enabled:
+            with profiled_call(self, values):
+                return within_parse_scope(
+                    self, parser, namespace, values, option_string
+                )
+        return within_parse_scope(
+            self, parser, namespace, values, option_string
+        )
+
+    def within_parse_scope(self, parser, namespace, values, option_string):
+        with parse_scope():
+            return call(self, parser, namespace, values, option_string)
+
+    # Marks __call__ as wrapped, so it isn't wrapped again by subclasses
+    wrapper.within_parse_scope = True
+    return wrapper
+
+
 class ActionHeroAction(argparse.Action):
-    pass
+    """argparse.Action subclass that all action_hero actions derive from
+
+    Every subclass's __call__, including one inherited from a mixin, runs
+    within a ParseScope, which lets actions share caches for the duration of
+    one call, or of one parse_args call within parse_scope().
+
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # __call__ may come from the class or from a mixin it derives from
+        if not getattr(cls.__call__, "within_parse_scope", False):
+            cls.__call__ = _call_within_parse_scope(cls.__call__)
+
+    def _pipeline_stage(self):
+        """Return (kind, func) to run this action over one value at a time
+        within a PipelineAction, or None when it has to be called instead
+
+        kind is "check" for a func returning whether a value passes, or "map"
+        for a func returning a value's replacement.
+
+        """
+        return None
+
+
+# Every MemoCache alive, so invalidate_memoized reaches them all
+_memo_caches = weakref.WeakSet()
+
+
+class MemoCache:
+    """Results of funcs per value, evicting least recently used results
+
+    Results are keyed by func, type of value and value, so actions sharing a
+    func share its results too. Values that can't be hashed are never
+    memoized. Exceptions raised by func aren't memoized either.
+
+    Args:
+        maxsize (int): Most results kept
+
+    Attributes:
+        counts (dict[str, int]): Number of "hits", "misses" and "evictions"
+
+    """
+
+    def __init__(self, maxsize=1024):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize has to be a positive int")
+        self.maxsize = maxsize
+        self.counts = {"hits": 0, "misses": 0, "evictions": 0}
+        self._results = collections.OrderedDict()
+        # Keys of results per value, to invalidate a value in constant time
+        self._keys_by_value = {}
+        self._lock = threading.Lock()
+        _memo_caches.add(self)
+
+    def call(self, func, value):
+        """Return func(value), from memory when it was returned before"""
+        key = (func, type(value), value)
+        try:
+            with self._lock:
+                result = self._results[key]
+                self._results.move_to_end(key)
+                self.counts["hits"] += 1
+            from action_hero.profile_utils import count_cache_hit
+
+            count_cache_hit()
+            return result
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable value
+            return func(value)
+
+        result = func(value)
+        with self._lock:
+            self.counts["misses"] += 1
+            self._results[key] = result
+            self._keys_by_value.setdefault(key[1:], set()).add(key)
+            while len(self._results) > self.maxsize:
+                evicted, _ = self._results.popitem(last=False)
+                self._forget_key(evicted)
+                self.counts["evictions"] += 1
+        return result
+
+    def _forget_key(self, key):
+        keys = self._keys_by_value.get(key[1:])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_value[key[1:]]
+
+    def invalidate(self, value, func=None):
+        """Forget results for value, of func only or of every func"""
+        try:
+            with self._lock:
+                keys = self._keys_by_value.get((type(value), value), ())
+                for key in list(keys):
+                    if func is None or key[0] is func:
+                        del self._results[key]
+                        self._forget_key(key)
+        except TypeError:
+            # Unhashable values are never memoized
+            pass
+
+    def clear(self):
+        """Forget all results. Counters are kept."""
+        with self._lock:
+            self._results.clear()
+            self._keys_by_value.clear()
+
+    def __len__(self):
+        return len(self._results)
+
+
+_default_memo_cache = None
+_default_memo_cache_lock = threading.Lock()
+
+
+def default_memo_cache():
+    """Return MemoCache shared by actions memoizing for the process"""
+    global _default_memo_cache
+    with _default_memo_cache_lock:
+        if _default_memo_cache is None:
+            _default_memo_cache = MemoCache()
+        return _default_memo_cache
+
+
+def get_memo_cache():
+    """Return MemoCache shared by actions memoizing per parse within the
+    parse_scope() in progress, or None outside one
+
+    e.g. `get_memo_cache().counts` within parse_scope() after parse_args
+    gives the hits and misses during that parse.
+
+    """
+    scope = current_parse_scope()
+    if scope is None:
+        return None
+    return scope.get("memo_cache", MemoCache)
+
+
+def invalidate_memoized(value, func=None):
+    """Forget results for value in every MemoCache, of func only or of every
+    func
+
+    Funcs that change what other funcs return for a value, e.g. by creating
+    a path, have to call this.
+
+    """
+    for cache in list(_memo_caches):
+        cache.invalidate(value, func)
+
+
+def _map_within_bounds(executor, func, values, limit):
+    """Yield func(value) for every value in values, in order, from executor
+
+    At most limit values are submitted to executor at any time so memory
+    stays flat however many values there are. Each call runs in a copy of
+    the caller's context, so it sees the ParseScope of the caller.
+
+    """
+    pending = collections.deque()
+    try:
+        for value in values:
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+            context = contextvars.copy_context()
+            pending.append(executor.submit(context.run, func, value))
+
+        while pending:
+            yield pending.popleft().result()
+
+    finally:
+        # Stop work on values nobody is waiting for anymore
+        for future in pending:
+            future.cancel()
+
+
+# Values sent to a worker process at a time when chunksize isn't set
+DEFAULT_CHUNKSIZE = 16
+
+
+def _create_process_pool(processes):
+    """Return ProcessPoolExecutor of processes worker processes"""
+    # Imported on first use as it imports multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=processes)
+
+
+def _shut_down_process_pool(executor):
+    """Shut executor down, waiting for its worker processes to exit"""
+    executor.shutdown(wait=True)
+
+
+def _is_process_pool(executor):
+    """Return True if executor is a ProcessPoolExecutor"""
+    # No ProcessPoolExecutor exists until its module is imported
+    process = sys.modules.get("concurrent.futures.process")
+    return process is not None and isinstance(
+        executor, process.ProcessPoolExecutor
+    )
+
+
+def _run_chunk(payload):
+    """Return pickled (ok, result) per value of a pickled (func, values)
+
+    Runs in a worker process. ok is False when func raised, so the value can
+    be run again in the parent to raise there. None is returned when results
+    can't be pickled.
+
+    """
+    import pickle
+
+    func, values = pickle.loads(payload)
+    results = []
+    for value in values:
+        try:
+            results.append((True, func(value)))
+        except Exception:
+            results.append((False, None))
+
+    try:
+        return pickle.dumps(results)
+    except Exception:
+        return None
+
+
+def _map_in_processes(executor, func, fallback, values, chunksize, limit):
+    """Yield func(value) for every value in values, in order, from worker
+    processes of executor
+
+    Values are sent in chunks of chunksize, with at most limit chunks in
+    flight. fallback is called with values in this process instead when
+    func, the values or their results can't be pickled, and for values func
+    raised an exception with so it's raised here.
+
+    """
+    import pickle
+
+    try:
+        pickle.dumps(func)
+    except Exception:
+        yield from map(fallback, values)
+        return
+
+    def submit(chunk):
+        try:
+            payload = pickle.dumps((func, chunk))
+        except Exception:
+            return None
+        return executor.submit(_run_chunk, payload)
+
+    def results_of(chunk, future):
+        data = None if future is None else future.result()
+        if data is None:
+            return [fallback(value) for value in chunk]
+        return [
+            result if ok else fallback(value)
+            for value, (ok, result) in zip(chunk, pickle.loads(data))
+        ]
+
+    pending = collections.deque()
+    try:
+        chunk = []
+        for value in values:
+            chunk.append(value)
+            if len(chunk) < chunksize:
+                continue
+            if len(pending) >= limit:
+                yield from results_of(*pending.popleft())
+            pending.append((chunk, submit(chunk)))
+            chunk = []
+        if chunk:
+            pending.append((chunk, submit(chunk)))
+
+        while pending:
+            yield from results_of(*pending.popleft())
+
+    finally:
+        # Stop work on values nobody is waiting for anymore
+        for _, future in pending:
+            if future is not None:
+                future.cancel()
+
+
+class FailedValuesError(argparse.ArgumentError):
+    """ArgumentError reporting values of an argument that failed
+
+    Its message shows the first few failures only. All of them are here.
+
+    Attributes:
+        failures (list): Every value that failed, in order
+        not_checked (int): Number of values left unchecked
+        failures_file (str): Path of file listing every failure, one per
+            line, or None
+
+    """
+
+    def __init__(
+        self, argument, message, failures, not_checked=0, failures_file=None
+    ):
+        super().__init__(argument, message)
+        self.failures = failures
+        self.not_checked = not_checked
+        self.failures_file = failures_file
+
+
+def _check_value_streaming(stream_values=None, lazy_values=None):
+    """Raise ValueError if stream_values and lazy_values can't be used"""
+    if lazy_values and not stream_values:
+        raise ValueError("lazy_values needs stream_values")
+
+
+def _is_streamed(action, values):
+    """Return True if action streams values from stdin or files"""
+    if not action.stream_values:
+        return False
+    # Imported on first use, as few arguments stream values
+    from action_hero.stream_utils import has_value_source
+
+    return has_value_source(values)
+
+
+def _stream_chunk_size(action):
+    """Return number of streamed values action runs at a time"""
+    from action_hero.stream_utils import DEFAULT_CHUNK_SIZE
+
+    return action.stream_chunk_size or DEFAULT_CHUNK_SIZE
+
+
+def _profiled_chunks(action, run_chunk):
+    """Return run_chunk recording each call as a call of action while
+    profile_registry is enabled
+
+    Lazily mapped chunks are run after the action's own call returned, so
+    outside the call profiled by its __call__.
+
+    """
+
+    def run_profiled_chunk(chunk):
+        from action_hero.profile_utils import profile_registry, profiled_call
+
+        if not profile_registry.enabled:
+            return run_chunk(chunk)
+        with profiled_call(action, chunk):
+            return run_chunk(chunk)
+
+    return run_profiled_chunk
 
 
 class BaseAction(ActionHeroAction):
@@ -111,17 +647,241 @@ class BaseAction(ActionHeroAction):
     Attributes:
         func (func): To be used to fill in subclasses preferred func.
         error_message(str): Message used to report errors
+        workers (int): Number of threads to run func over values with.
+            Values are run serially when None.
+        executor (concurrent.futures.Executor): Executor to run func over
+            values with instead of creating threads for workers.
+        processes (int): Number of worker processes to run func over values
+            in, for CPU bound funcs. Workers are shut down when the call
+            returns, or shared by all arguments using as many processes
+            within one parse_scope(). Values run in this process instead
+            when func or they can't be pickled.
+        chunksize (int): Number of values sent to a worker process at a time
+        max_failures (int): Number of failures after which checking stops
+            and the remaining values are reported as not checked. All values
+            are checked when None.
+        failures_shown (int): Number of failures shown in error messages.
+            The rest are counted.
+        failures_file (str or bool): Path of file to list every failure in,
+            one per line, when there are more than failures_shown. True
+            lists them in a new temporary file. Its path is shown in the
+            error message.
+        memoize (str or MemoCache): Where results of func are memoized per
+            value. "parse" shares them within one call, or one
+            parse_scope(), "process" for the life of the process, or pass
+            a MemoCache of
+            your own. Not memoized when None. Only memoize funcs whose
+            result depends on the value alone.
+        stream_values (bool): Whether a value of "-" or "@path" is replaced
+            by the values read from stdin or the file at path, one per
+            line. They're run through func stream_chunk_size at a time and
+            a StreamedValues is stored instead of a list.
+        lazy_values (bool): Whether streamed values are mapped while
+            iterating over the StreamedValues stored instead of while
+            parsing. Errors are raised while iterating then.
+        stream_chunk_size (int): Number of streamed values run at a time.
+            stream_utils.DEFAULT_CHUNK_SIZE when None.
 
     """
 
     func = None
     error_message = None
+    workers = None
+    executor = None
+    processes = None
+    chunksize = None
+    max_failures = None
+    failures_shown = 100
+    failures_file = None
+    memoize = None
+    stream_values = False
+    lazy_values = False
+    stream_chunk_size = None
+
+    def _set_execution_options(
+        self, workers=None, executor=None, processes=None, chunksize=None
+    ):
+        """Accept workers, executor, processes and chunksize passed in with
+        add_argument"""
+        if workers is not None:
+            if not isinstance(workers, int) or workers < 1:
+                raise ValueError("workers has to be a positive int")
+            self.workers = workers
+        if executor is not None:
+            self.executor = executor
+        if processes is not None:
+            if not isinstance(processes, int) or processes < 1:
+                raise ValueError("processes has to be a positive int")
+            if workers is not None or executor is not None:
+                raise ValueError(
+                    "processes can't be combined with workers or executor"
+                )
+            self.processes = processes
+        if chunksize is not None:
+            if not isinstance(chunksize, int) or chunksize < 1:
+                raise ValueError("chunksize has to be a positive int")
+            self.chunksize = chunksize
+
+    def _process_pool(self):
+        """Return ProcessPoolExecutor to run func in, or None"""
+        if _is_process_pool(self.executor):
+            return self.executor
+        if not self.processes:
+            return None
+
+        scope = current_parse_scope()
+        if scope is None:
+            return None
+        return scope.get(
+            ("process_pool", self.processes),
+            functools.partial(_create_process_pool, self.processes),
+            close=_shut_down_process_pool,
+        )
 
-    @classmethod
-    def _run_user_func(cls, value):
-        """Runs cls.func over value
+    def _process_func(self):
+        """Return func to run over values in worker processes
+
+        It has to be picklable. Worker processes are shared, so anything
+        func depends on apart from the value has to be sent along with it.
+
+        """
+        return type(self).func
+
+    def _map_in_processes(self, pool, func, fallback, values):
+        """Yield func(value) for every value in values, in order, from pool
+
+        Args:
+            pool (concurrent.futures.ProcessPoolExecutor): From
+                _process_pool()
+            func (func): Picklable func to run in worker processes
+            fallback (func): Run in this process for values func can't be
+                run over in worker processes
+
+        """
+        yield from _map_in_processes(
+            pool,
+            func,
+            fallback,
+            values,
+            self.chunksize or DEFAULT_CHUNKSIZE,
+            2 * (self.processes or os.cpu_count() or 1),
+        )
+
+    def _set_max_failures(self, max_failures=None):
+        """Accept max_failures passed in with add_argument"""
+        if max_failures is not None:
+            if not isinstance(max_failures, int) or max_failures < 1:
+                raise ValueError("max_failures has to be a positive int")
+            self.max_failures = max_failures
+
+    def _set_failure_report(self, failures_shown=None, failures_file=None):
+        """Accept failures_shown and failures_file passed in with
+        add_argument"""
+        if failures_shown is not None:
+            if not isinstance(failures_shown, int) or failures_shown < 1:
+                raise ValueError("failures_shown has to be a positive int")
+            self.failures_shown = failures_shown
+        if failures_file is not None and failures_file is not False:
+            if failures_file is not True and not isinstance(
+                failures_file, str
+            ):
+                raise ValueError("failures_file has to be True or a path")
+            self.failures_file = failures_file
+
+    def _set_memoize(self, memoize=None):
+        """Accept memoize passed in with add_argument"""
+        if memoize is not None:
+            if self.processes or _is_process_pool(self.executor):
+                # Results are returned by worker processes, never memoized
+                raise ValueError("memoize can't be combined with processes")
+            if memoize not in ("parse", "process") and not isinstance(
+                memoize, MemoCache
+            ):
+                raise ValueError(
+                    'memoize has to be "parse", "process" or a MemoCache'
+                )
+            self.memoize = memoize
+
+    def _set_value_streaming(self, stream_values=None, lazy_values=None):
+        """Accept stream_values and lazy_values passed in with
+        add_argument"""
+        _check_value_streaming(stream_values, lazy_values)
+        if stream_values:
+            self.stream_values = True
+        if lazy_values:
+            self.lazy_values = True
+
+    def _memo_cache(self):
+        """Return MemoCache to memoize func results in, or None"""
+        if self.memoize is None:
+            return None
+        if self.memoize == "process":
+            return default_memo_cache()
+        if self.memoize == "parse":
+            scope = current_parse_scope()
+            if scope is None:
+                return None
+            return scope.get("memo_cache", MemoCache)
+        return self.memoize
+
+    def _map_user_func(self, values):
+        """Yield results of running func over each value in values, in order
+
+        Runs serially unless workers, executor or processes is set.
+        Otherwise func calls are spread over the executor, a thread pool of
+        workers threads or worker processes, with a bounded number of values
+        in flight.
+
+        Args:
+            values (iterable): The values to run cls.func upon
+
+        """
+        pool = self._process_pool()
+        if pool is not None:
+            yield from self._map_in_processes(
+                pool, self._process_func(), self._run_memoized, values
+            )
+            return
+
+        if not self.workers and self.executor is None:
+            for value in values:
+                yield self._run_memoized(value)
+            return
+
+        limit = 2 * (self.workers or os.cpu_count() or 1)
+        if self.executor is not None:
+            yield from _map_within_bounds(
+                self.executor, self._run_memoized, values, limit
+            )
+        else:
+            # Imported on first use as it imports logging
+            import concurrent.futures
+
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers
+            ) as executor:
+                yield from _map_within_bounds(
+                    executor, self._run_memoized, values, limit
+                )
+
+    def _run_memoized(self, value):
+        """Runs _run_user_func over value, passing it the MemoCache of the
+        action when it memoizes
+
+        Used inside __call__
+
+        Args:
+            value (type): The value to run cls.func upon
+
+        """
+        cache = self._memo_cache()
+        if cache is None:
+            return self._run_user_func(value)
+        return self._run_user_func(value, memo_cache=cache)
 
-        Used nside __call__
+    @classmethod
+    def _run_user_func(cls, value, memo_cache=None):
+        """Runs cls.func over value, or returns its memoized result
 
         Needs to be @classmethod to avoid
         1. including self when being called in other methods
@@ -130,9 +890,155 @@ class BaseAction(ActionHeroAction):
         Args:
             cls (cls): classmethod argument
             value (type): The value to run cls.func upon
+            memo_cache (MemoCache): Memoizes the result of cls.func, if given
+
+        """
+        if memo_cache is None:
+            return cls.func(value)
+        return memo_cache.call(cls.func, value)
+
+    def _failure_message(self, failures):
+        """Return error message reporting failures
+
+        Args:
+            failures (list): Values that failed
+
+        """
+        return "{}: {}".format(
+            self.error_message, ", ".join(map(str, failures))
+        )
+
+    def _collect_failures(self, values, results, is_failure, failures=None):
+        """Return values whose result is a failure and the number of values
+        left unchecked once max_failures were found
+
+        Args:
+            values (list): Values checked
+            results (generator): Result per value from _map_user_func. It is
+                closed when checking stops early, cancelling pending work.
+            is_failure (func): Returns whether a result is a failure
+            failures (list): Failures found before, e.g. in earlier chunks of
+                streamed values, which failures are appended to
+
+        """
+        if failures is None:
+            failures = []
+        checked = 0
+        with contextlib.closing(results):
+            for value, result in zip(values, results):
+                checked += 1
+                if is_failure(result):
+                    failures.append(value)
+                    if len(failures) == self.max_failures:
+                        break
+        return failures, len(values) - checked
+
+    def _write_failures_file(self, failures):
+        """Write failures one per line to failures_file and return its path
+
+        Returns None when failures_file isn't set or can't be written.
+
+        """
+        try:
+            if self.failures_file is True:
+                import tempfile
+
+                fd, path = tempfile.mkstemp(
+                    prefix="action_hero-failures-", suffix=".txt"
+                )
+                f = open(fd, "w", encoding="utf-8")
+            else:
+                path = self.failures_file
+                f = open(path, "w", encoding="utf-8")
+            with f:
+                f.writelines("{}\n".format(value) for value in failures)
+        except OSError:
+            return None
+        return path
+
+    def _check_streamed(self, values):
+        """Check values streamed from their sources a chunk at a time and
+        return StreamedValues of them
+
+        Raises:
+            FailedValuesError: Reporting failures, as _raise_failures
 
         """
-        return cls.func(value)
+        from action_hero.stream_utils import spill_values
+
+        chunk_size = _stream_chunk_size(self)
+        failures = []
+        not_checked = 0
+
+        def check_chunk(chunk):
+            nonlocal not_checked
+            if len(failures) == self.max_failures:
+                # Only counted once max_failures were found
+                not_checked += len(chunk)
+            else:
+                _, unchecked = self._collect_failures(
+                    chunk,
+                    self._map_user_func(chunk),
+                    lambda result: not result,
+                    failures,
+                )
+                not_checked += unchecked
+            return chunk
+
+        # Values checked are spilled even when all are read from files, as
+        # the files could change before the values are used
+        checked = spill_values(values, check_chunk, chunk_size)
+
+        if failures:
+            checked.close()
+            self._raise_failures(failures, not_checked)
+        return checked
+
+    def _map_streamed(self, values, run_chunk):
+        """Return StreamedValues of run_chunk over chunks of values streamed
+        from their sources, mapped now or lazily as lazy_values says"""
+        from action_hero.stream_utils import spill_values, streamed_source
+
+        chunk_size = _stream_chunk_size(self)
+        if self.lazy_values:
+            return streamed_source(
+                values, _profiled_chunks(self, run_chunk), chunk_size
+            )
+        return spill_values(values, run_chunk, chunk_size)
+
+    def _raise_failures(self, failures, not_checked=0):
+        """Raise FailedValuesError reporting failures
+
+        Only the first failures_shown failures are put in the message, so
+        its length is bounded however many values failed.
+
+        Args:
+            failures (list): Values that failed
+            not_checked (int): Number of values left unchecked
+
+        """
+        from action_hero.profile_utils import count_failures
+
+        count_failures(len(failures))
+        message = self._failure_message(failures[: self.failures_shown])
+
+        not_shown = len(failures) - self.failures_shown
+        failures_file = None
+        if not_shown > 0:
+            message += " …and {:,} more failing value(s)".format(not_shown)
+            if self.failures_file:
+                failures_file = self._write_failures_file(failures)
+        if not_checked:
+            message += " …and {:,} more value(s) not checked".format(
+                not_checked
+            )
+        if failures_file:
+            message += " (all failing values are listed in {})".format(
+                failures_file
+            )
+        raise FailedValuesError(
+            self, message, failures, not_checked, failures_file
+        )
 
 
 class CheckAction(BaseAction):
@@ -142,7 +1048,21 @@ class CheckAction(BaseAction):
     """
 
     def __init__(
-        self, option_strings, dest, nargs=None, help=None, metavar=None
+        self,
+        option_strings,
+        dest,
+        nargs=None,
+        help=None,
+        metavar=None,
+        workers=None,
+        executor=None,
+        processes=None,
+        chunksize=None,
+        max_failures=None,
+        failures_shown=None,
+        failures_file=None,
+        memoize=None,
+        stream_values=None,
     ):
         for attr in ["func", "error_message"]:
             # Use getattr. hasattr returns True as they're initialized to None.
@@ -151,6 +1071,17 @@ class CheckAction(BaseAction):
                     "Please supply required attribute: {}".format(attr)
                 )
 
+        self._set_execution_options(
+            workers=workers,
+            executor=executor,
+            processes=processes,
+            chunksize=chunksize,
+        )
+        self._set_max_failures(max_failures)
+        self._set_failure_report(failures_shown, failures_file)
+        self._set_memoize(memoize)
+        self._set_value_streaming(stream_values)
+
         super().__init__(
             option_strings=option_strings,
             dest=dest,
@@ -160,29 +1091,34 @@ class CheckAction(BaseAction):
         )
 
     def __call__(self, parser, namespace, values, option_string=None):
+        # When values are read from stdin or files
+        if _is_streamed(self, values):
+            values = self._check_streamed(values)
+
         # When values are a list of strings
-        if isinstance(values, list):
-            failures = [
-                value for value in values if not self._run_user_func(value)
-            ]
+        elif isinstance(values, list):
+            failures, not_checked = self._collect_failures(
+                values, self._map_user_func(values), lambda result: not result
+            )
 
             if failures:
-                raise argparse.ArgumentError(
-                    self,
-                    "{}: {}".format(self.error_message, ", ".join(failures)),
-                )
+                self._raise_failures(failures, not_checked)
 
         # When values is one string
         else:
             value = values
-            if not self._run_user_func(value):
+            if not self._run_memoized(value):
                 failure = value
-                raise argparse.ArgumentError(
-                    self, "{}: {}".format(self.error_message, failure)
-                )
+                self._raise_failures([failure])
 
         setattr(namespace, self.dest, values)
 
+    def _pipeline_stage(self):
+        # Subclasses with a __call__ of their own may rely on it to check
+        if type(self).__call__ is not CheckAction.__call__:
+            return None
+        return "check", self._run_memoized
+
 
 class CheckPresentInValuesAction(BaseAction):
     """Checks result func over each value in values is in action_values.
@@ -193,6 +1129,10 @@ class CheckPresentInValuesAction(BaseAction):
         action_values (list[str]): List of strings to accept as values used to
             check presence in with results of func attribute.
 
+    Membership is looked up in an index of action_values built once in
+    __init__. Call _build_action_values_index() after changing
+    action_values.
+
     """
 
     action_values = None
@@ -206,6 +1146,14 @@ class CheckPresentInValuesAction(BaseAction):
         type=None,
         help=None,
         metavar=None,
+        workers=None,
+        executor=None,
+        processes=None,
+        chunksize=None,
+        max_failures=None,
+        failures_shown=None,
+        failures_file=None,
+        memoize=None,
     ):
         for attr in ["func", "error_message"]:
             # Use getattr. hasattr returns True as they're initialized to None.
@@ -214,6 +1162,16 @@ class CheckPresentInValuesAction(BaseAction):
                     "Please supply required attribute: {}".format(attr)
                 )
 
+        self._set_execution_options(
+            workers=workers,
+            executor=executor,
+            processes=processes,
+            chunksize=chunksize,
+        )
+        self._set_max_failures(max_failures)
+        self._set_failure_report(failures_shown, failures_file)
+        self._set_memoize(memoize)
+
         # Raise exception if action_values are invalid, else accept
         _raise_exception_if_invalid_action_values(
             action_values=action_values,
@@ -233,12 +1191,16 @@ class CheckPresentInValuesAction(BaseAction):
             metavar=metavar,
         )
 
-    def __call__(self, parser, namespace, values, option_string=None):
+        self._build_action_values_index()
 
-        # 1. Check presence
+    def _build_action_values_index(self):
+        """Check action_values are of the type values are converted to and
+        index them for lookups in constant time
 
-        # 1.1 Check if something other than default type was given Do type
-        #   conversion of value in values
+        Raises:
+            ValueError: When items in action_values aren't of that type
+
+        """
         # self.type is set when type is passed in with add_argument, else str
         default_type = str
         chosen_type = self.type if self.type else default_type
@@ -249,42 +1211,75 @@ class CheckPresentInValuesAction(BaseAction):
                     chosen_type
                 )
             )
+        self._chosen_type = chosen_type
+
+        try:
+            self._action_values_index = frozenset(self.action_values)
+        except TypeError:
+            # Unhashable action_values are searched through instead
+            self._action_values_index = tuple(self.action_values)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+
+        # 1. Check presence
+
+        # 1.1 Do type conversion of value in values to the type action_values
+        #   were checked to be of in __init__
+        chosen_type = self._chosen_type
+        action_values = self._action_values_index
 
         # 1.2 Check presence for every value in values
         if isinstance(values, list):
-            failures = [
-                value
-                for value in values
-                if self._run_user_func(chosen_type(value))
-                not in self.action_values
-            ]
+            results = self._map_user_func(
+                chosen_type(value) for value in values
+            )
+            failures, not_checked = self._collect_failures(
+                values,
+                results,
+                lambda result: result not in action_values,
+            )
 
             if failures:
-                raise argparse.ArgumentError(
-                    self,
-                    "{}: {}".format(self.error_message, ", ".join(failures)),
-                )
+                self._raise_failures(failures, not_checked)
 
         # 1.3 Check presence for values
         else:
             value = values
-            if (
-                not self._run_user_func(chosen_type(value))
-                in self.action_values
-            ):
+            if not self._run_memoized(chosen_type(value)) in action_values:
                 failure = value
-                raise argparse.ArgumentError(
-                    self, "{}: {}".format(self.error_message, failure)
-                )
+                self._raise_failures([failure])
 
         setattr(namespace, self.dest, values)
 
+    def _pipeline_stage(self):
+        # Subclasses with a __call__ of their own may rely on it to check
+        if type(self).__call__ is not CheckPresentInValuesAction.__call__:
+            return None
+
+        chosen_type = self._chosen_type
+        action_values = self._action_values_index
+
+        def is_present(value):
+            return self._run_memoized(chosen_type(value)) in action_values
+
+        return "check", is_present
+
 
 class MapAction(BaseAction):
     """Maps func on values. Args from main suoperclass argparse.Action."""
 
     def __init__(
-        self, option_strings, dest, nargs=None, help=None, metavar=None
+        self,
+        option_strings,
+        dest,
+        nargs=None,
+        help=None,
+        metavar=None,
+        workers=None,
+        executor=None,
+        processes=None,
+        chunksize=None,
+        memoize=None,
     ):
         for attr in ["func"]:
             # Use getattr. hasattr returns True as they're initialized to None.
@@ -293,6 +1288,14 @@ class MapAction(BaseAction):
                     "Please supply required attribute: {}".format(attr)
                 )
 
+        self._set_execution_options(
+            workers=workers,
+            executor=executor,
+            processes=processes,
+            chunksize=chunksize,
+        )
+        self._set_memoize(memoize)
+
         super().__init__(
             option_strings=option_strings,
             dest=dest,
@@ -304,12 +1307,13 @@ class MapAction(BaseAction):
     def __call__(self, parser, namespace, values, option_string=None):
         # When values are a list of strings
         if isinstance(values, list):
-            [self._run_user_func(value) for value in values]
+            for _ in self._map_user_func(values):
+                pass
 
         # When values is one string
         else:
             value = values
-            self._run_user_func(value)
+            self._run_memoized(value)
 
         setattr(namespace, self.dest, values)
 
@@ -319,7 +1323,19 @@ class MapAndReplaceAction(BaseAction):
     superclass argparse.Action"""
 
     def __init__(
-        self, option_strings, dest, nargs=None, help=None, metavar=None
+        self,
+        option_strings,
+        dest,
+        nargs=None,
+        help=None,
+        metavar=None,
+        workers=None,
+        executor=None,
+        processes=None,
+        chunksize=None,
+        memoize=None,
+        stream_values=None,
+        lazy_values=None,
     ):
         for attr in ["func"]:
             # Use getattr. hasattr returns True as they're initialized to None.
@@ -328,6 +1344,15 @@ class MapAndReplaceAction(BaseAction):
                     "Please supply required attribute: {}".format(attr)
                 )
 
+        self._set_execution_options(
+            workers=workers,
+            executor=executor,
+            processes=processes,
+            chunksize=chunksize,
+        )
+        self._set_memoize(memoize)
+        self._set_value_streaming(stream_values, lazy_values)
+
         super().__init__(
             option_strings=option_strings,
             dest=dest,
@@ -337,19 +1362,37 @@ class MapAndReplaceAction(BaseAction):
         )
 
     def __call__(self, parser, namespace, values, option_string=None):
+        # When values are read from stdin or files
+        if _is_streamed(self, values):
+            values = self._map_streamed(
+                values, lambda chunk: list(self._map_user_func(chunk))
+            )
+
         # When values are a list of strings
-        if isinstance(values, list):
-            updated = [self._run_user_func(value) for value in values]
+        elif isinstance(values, list):
+            updated = list(self._map_user_func(values))
             values = updated
 
         # When values is one string
         else:
             value = values
-            updated = self._run_user_func(value)
+            updated = self._run_memoized(value)
             values = updated
 
         setattr(namespace, self.dest, values)
 
+    def _pipeline_stage(self):
+        if type(self).__call__ is not MapAndReplaceAction.__call__:
+            return None
+        return "map", self._run_memoized
+
+
+# (PipelineAction, index of child, time.perf_counter() when the pipeline
+# was called) of the PipelineAction child being called, if any
+_current_pipeline_step = contextvars.ContextVar(
+    "action_hero_pipeline_step", default=None
+)
+
 
 class PipelineAction(ActionHeroAction):
     """Run ActionHero actions thrugh a pipeline.
@@ -359,27 +1402,31 @@ class PipelineAction(ActionHeroAction):
         2. Logical: Piping some actions might not make logical sense.
             e.g. FilexxxActions to URLxxxActions
 
-    Known Issues with Testing:
-        Cases when the parser has pipeline action with multiple action_values
-        due to the way argumenterrors are raised and exits.  Current workaround
-        solution is to run those particular tests in a subprocess.  Note that
-        this workaround WILL ONLY WORK when action_hero module is available
-        e.g. with `pip install --editable .` which might not be the case on a
-        different system. e.g. a CI system where action_hero module is not
-        loaded.
-
     Attributes:
-        children (list): Valid action_hero actions to pipeline through.
-            Order of children is to be preserved.
+        children (list): Valid action_hero actions to pipeline through, one
+            instance of each per PipelineAction. Order of children is to be
+            preserved.
         action_values (list[Action/(Action, [str])): Action values to this
             class contains a list of one of two valid options:
                 1. [action_hero action]
                 2. Tuple of (action_hero action, action_values<list>)
+        stream_values (bool): Whether a value of "-" or "@path" is replaced
+            by the values read from stdin or the file at path, one per
+            line. They're piped through the children stream_chunk_size at a
+            time and a StreamedValues is stored instead of a list.
+        lazy_values (bool): Whether streamed values are piped through while
+            iterating over the StreamedValues stored instead of while
+            parsing. Errors are raised while iterating then.
+        stream_chunk_size (int): Number of streamed values piped at a time.
+            stream_utils.DEFAULT_CHUNK_SIZE when None.
 
     """
 
-    children = []
+    children = None
     action_values = None
+    stream_values = False
+    lazy_values = False
+    stream_chunk_size = None
 
     @staticmethod
     def _is_valid_action_hero_action(action):
@@ -393,8 +1440,16 @@ class PipelineAction(ActionHeroAction):
         nargs=None,
         help=None,
         metavar=None,
+        stream_values=None,
+        lazy_values=None,
     ):
 
+        _check_value_streaming(stream_values, lazy_values)
+        if stream_values:
+            self.stream_values = True
+        if lazy_values:
+            self.lazy_values = True
+
         # Raise exception if action_values are invalid, else accept
         _raise_exception_if_invalid_action_values(
             action_values=action_values,
@@ -405,6 +1460,10 @@ class PipelineAction(ActionHeroAction):
         )
         self.action_values = action_values
 
+        # Children belong to this instance alone. The list isn't changed
+        # after __init__, so parsing with it from many threads is safe.
+        self.children = []
+
         # Add actions as children
         for value in self.action_values:
             # Form 1 tuple of action class and it's action_values
@@ -471,20 +1530,140 @@ class PipelineAction(ActionHeroAction):
         using similar attributes such as namespace, parser etc. and as they
         each get called one after the other, they replace dest with their
         result. Thus they end up piping through results via `dest` in this
-        namespace.
+        namespace: each action gets the values the action before it left in
+        dest.
 
         No need to call setattr(namespace, self.dest, values) here, because
         we'll be leaving the result of the last action in the pipeline as it
         is and PipeineAction doesnt make any namespace changes
 
+        Consecutive children that can run over one value at a time are fused
+        and values stream through them one at a time. See _run_stages.
+
+        With stream_values, values read from stdin or files are piped
+        through the children a chunk at a time, as if each chunk was all of
+        values, and a StreamedValues of what comes out is left in dest.
+
         """
+        if _is_streamed(self, values):
+            from action_hero.stream_utils import spill_values, streamed_source
+
+            chunk_size = _stream_chunk_size(self)
+            if self.lazy_values:
+                # Children called later leave results in a namespace of
+                # their own
+                pipe = functools.partial(
+                    self._pipe,
+                    parser,
+                    argparse.Namespace(**vars(namespace)),
+                    option_string=option_string,
+                )
+                piped = streamed_source(
+                    values, _profiled_chunks(self, pipe), chunk_size
+                )
+            else:
+                pipe = functools.partial(
+                    self._pipe, parser, namespace, option_string=option_string
+                )
+                piped = spill_values(values, pipe, chunk_size)
+            setattr(namespace, self.dest, piped)
+        else:
+            self._pipe(parser, namespace, values, option_string)
+
+    def _pipe(self, parser, namespace, values, option_string=None):
+        """Pipe values through the children and return what the last one
+        left in dest"""
+        from action_hero.profile_utils import profile_registry, profiled_stages
+
+        started = time.perf_counter()
+        for step in self._compile():
+            if isinstance(step, list) and profile_registry.enabled:
+                with profiled_stages(step) as stages:
+                    setattr(
+                        namespace, self.dest, self._run_stages(stages, values)
+                    )
+            elif isinstance(step, list):
+                setattr(namespace, self.dest, self._run_stages(step, values))
+            else:
+                token = _current_pipeline_step.set(
+                    (self, self.children.index(step), started)
+                )
+                try:
+                    step(
+                        parser=parser,
+                        namespace=namespace,
+                        values=values,
+                        option_string=option_string,
+                    )
+                finally:
+                    _current_pipeline_step.reset(token)
+            values = getattr(namespace, self.dest)
+        return values
+
+    def _compile(self):
+        """Return children grouped into steps to run one after the other
+
+        A step is either a child to call with all values, or a list of
+        (child, kind, func) stages of consecutive children that can run over
+        one value at a time. MapAction children and any with a __call__ of
+        their own are called, as their side effects or checks may depend on
+        the whole of values.
+
+        """
+        steps = []
         for child in self.children:
-            child(
-                parser=parser,
-                namespace=namespace,
-                values=values,
-                option_string=option_string,
-            )
+            stage = child._pipeline_stage()
+            if stage is None:
+                steps.append(child)
+            elif steps and isinstance(steps[-1], list):
+                steps[-1].append((child, *stage))
+            else:
+                steps.append([(child, *stage)])
+        return steps
+
+    @staticmethod
+    def _run_stages(stages, values):
+        """Stream each value through stages and return the values coming out
+        of the last stage
+
+        Each stage gets what the stage before it passed on: "map" stages pass
+        on their result and "check" stages the value they checked. Only one
+        value is between stages at any time, so no stage's results are held
+        other than those of the last stage.
+
+        A value stops at the first stage it fails. Stages after the lowest
+        failing stage found so far are skipped, as only failures of the
+        lowest failing stage are reported. Those are the same failures
+        running the stages one after the other over all values would report.
+
+        Raises:
+            argparse.ArgumentError: Reporting values the lowest failing stage
+                failed, as they came into that stage, in order
+
+        """
+        failures = collections.defaultdict(list)
+        lowest_failing = len(stages)
+        results = []
+
+        for value in values if isinstance(values, list) else [values]:
+            for index, (_, kind, func) in enumerate(
+                stages[: lowest_failing + 1]
+            ):
+                if kind == "map":
+                    value = func(value)
+                elif not func(value):
+                    failures[index].append(value)
+                    lowest_failing = index
+                    break
+            else:
+                if not failures:
+                    results.append(value)
+
+        if failures:
+            child = stages[lowest_failing][0]
+            child._raise_failures(failures[lowest_failing])
+
+        return results if isinstance(values, list) else results[0]
 
 
 class ExitCapturedArgumentParser(argparse.ArgumentParser):
@@ -512,20 +1691,6 @@ class ExitCapturedArgumentParser(argparse.ArgumentParser):
         raise ValueError(error_message)
 
 
-class ActionHeroTestCase(unittest.TestCase):
-    """unitests.TestCase subclass that encloses a ExitCapturedArgumentParser
-
-    Reason for a special TestCase:
-        1. Enclose parser within setup
-        2. The enclosed parser should capture exits and raise ValueError
-
-    """
-
-    def setUp(self):
-        """Enclose ExitCapturedArgumentParser as parser"""
-        self.parser = ExitCapturedArgumentParser()
-
-
 def _raise_exception_if_invalid_action_values(
     action_values=None,
     container_type=list,
@@ -715,6 +1880,8 @@ class DisplayMessageAndGetInputAction(BaseAction):
         try:
             # 2. If self.hide_input_on_screen
             if self.hide_input_on_screen:
+                import getpass
+
                 # 2.1 Get user input (while hiding characters)
                 values = getpass.getpass(display_message)
 
@@ -730,49 +1897,207 @@ class DisplayMessageAndGetInputAction(BaseAction):
         setattr(namespace, self.dest, values)
 
 
+def _sample(values, limit):
+    """Return up to limit of values, evenly spaced from first to last"""
+    if len(values) <= limit:
+        return list(values)
+    if limit == 1:
+        return [values[0]]
+    last = len(values) - 1
+    return [values[i * last // (limit - 1)] for i in range(limit)]
+
+
+@functools.lru_cache(maxsize=None)
+def _public_class_attributes(cls):
+    """Return names of public attributes of cls that aren't callable"""
+    return tuple(
+        name
+        for name in dir(cls)
+        if not name.startswith("_") and not callable(getattr(cls, name))
+    )
+
+
 class DebugAction(BaseAction):
-    """Prints debug information"""
+    """Prints debug information
+
+    ACTION_HERO_DEBUG picks the output:
+        text: A box of attributes, namespace and values, printed to stdout.
+            This is the default.
+        json: One JSON object per call, written to the file descriptor in
+            ACTION_HERO_DEBUG_FD, 2 i.e. stderr by default. It adds timings
+            and the position of the action within its PipelineAction.
+        off: Nothing. DebugAction returns straight away.
+
+    Attributes:
+        max_values (int): Most values shown of a list of values. Longer lists
+            are sampled evenly from first to last and their length shown.
+
+    """
+
+    max_values = 10
 
     def __call__(self, parser, namespace, values, option_string=None):
+        output = os.environ.get("ACTION_HERO_DEBUG", "text")
+        if output in ("off", "0", ""):
+            return
 
+        if output == "json":
+            self._write_json(namespace, values, option_string)
+        else:
+            self._print_text(namespace, values, option_string)
+
+    def _attributes(self):
+        """Return public attributes that aren't callable, by name"""
+        attributes = {
+            name: getattr(self, name)
+            for name in _public_class_attributes(type(self))
+        }
+        attributes.update(
+            (name, value)
+            for name, value in vars(self).items()
+            if not name.startswith("_") and not callable(value)
+        )
+        return dict(sorted(attributes.items()))
+
+    def _summary(self, value):
+        """Return value, or a sample and count of a long list of values"""
+        if isinstance(value, (list, tuple)) and len(value) > self.max_values:
+            return {
+                "count": len(value),
+                "sample": _sample(value, self.max_values),
+            }
+        return value
+
+    def _format_values(self, value):
+        """Return repr of value, sampled when a long list of values"""
+        if isinstance(value, (list, tuple)) and len(value) > self.max_values:
+            return "{!r} ({} of {:,} values)".format(
+                _sample(value, self.max_values), self.max_values, len(value)
+            )
+        return repr(value)
+
+    def _timings(self):
+        """Return seconds since the parse and the pipeline, if any, began
+        and index of this action within the pipeline"""
+        now = time.perf_counter()
+        timings = {"parse_elapsed": None, "pipeline": None}
+
+        scope = current_parse_scope()
+        if scope is not None:
+            timings["parse_elapsed"] = now - scope.started
+
+        step = _current_pipeline_step.get()
+        if step is not None:
+            pipeline, index, started = step
+            timings["pipeline"] = {
+                "index": index,
+                "length": len(pipeline.children),
+                "previous": type(pipeline.children[index - 1]).__name__
+                if index
+                else None,
+                "elapsed": now - started,
+            }
+        return timings
+
+    def _write_json(self, namespace, values, option_string):
+        import json
+
+        record = {
+            "time": time.time(),
+            "dest": self.dest,
+            "option_string": option_string,
+            "values_type": type(values).__name__,
+            "values": self._summary(values),
+            "namespace": {
+                name: self._summary(value)
+                for name, value in vars(namespace).items()
+            },
+            "attributes": self._attributes(),
+            **self._timings(),
+        }
+        line = json.dumps(record, default=repr) + "\n"
+        fd = int(os.environ.get("ACTION_HERO_DEBUG_FD", "2"))
+        # Writing each record whole keeps records from interleaving, though
+        # os.write may write only part of it e.g. to a full pipe
+        data = memoryview(line.encode("utf-8"))
+        while data:
+            data = data[os.write(fd, data):]
+
+    def _print_text(self, namespace, values, option_string):
         # BEGIN
-        print("┌─────────┐")
-        print("│  DEBUG  │")
-        print("├─────────┴─────────")
-
-        attributes = [
-            "{}: {}".format(attribute, getattr(self, attribute))
-            # Get all attributes from dir(self) i.e. self.__dict__
-            for attribute in dir(self)
-            # Remove callables. Use getattr to check using self.attribute
-            if not callable(getattr(self, attribute))
-            # Remove dunders
-            and not (attribute.startswith("__") and attribute.endswith("__"))
-            # Remove private attributes
-            and not (attribute.startswith("_"))
-        ]
+        lines = ["┌─────────┐", "│  DEBUG  │", "├─────────┴─────────"]
 
-        [print("│ {}".format(attribute)) for attribute in attributes]
+        lines.extend(
+            "│ {}: {}".format(name, value)
+            for name, value in self._attributes().items()
+        )
 
-        print("├───────────────────")
+        lines.append("├───────────────────")
 
         # namespace
-        print("│ {}".format(namespace))
+        lines.append(
+            "│ Namespace({})".format(
+                ", ".join(
+                    "{}={}".format(name, self._format_values(value))
+                    for name, value in vars(namespace).items()
+                )
+            )
+        )
 
         # values type and values
         if isinstance(values, list):
             # values is a list
-            print("│ values(list): {}".format(values))
+            lines.append(
+                "│ values(list): {}".format(self._format_values(values))
+            )
 
         else:
             # values is a str
-            print("│ values(str): {}".format(values))
+            lines.append("│ values(str): {}".format(values))
 
         # option_string
         if option_string:
-            print("│ option_string: {}".format(option_string))
+            lines.append("│ option_string: {}".format(option_string))
+
+        pipeline = self._timings()["pipeline"]
+        if pipeline:
+            lines.append(
+                "│ pipeline step: {} of {}".format(
+                    pipeline["index"] + 1, pipeline["length"]
+                )
+            )
+
+        lines.append("└───────────────────")
+        print("\n".join(lines))
+
+
+def _load_json_file(file):
+    """Return contents of json file, raising json.JSONDecodeError"""
+    import json
+
+    with open(file, "r") as f:
+        return json.load(f)
+
+
+def _load_yaml_file(file):
+    """Return contents of yaml file, raising yaml.YAMLError"""
+    import yaml
+
+    try:
+        from yaml import CLoader as Loader
+    except ImportError:
+        from yaml import Loader
+
+    with open(file) as f:
+        return yaml.load(f, Loader=Loader)
 
-        print("└───────────────────")
+
+def _load_pickle_file(file):
+    """Return unpickled contents of file, raising pickle.UnpicklingError"""
+    import pickle
+
+    with open(file, "rb") as f:
+        return pickle.load(f)
 
 
 class LoadSerializedFileAction(BaseAction):
@@ -780,11 +2105,26 @@ class LoadSerializedFileAction(BaseAction):
 
     Args:
         format(str): the format (YAML/JSON) to load file as
+        processes (int): Number of worker processes to load files in
+        chunksize (int): Number of files sent to a worker process at a time
 
     """
 
     format = None
 
+    # Module level loaders per format that can be run in worker processes.
+    # Files they fail to load are loaded again with the methods below to
+    # raise their errors.
+    _file_loaders = {
+        "json": _load_json_file,
+        "yaml": _load_yaml_file,
+        "pickle": _load_pickle_file,
+    }
+
+    def __init__(self, *args, processes=None, chunksize=None, **kwargs):
+        self._set_execution_options(processes=processes, chunksize=chunksize)
+        super().__init__(*args, **kwargs)
+
     def load_json_from_file(self, file):
         """Return loaded json file
 
@@ -799,9 +2139,10 @@ class LoadSerializedFileAction(BaseAction):
                 loaded json cannot be decoded
 
         """
+        import json
+
         try:
-            with open(file, "r") as f:
-                return json.load(f)
+            return _load_json_file(file)
 
         except json.JSONDecodeError as e:
             raise argparse.ArgumentError(
@@ -822,9 +2163,10 @@ class LoadSerializedFileAction(BaseAction):
                 yaml cannot be loaded
 
         """
+        import yaml
+
         try:
-            with open(file) as f:
-                return yaml.load(f, Loader=Loader)
+            return _load_yaml_file(file)
 
         except yaml.YAMLError as e:
             if hasattr(e, "problem_mark"):
@@ -853,9 +2195,10 @@ class LoadSerializedFileAction(BaseAction):
                 yaml cannot be loaded
 
         """
+        import pickle
+
         try:
-            with open(file, "rb") as f:
-                return pickle.load(f)
+            return _load_pickle_file(file)
 
         except pickle.UnpicklingError as e:
             raise argparse.ArgumentError(self, e)
@@ -869,7 +2212,13 @@ class LoadSerializedFileAction(BaseAction):
         ) as e:
             raise argparse.ArgumentError(self, "Unable to unpickle: {}", e)
 
-    def __call__(self, parser, namespace, values, option_string=None):
+    def _loader(self):
+        """Return method loading a file in self.format
+
+        Raises:
+            ValueError: When self.format is missing or unsupported
+
+        """
         loader_for_format = {
             "json": self.load_json_from_file,
             "yaml": self.load_yaml_from_file,
@@ -891,22 +2240,37 @@ class LoadSerializedFileAction(BaseAction):
                 )
             )
 
+        return loader_for_format[self.format]
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        loader = self._loader()
+
         # Run loader and save to self.dest
+        # When values is a list
+        if isinstance(values, list):
+            pool = self._process_pool()
+            if pool is not None:
+                values = list(
+                    self._map_in_processes(
+                        pool, self._file_loaders[self.format], loader, values
+                    )
+                )
+            else:
+                values = [loader(value) for value in values]
+
+        # When values is a str
         else:
-            # When values is a list
-            if isinstance(values, list):
-                values = [
-                    loader_for_format[self.format](value) for value in values
-                ]
+            value = values
+            value = loader(value)
+            values = value
 
-            # When values is a str
-            else:
-                value = values
-                value = loader_for_format[self.format](value)
-                values = value
+        # Save to self.dest
+        setattr(namespace, self.dest, values)
 
-            # Save to self.dest
-            setattr(namespace, self.dest, values)
+    def _pipeline_stage(self):
+        if type(self).__call__ is not LoadSerializedFileAction.__call__:
+            return None
+        return "map", self._loader()
 
 
 class CollectIntoContainerAction(BaseAction):
@@ -929,6 +2293,8 @@ class CollectIntoContainerAction(BaseAction):
         type=None,
         help=None,
         metavar=None,
+        failures_shown=None,
+        failures_file=None,
     ):
 
         # Accept action_values but only do verification within dict
@@ -937,6 +2303,8 @@ class CollectIntoContainerAction(BaseAction):
         if action_values:
             self.action_values = action_values
 
+        self._set_failure_report(failures_shown, failures_file)
+
         super().__init__(
             option_strings=option_strings,
             dest=dest,
@@ -980,12 +2348,7 @@ class CollectIntoContainerAction(BaseAction):
             if not any([delimiter in value for delimiter in delimiters])
         ]
         if failures:
-            raise argparse.ArgumentError(
-                self,
-                'Delimiter(s) "{}" not present in: {}'.format(
-                    ", ".join(delimiters), ", ".join(failures)
-                ),
-            )
+            self._raise_failures(failures)
 
         # 3. Return a dict with collected kv(key, value) pairs
         d = {}
@@ -1005,6 +2368,11 @@ class CollectIntoContainerAction(BaseAction):
                     break
         return d
 
+    def _failure_message(self, failures):
+        return 'Delimiter(s) "{}" not present in: {}'.format(
+            ", ".join(self.action_values), ", ".join(failures)
+        )
+
     def __call__(self, parser, namespace, values, option_string=None):
         collectors = {
             list: self.collect_into_list,
@@ -1027,3 +2395,37 @@ class CollectIntoContainerAction(BaseAction):
 
         # 4. Save to self.dest
         setattr(namespace, self.dest, values)
+
+
+def __getattr__(name):
+    """Define ActionHeroTestCase on first access
+
+    ActionHeroTestCase subclasses unittest.TestCase, so defining it lazily
+    keeps unittest from being imported by CLIs that never run tests.
+
+    """
+    if name == "ActionHeroTestCase":
+        import unittest
+
+        class ActionHeroTestCase(unittest.TestCase):
+            """unitests.TestCase subclass that encloses a
+            ExitCapturedArgumentParser
+
+            Reason for a special TestCase:
+                1. Enclose parser within setup
+                2. The enclosed parser should capture exits and raise
+                    ValueError
+
+            """
+
+            def setUp(self):
+                """Enclose ExitCapturedArgumentParser as parser"""
+                self.parser = ExitCapturedArgumentParser()
+
+        ActionHeroTestCase.__qualname__ = name
+        globals()[name] = ActionHeroTestCase
+        return ActionHeroTestCase
+
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
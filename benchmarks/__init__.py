@@ -0,0 +1,8 @@
+"""Benchmarks for action_hero
+
+Each benchmark module is runnable with `python -m benchmarks.<module>` from
+the project root. Results can be saved as a JSON baseline with `--save` and
+later checked against it with `--compare`, which exits with a non-zero status
+when a measurement goes over its budget.
+
+"""
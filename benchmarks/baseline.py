@@ -0,0 +1,148 @@
+"""Save, load and compare JSON benchmark baselines
+
+A baseline file holds two mappings keyed by measurement name:
+    results (dict[str, float]): Measured durations in milliseconds
+    budgets (dict[str, float]): Maximum accepted durations in milliseconds
+
+Budgets default to the measured result widened by a tolerance when a
+baseline is saved, and can be edited by hand afterwards.
+
+"""
+import json
+import platform
+import sys
+
+
+__all__ = [
+    "add_baseline_arguments",
+    "compare_results",
+    "load_baseline",
+    "report_results",
+    "run_baseline_command",
+    "save_baseline",
+]
+
+
+def save_baseline(path, results, tolerance=0.25):
+    """Save results and their budgets into a JSON baseline at path
+
+    Args:
+        path (str): Filename to save baseline into
+        results (dict[str, float]): Measured durations in milliseconds
+        tolerance (float): Fraction a result may grow by before it is over
+            its budget
+
+    """
+    baseline = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "budgets": {
+            name: round(value * (1 + tolerance), 4)
+            for name, value in results.items()
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """Return baseline loaded from JSON file at path"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(baseline, results):
+    """Return measurements in results that are over their budget
+
+    Measurements without a budget in baseline are ignored.
+
+    Args:
+        baseline (dict): Baseline as returned by load_baseline
+        results (dict[str, float]): Measured durations in milliseconds
+
+    Returns:
+        list[(str, float, float)]: (name, result, budget) for every
+            measurement over its budget, sorted by name
+
+    """
+    budgets = baseline.get("budgets", {})
+    return sorted(
+        (name, value, budgets[name])
+        for name, value in results.items()
+        if name in budgets and value > budgets[name]
+    )
+
+
+def report_results(results, baseline=None, file=sys.stdout):
+    """Print results as a table, with budgets when baseline is given"""
+    budgets = baseline.get("budgets", {}) if baseline else {}
+    width = max([len(name) for name in results] + [len("measurement")])
+    print(
+        "{}  {:>12}  {:>12}".format(
+            "measurement".ljust(width), "ms", "budget ms"
+        ),
+        file=file,
+    )
+    for name in sorted(results):
+        budget = budgets.get(name)
+        print(
+            "{}  {:>12.3f}  {:>12}".format(
+                name.ljust(width),
+                results[name],
+                "-" if budget is None else "{:.3f}".format(budget),
+            ),
+            file=file,
+        )
+
+
+def add_baseline_arguments(parser):
+    """Add --save, --compare and --tolerance arguments to parser"""
+    from action_hero import FileIsReadableAction, FileIsValidAction
+
+    parser.add_argument(
+        "--save",
+        action=FileIsValidAction,
+        metavar="BASELINE",
+        help="save results as a JSON baseline",
+    )
+    parser.add_argument(
+        "--compare",
+        action=FileIsReadableAction,
+        metavar="BASELINE",
+        help="fail when a result is over its budget in BASELINE",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="fraction a result may grow by when saving budgets",
+    )
+
+
+def run_baseline_command(args, results):
+    """Report results and save or compare them as asked for in args
+
+    Returns:
+        int: Exit status. 1 when a result is over its budget else 0
+
+    """
+    baseline = load_baseline(args.compare) if args.compare else None
+    report_results(results, baseline)
+
+    if args.save:
+        save_baseline(args.save, results, tolerance=args.tolerance)
+
+    if baseline:
+        regressions = compare_results(baseline, results)
+        for name, value, budget in regressions:
+            print(
+                "OVER BUDGET {}: {:.3f}ms > {:.3f}ms".format(
+                    name, value, budget
+                ),
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+
+    return 0
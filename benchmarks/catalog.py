@@ -0,0 +1,356 @@
+"""Benchmarks of every action in the catalog over growing numbers of values
+
+Each action exported from action_hero is called with 1, 100, 10,000 and
+1,000,000 values. Path actions run over a tree of 100,000 files on tmpfs
+when /dev/shm is available, URL actions against the local stand-in server
+of the tests and the rest over synthetic values. Actions are called directly
+with a fresh namespace, so argparse's own parsing isn't measured.
+
+Actions that wait on the network or parse files are only measured up to
+MAX_SIZES of values. Actions that prompt read canned input.
+
+Usage:
+    python -m benchmarks.catalog --save catalog.json
+    python -m benchmarks.catalog --compare catalog.json
+    python -m benchmarks.catalog --actions 'File*' --sizes 1 100
+
+"""
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import uuid
+from unittest import mock
+
+from benchmarks.baseline import add_baseline_arguments, run_baseline_command
+
+
+__all__ = ["MAX_SIZES", "SIZES", "CatalogFixtures", "measure"]
+
+
+SIZES = [1, 100, 10000, 1000000]
+
+# Most values measured for actions too slow to call with every size
+MAX_SIZES = {
+    "URLIsNotReachableAction": 100,
+    "URLIsReachableAction": 100,
+    "URLWithHTTPResponseStatusCodeAction": 100,
+    "LoadJSONFromFileAction": 10000,
+    "LoadPickleFromFileAction": 10000,
+    "LoadYAMLFromFileAction": 10000,
+}
+
+# Files per directory of the tree path actions run over
+_FILES_PER_DIRECTORY = 1000
+
+
+class CatalogFixtures:
+    """Paths, files and server the actions of the catalog run against
+
+    Args:
+        root (str): Directory to create the tree of files in
+        files (int): Number of files in the tree
+        server (tests.http_server.LocalHTTPServer): Running server
+
+    """
+
+    def __init__(self, root, files, server):
+        self.root = root
+        self.server = server
+
+        self.directories = []
+        self.files = []
+        for index in range(files):
+            if index % _FILES_PER_DIRECTORY == 0:
+                directory = os.path.join(
+                    root, "tree", "d{}".format(len(self.directories))
+                )
+                os.makedirs(directory)
+                self.directories.append(directory)
+            path = os.path.join(directory, "f{}.txt".format(index))
+            with open(path, "w") as f:
+                f.write("x")
+            self.files.append(path)
+
+        os.makedirs(os.path.join(root, "empty"))
+        self.empty_files = []
+        for index in range(_FILES_PER_DIRECTORY):
+            path = os.path.join(root, "empty", "e{}.txt".format(index))
+            open(path, "w").close()
+            self.empty_files.append(path)
+
+        self.choices_file = os.path.join(root, "choices.txt")
+        with open(self.choices_file, "w") as f:
+            f.write(
+                "".join(
+                    "choice-{:05}\n".format(index) for index in range(10000)
+                )
+            )
+
+        self.serialized_files = {}
+        for format, dump, mode in [
+            ("json", json.dump, "w"),
+            ("pickle", pickle.dump, "wb"),
+            ("yaml", _dump_yaml, "w"),
+        ]:
+            self.serialized_files[format] = []
+            for index in range(100):
+                path = os.path.join(root, "{}.{}".format(index, format))
+                with open(path, mode) as f:
+                    dump({"index": index, "values": list(range(10))}, f)
+                self.serialized_files[format].append(path)
+
+    def cycle(self, items):
+        """Return func returning items[index], cycling through items"""
+        return lambda index: items[index % len(items)]
+
+    def missing(self, index):
+        return os.path.join(self.root, "missing", str(index))
+
+    def specs(self):
+        """Return (add_argument kwargs, value of index) per action name"""
+        files = self.cycle(self.files)
+        directories = self.cycle(self.directories)
+        uuids = [str(uuid.uuid4()) for _ in range(1000)]
+
+        return {
+            # utils
+            "PipelineAction": (
+                {"action_values": [_action("FileExistsAction")]},
+                files,
+            ),
+            "DebugAction": ({}, str),
+            # net
+            "EmailIsValidAction": ({}, "user{}@example.com".format),
+            "IPIsValidIPAddressAction": ({}, _ipv4_address),
+            "IPIsValidIPv4AddressAction": ({}, _ipv4_address),
+            "IPIsValidIPv6AddressAction": ({}, "2001:db8::{:x}".format),
+            "URLIsNotReachableAction": ({}, "http://127.0.0.1:1/{}".format),
+            "URLIsReachableAction": (
+                {},
+                lambda index: self.server.url("/?{}".format(index)),
+            ),
+            "URLWithHTTPResponseStatusCodeAction": (
+                {"action_values": ["200"]},
+                lambda index: self.server.url("/?{}".format(index)),
+            ),
+            # path
+            "DirectoryDoesNotExistAction": ({}, self.missing),
+            "DirectoryExistsAction": ({}, directories),
+            "DirectoryIsExecutableAction": ({}, directories),
+            "DirectoryIsNotExecutableAction": ({}, directories),
+            "DirectoryIsNotReadableAction": ({}, directories),
+            "DirectoryIsNotWritableAction": ({}, directories),
+            "DirectoryIsReadableAction": ({}, directories),
+            "DirectoryIsValidAction": ({}, directories),
+            "DirectoryIsWritableAction": ({}, directories),
+            "EnsureDirectoryAction": ({}, directories),
+            "EnsureFileAction": ({}, files),
+            "FileDoesNotExistAction": ({}, self.missing),
+            "FileExistsAction": ({}, files),
+            "FileHasExtensionAction": ({"action_values": ["txt"]}, files),
+            "FileIsEmptyAction": ({}, self.cycle(self.empty_files)),
+            "FileIsExecutableAction": ({}, files),
+            "FileIsNotEmptyAction": ({}, files),
+            "FileIsNotExecutableAction": ({}, files),
+            "FileIsNotReadableAction": ({}, files),
+            "FileIsNotWritableAction": ({}, files),
+            "FileIsReadableAction": ({}, files),
+            "FileIsValidAction": ({}, files),
+            "FileIsWritableAction": ({}, files),
+            "PathDoesNotExistsAction": ({}, self.missing),
+            "PathExistsAction": ({}, files),
+            "PathIsExecutableAction": ({}, files),
+            "PathIsNotExecutableAction": ({}, files),
+            "PathIsNotReadableAction": ({}, files),
+            "PathIsNotWritableAction": ({}, files),
+            "PathIsReadableAction": ({}, files),
+            "PathIsValidAction": ({}, files),
+            "PathIsWritableAction": ({}, files),
+            "ResolvePathAction": ({}, files),
+            # types
+            "IsConvertibleToFloatAction": ({}, "{}.5".format),
+            "IsConvertibleToIntAction": ({}, str),
+            "IsConvertibleToUUIDAction": ({}, self.cycle(uuids)),
+            "IsFalsyAction": ({}, lambda index: "0"),
+            "IsTruthyAction": ({}, lambda index: str(index + 1)),
+            # misc
+            "ChoicesAction": (
+                {"action_values": ["red", "green", "blue"]},
+                self.cycle(["red", "green", "blue"]),
+            ),
+            "ChoicesFromFileAction": (
+                {"action_values": [self.choices_file]},
+                lambda index: "choice-{:05}".format(index % 10000),
+            ),
+            "ChoicesFromSortedFileAction": (
+                {"action_values": [self.choices_file]},
+                lambda index: "choice-{:05}".format(index % 10000),
+            ),
+            "CollectIntoDictAction": (
+                {"action_values": ["="]},
+                "key{0}=value{0}".format,
+            ),
+            "CollectIntoListAction": ({}, str),
+            "CollectIntoTupleAction": ({}, str),
+            "ConfirmAction": ({"action_values": ["Proceed?"]}, str),
+            "GetInputAction": ({"action_values": ["Name"]}, str),
+            "GetSecretInputAction": ({"action_values": ["Password"]}, str),
+            "LoadJSONFromFileAction": (
+                {},
+                self.cycle(self.serialized_files["json"]),
+            ),
+            "LoadPickleFromFileAction": (
+                {},
+                self.cycle(self.serialized_files["pickle"]),
+            ),
+            "LoadYAMLFromFileAction": (
+                {},
+                self.cycle(self.serialized_files["yaml"]),
+            ),
+            "NotifyAndContinueAction": (
+                {"action_values": ["Deprecated"]},
+                str,
+            ),
+            "NotifyAndExitAction": ({"action_values": ["Deprecated"]}, str),
+        }
+
+
+def _action(name):
+    import action_hero
+
+    return getattr(action_hero, name)
+
+
+def _dump_yaml(data, f):
+    import yaml
+
+    yaml.dump(data, f)
+
+
+def _ipv4_address(index):
+    return "10.{}.{}.{}".format(
+        index >> 16 & 255, index >> 8 & 255, index & 255
+    )
+
+
+@contextlib.contextmanager
+def _quiet_and_canned_input():
+    """Swallow output and answer prompts of the actions called within"""
+    with contextlib.redirect_stdout(io.StringIO()), mock.patch(
+        "builtins.input", return_value="y"
+    ), mock.patch("getpass.getpass", return_value="secret"):
+        yield
+
+
+def _time_call(action, values, repeat):
+    """Return best time in milliseconds to call action with values"""
+    measurements = []
+    for _ in range(repeat):
+        # Fresh namespace for fresh caches
+        namespace = argparse.Namespace()
+        start = time.perf_counter()
+        try:
+            action(None, namespace, values)
+        except (argparse.ArgumentError, SystemExit):
+            # Failing values, e.g. unwritable paths when running as root,
+            # are still worth timing
+            pass
+        measurements.append(time.perf_counter() - start)
+    return min(measurements) * 1000
+
+
+def measure(fixtures, sizes=SIZES, pattern="*", repeat=3):
+    """Return best times in milliseconds per action and number of values
+
+    Measurements are named "catalog:<action>:<size>".
+
+    Args:
+        fixtures (CatalogFixtures): What actions run against
+        sizes (list[int]): Numbers of values to call each action with
+        pattern (str): fnmatch pattern of action names to measure
+        repeat (int): Runs per measurement
+
+    """
+    import action_hero
+
+    specs = fixtures.specs()
+    missing = set(action_hero.__all__) - set(specs)
+    if missing:
+        raise ValueError(
+            "No benchmark for {}".format(", ".join(sorted(missing)))
+        )
+
+    results = {}
+    for name in sorted(specs):
+        if not fnmatch.fnmatchcase(name, pattern):
+            continue
+
+        kwargs, value = specs[name]
+        parser = argparse.ArgumentParser()
+        action = parser.add_argument(
+            "--values", nargs="+", action=_action(name), **kwargs
+        )
+        for size in sizes:
+            if size > MAX_SIZES.get(name, size):
+                continue
+            values = [value(index) for index in range(size)]
+            with _quiet_and_canned_input():
+                results["catalog:{}:{}".format(name, size)] = _time_call(
+                    action, values, repeat
+                )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=SIZES,
+        help="numbers of values to call each action with",
+    )
+    parser.add_argument(
+        "--actions",
+        default="*",
+        metavar="PATTERN",
+        help="only measure actions matching this fnmatch pattern",
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=100000,
+        help="number of files in the tree path actions run over",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per measurement"
+    )
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    from tests.http_server import LocalHTTPServer
+
+    # Files on tmpfs keep disk speed out of path measurements
+    shm = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    with tempfile.TemporaryDirectory(dir=shm) as root, LocalHTTPServer() as (
+        server
+    ):
+        fixtures = CatalogFixtures(root, args.files, server)
+        results = measure(
+            fixtures,
+            sizes=args.sizes,
+            pattern=args.actions,
+            repeat=args.repeat,
+        )
+    return run_baseline_command(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
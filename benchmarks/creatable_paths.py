@@ -0,0 +1,105 @@
+"""Creatable path check benchmarks
+
+Compares the old temp file probe, which opens every path with mode "x",
+against the metadata only is_existing_or_creatable_path. Both run over
+10,000 paths that don't exist yet in one directory. The metadata check is
+timed both on its own and within a parse, where the shared ancestor is
+stat'ed once.
+
+Usage:
+    python -m benchmarks.creatable_paths --save creatable_paths.json
+    python -m benchmarks.creatable_paths --compare creatable_paths.json
+
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.baseline import add_baseline_arguments, run_baseline_command
+
+
+__all__ = [
+    "is_existing_or_creatable_path_by_probe",
+    "measure",
+]
+
+
+def is_existing_or_creatable_path_by_probe(path):
+    """Returns True if path exists or a file could be created at path
+
+    The previous implementation. Opens path for exclusive creation, so a file
+    is left behind at path when it is creatable.
+
+    """
+    try:
+        with open(path, mode="x") as _:
+            return True
+    except OSError:
+        return os.path.isfile(path) or os.path.isdir(path)
+
+
+def _check_each(func, paths):
+    return all(func(path) for path in paths)
+
+
+def _check_within_parse(paths):
+    from action_hero import PathIsValidAction
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", nargs="+", action=PathIsValidAction)
+    parser.parse_args(["--path", *paths])
+    return True
+
+
+def measure(size, repeat=3):
+    """Return best times in milliseconds for each strategy over size paths"""
+    from action_hero.path_utils import is_existing_or_creatable_path
+
+    strategies = {
+        "probe": lambda paths: _check_each(
+            is_existing_or_creatable_path_by_probe, paths
+        ),
+        "metadata": lambda paths: _check_each(
+            is_existing_or_creatable_path, paths
+        ),
+        "metadata_within_parse": _check_within_parse,
+    }
+
+    results = {}
+    for name, strategy in strategies.items():
+        measurements = []
+        for _ in range(repeat):
+            # Fresh directory per run as the probe leaves files behind
+            with tempfile.TemporaryDirectory() as directory:
+                paths = [
+                    os.path.join(directory, "file-{}".format(index))
+                    for index in range(size)
+                ]
+                start = time.perf_counter()
+                if not strategy(paths):
+                    raise RuntimeError("{} deemed paths invalid".format(name))
+                measurements.append(time.perf_counter() - start)
+        results["creatable:{}:{}".format(name, size)] = (
+            min(measurements) * 1000
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--size", type=int, default=10000, help="number of paths to check"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per measurement"
+    )
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    return run_baseline_command(args, measure(args.size, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
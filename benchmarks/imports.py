@@ -0,0 +1,151 @@
+"""Import time and parser construction benchmarks
+
+Import times are read from `python -X importtime` output of a fresh
+interpreter per public module. Parser construction is timed for CLIs with
+10, 100 and 1000 action_hero arguments.
+
+Usage:
+    python -m benchmarks.imports --save imports.json
+    python -m benchmarks.imports --compare imports.json
+
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.baseline import add_baseline_arguments, run_baseline_command
+
+
+__all__ = [
+    "PARSER_SIZES",
+    "PUBLIC_MODULES",
+    "measure_import_time",
+    "measure_parser_construction",
+    "parse_importtime",
+]
+
+
+PUBLIC_MODULES = [
+    "action_hero",
+    "action_hero.path",
+    "action_hero.net",
+    "action_hero.types",
+    "action_hero.misc",
+    "action_hero.utils",
+]
+
+PARSER_SIZES = [10, 100, 1000]
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output):
+    """Return cumulative import times from `python -X importtime` output
+
+    Lines look like: `import time:   self [us] | cumulative | imported package`
+    with the package name indented by its nesting depth.
+
+    Args:
+        output (str): stderr of an interpreter run with `-X importtime`
+
+    Returns:
+        dict[str, int]: Cumulative import time in microseconds per module
+
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            # Skip the header line
+            continue
+        times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+def measure_import_time(module, repeat=5):
+    """Return best cumulative import time of module in milliseconds
+
+    Every run imports module in a fresh interpreter so nothing is cached in
+    sys.modules. The fastest of repeat runs is used.
+
+    """
+    measurements = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import " + module],
+            cwd=PROJECT_DIRECTORY,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        measurements.append(parse_importtime(result.stderr)[module])
+    return min(measurements) / 1000
+
+
+def measure_parser_construction(size, repeat=5):
+    """Return best time in milliseconds to build a parser with size arguments
+
+    Arguments cycle through a single action, an action with action_values
+    and a PipelineAction.
+
+    """
+    from action_hero import (
+        FileExistsAction,
+        FileHasExtensionAction,
+        FileIsReadableAction,
+        PipelineAction,
+    )
+
+    arguments = [
+        {"action": FileIsReadableAction},
+        {"action": FileHasExtensionAction, "action_values": ["md", "txt"]},
+        {
+            "action": PipelineAction,
+            "action_values": [
+                FileExistsAction,
+                (FileHasExtensionAction, ["md", "txt"]),
+            ],
+        },
+    ]
+
+    measurements = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser = argparse.ArgumentParser()
+        for index in range(size):
+            parser.add_argument(
+                "--argument-{}".format(index),
+                **arguments[index % len(arguments)]
+            )
+        measurements.append(time.perf_counter() - start)
+    return min(measurements) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs per measurement"
+    )
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module in PUBLIC_MODULES:
+        results["import:{}".format(module)] = measure_import_time(
+            module, repeat=args.repeat
+        )
+    for size in PARSER_SIZES:
+        results["parser:{}".format(size)] = measure_parser_construction(
+            size, repeat=args.repeat
+        )
+
+    return run_baseline_command(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""PipelineAction benchmarks
+
+Times a pipeline of four path checks over many existing files, with its
+children called one after the other over all values, as before, and with
+the compiled pipeline that runs them over each value in one pass.
+
+A stress measurement builds 10,000 parsers with a pipeline argument each and
+parses with every one, as a service building a parser per request would.
+Pipelines used to share one class level list of children, so that grew
+with every parser and made parsing slower and slower.
+
+Usage:
+    python -m benchmarks.pipeline --save pipeline.json
+    python -m benchmarks.pipeline --compare pipeline.json
+
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.baseline import add_baseline_arguments, run_baseline_command
+
+
+__all__ = ["measure", "measure_parsers"]
+
+
+def _call_children(action, namespace, values):
+    for child in action.children:
+        child(None, namespace, values)
+
+
+def _call_compiled(action, namespace, values):
+    action(None, namespace, values)
+
+
+def measure(size, repeat=3):
+    """Return best times in milliseconds to run the pipeline over size paths
+    with its children called one after the other and compiled"""
+    from action_hero import (
+        FileExistsAction,
+        FileHasExtensionAction,
+        FileIsReadableAction,
+        FileIsValidAction,
+        PipelineAction,
+    )
+    from action_hero.utils import parse_scope
+
+    parser = argparse.ArgumentParser()
+    action = parser.add_argument(
+        "--files",
+        nargs="+",
+        action=PipelineAction,
+        action_values=[
+            FileIsValidAction,
+            FileExistsAction,
+            (FileHasExtensionAction, ["txt"]),
+            FileIsReadableAction,
+        ],
+    )
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(size):
+            path = os.path.join(directory, "file-{}.txt".format(index))
+            open(path, "w").close()
+            paths.append(path)
+
+        strategies = {"children": _call_children, "compiled": _call_compiled}
+        for name, strategy in strategies.items():
+            measurements = []
+            for _ in range(repeat):
+                namespace = argparse.Namespace()
+                start = time.perf_counter()
+                # Each run shares one fresh stat cache between all children,
+                # so both strategies stat every path once
+                with parse_scope():
+                    strategy(action, namespace, paths)
+                measurements.append(time.perf_counter() - start)
+            results["pipeline:{}:{}".format(name, size)] = (
+                min(measurements) * 1000
+            )
+    return results
+
+
+def measure_parsers(count, repeat=3):
+    """Return best time in milliseconds to build count parsers with a
+    pipeline argument and parse with each"""
+    from action_hero import (
+        FileDoesNotExistAction,
+        FileHasExtensionAction,
+        PipelineAction,
+    )
+
+    measurements = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            parser = argparse.ArgumentParser()
+            parser.add_argument(
+                "--file",
+                action=PipelineAction,
+                action_values=[
+                    (FileHasExtensionAction, ["md"]),
+                    FileDoesNotExistAction,
+                ],
+            )
+            parser.parse_args(["--file", "nonexistent.md"])
+        measurements.append(time.perf_counter() - start)
+    return {"pipeline:parsers:{}".format(count): min(measurements) * 1000}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--size", type=int, default=100000, help="number of paths to check"
+    )
+    parser.add_argument(
+        "--parsers",
+        type=int,
+        default=10000,
+        help="number of parsers to build for the stress measurement",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per measurement"
+    )
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = measure(args.size, repeat=args.repeat)
+    results.update(measure_parsers(args.parsers, repeat=args.repeat))
+    return run_baseline_command(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
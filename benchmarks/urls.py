@@ -0,0 +1,94 @@
+"""URL checking throughput benchmarks
+
+Times URLIsReachableAction over a list of URLs served by the local stand-in
+server of the tests, whose responses are delayed to mimic network latency.
+Compares the serial requests engine, requests with a thread pool and the
+asyncio engine.
+
+Usage:
+    python -m benchmarks.urls --save urls.json
+    python -m benchmarks.urls --compare urls.json
+
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.baseline import add_baseline_arguments, run_baseline_command
+
+
+__all__ = ["ENGINES", "measure"]
+
+
+# Keyword arguments of URLIsReachableAction per engine measured
+ENGINES = {
+    "serial": {},
+    "threads": {"workers": 50},
+    "asyncio": {"engine": "asyncio"},
+}
+
+
+def measure(size, latency, repeat=3):
+    """Return best times in milliseconds for each engine over size URLs
+
+    Args:
+        size (int): Number of URLs checked per argument
+        latency (float): Seconds the server waits before each response
+        repeat (int): Runs per measurement
+
+    """
+    from action_hero import URLIsReachableAction
+    from tests.http_server import LocalHTTPServer
+
+    results = {}
+    with LocalHTTPServer() as server:
+        # Distinct URLs, as the asyncio engine requests duplicates once
+        urls = [
+            server.url("/slow/{}?{}".format(latency, index))
+            for index in range(size)
+        ]
+        for name, options in ENGINES.items():
+            parser = argparse.ArgumentParser()
+            parser.add_argument(
+                "--urls",
+                nargs="+",
+                action=URLIsReachableAction,
+                max_connections_per_host=50,
+                **options
+            )
+
+            measurements = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                parser.parse_args(["--urls", *urls])
+                measurements.append(time.perf_counter() - start)
+            results["urls:{}:{}".format(name, size)] = (
+                min(measurements) * 1000
+            )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--size", type=int, default=200, help="number of URLs to check"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.01,
+        help="seconds the server waits before each response",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per measurement"
+    )
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    return run_baseline_command(
+        args, measure(args.size, args.latency, repeat=args.repeat)
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,14 +5,12 @@ VERSION = "0.7.0"
 DESCRIPTION = "Make powerful CLIs with argparse actions that pack a punch! "
 URL = "https://github.com/kadimisetty/action-hero"
 LICENSE = "MIT"
-PYTHON_REQUIRES = ">=3.5.0"
+PYTHON_REQUIRES = ">=3.7.0"
 README_FILENAME = "README.md"
 INSTALL_REQUIRES = ["requests", "pyyaml"]
 CLASSIFIERS = [
     "Intended Audience :: Developers",
     "License :: OSI Approved :: MIT License",
-    "Programming Language :: Python :: 3.5",
-    "Programming Language :: Python :: 3.6",
     "Programming Language :: Python :: 3.7",
     "Programming Language :: Python :: 3.8",
     "Programming Language :: Python :: Implementation :: CPython",
@@ -217,7 +215,7 @@ setup(
     python_requires=PYTHON_REQUIRES,
     url=URL,
     license=LICENSE,
-    packages=find_packages(exclude=["tests"]),
+    packages=find_packages(exclude=["benchmarks", "tests"]),
     include_package_data=True,
     install_requires=INSTALL_REQUIRES,
     classifiers=CLASSIFIERS,
@@ -0,0 +1,146 @@
+"""Local stand-in HTTP server for tests of network actions
+
+Routes, ignoring any query string:
+    /                   200 with a short body
+    /status/<code>      Responds with status <code>
+    /large/<size>       200 with a body of <size> bytes, written in chunks
+    /slow/<seconds>     200 after waiting <seconds>
+    /redirect/<code>    302 redirect to /status/<code>
+    /nohead/<code>      405 for HEAD, else status <code>
+
+"""
+import http.server
+import socket
+import threading
+import time
+
+
+__all__ = ["LocalHTTPServer", "UnresponsiveServer"]
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, so with Nagle's algorithm
+    # every response on a kept alive connection waits for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        """Keep test output quiet"""
+
+    def _respond(self, code, size=2, location=None):
+        self.send_response(code)
+        self.send_header("Content-Length", str(size))
+        if location:
+            self.send_header("Location", location)
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+
+        chunk = b"x" * 65536
+        remaining = size
+        try:
+            while remaining > 0:
+                written = min(remaining, len(chunk))
+                self.wfile.write(chunk[:written])
+                remaining -= written
+                self.server.bytes_sent += written
+        except OSError:
+            # Client closed the connection early, e.g. a streamed probe
+            self.close_connection = True
+
+    def _handle(self):
+        self.server.connections.add(self.client_address)
+        self.server.requests.append((self.command, self.path))
+
+        parts = self.path.partition("?")[0].strip("/").split("/")
+        route, argument = parts[0], parts[1] if len(parts) > 1 else ""
+
+        if route == "status":
+            self._respond(int(argument))
+        elif route == "large":
+            self._respond(200, size=int(argument))
+        elif route == "slow":
+            time.sleep(float(argument))
+            self._respond(200)
+        elif route == "redirect":
+            self._respond(302, location="/status/{}".format(argument))
+        elif route == "nohead":
+            self._respond(405 if self.command == "HEAD" else int(argument))
+        else:
+            self._respond(200)
+
+    do_GET = _handle
+    do_HEAD = _handle
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    # Accept bursts of concurrent connections without dropping any
+    request_queue_size = 128
+
+
+class LocalHTTPServer:
+    """HTTP server on localhost serving from a background thread
+
+    Attributes:
+        connections (set): Client addresses, one per TCP connection made
+        requests (list[(str, str)]): (method, path) of every request
+        bytes_sent (int): Response body bytes written to clients
+
+    """
+
+    def __init__(self):
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.connections = set()
+        self._server.requests = []
+        self._server.bytes_sent = 0
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+
+    @property
+    def connections(self):
+        return self._server.connections
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    @property
+    def bytes_sent(self):
+        return self._server.bytes_sent
+
+    def url(self, path="/"):
+        """Return URL of path on this server"""
+        host, port = self._server.server_address
+        return "http://{}:{}{}".format(host, port, path)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class UnresponsiveServer:
+    """TCP socket on localhost that accepts connections but never replies"""
+
+    def __init__(self):
+        self._socket = socket.socket()
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(128)
+
+    def url(self, path="/"):
+        """Return URL of path on this server"""
+        host, port = self._socket.getsockname()
+        return "http://{}:{}{}".format(host, port, path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._socket.close()
@@ -1,5 +1,10 @@
+import os
+import subprocess
+import sys
 import unittest
 
+import action_hero
+
 
 class TestAll(unittest.TestCase):
     def test_on_valid_module_email(self):
@@ -17,3 +22,57 @@ class TestAll(unittest.TestCase):
     def test_on_nonexisting_module(self):
         with self.assertRaises(ImportError):
             from action_hero import NonexistingModule
+
+    def test_on_every_name_in_all(self):
+        for name in action_hero.__all__:
+            self.assertTrue(hasattr(action_hero, name))
+
+    def test_on_dir_listing_catalog(self):
+        self.assertTrue(set(action_hero.__all__).issubset(dir(action_hero)))
+
+
+class TestLazyImports(unittest.TestCase):
+    def modules_loaded_after(self, statement):
+        """Return modules in sys.modules after running statement in a fresh
+        interpreter"""
+        project_directory = os.path.dirname(os.path.dirname(__file__))
+        script = "import sys\n{}\nprint(' '.join(sys.modules))".format(
+            statement
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=project_directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        self.assertFalse(result.stderr)
+        return result.stdout.split()
+
+    def test_on_importing_path_action(self):
+        modules = self.modules_loaded_after(
+            "from action_hero import FileIsReadableAction"
+        )
+        for module in ["requests", "yaml", "pickle", "unittest", "getpass"]:
+            self.assertNotIn(module, modules)
+
+    def test_on_importing_net_action(self):
+        modules = self.modules_loaded_after(
+            "from action_hero import URLIsReachableAction"
+        )
+        self.assertNotIn("requests", modules)
+        self.assertNotIn("yaml", modules)
+
+    def test_on_importing_utils(self):
+        modules = self.modules_loaded_after("import action_hero.utils")
+        for module in [
+            "concurrent.futures",
+            "logging",
+            "action_hero.profile_utils",
+            "action_hero.stream_utils",
+        ]:
+            self.assertNotIn(module, modules)
+
+    def test_on_importing_package(self):
+        modules = self.modules_loaded_after("import action_hero")
+        self.assertNotIn("action_hero.utils", modules)
@@ -1,9 +1,14 @@
+import argparse
+import os
+import tempfile
 import unittest
 from unittest import mock
 
 from action_hero.utils import ActionHeroTestCase, capture_output
 from action_hero import (
     ChoicesAction,
+    ChoicesFromFileAction,
+    ChoicesFromSortedFileAction,
     ConfirmAction,
     NotifyAndContinueAction,
     NotifyAndExitAction,
@@ -37,6 +42,96 @@ class TestChoicesAction(ActionHeroTestCase):
         with self.assertRaises(ValueError):
             self.parser.parse_args(["--number", "three"])
 
+    def test_on_many_choices(self):
+        choices = ["sku-{}".format(index) for index in range(50000)]
+        self.parser.add_argument(
+            "--sku", nargs="+", action=ChoicesAction, action_values=choices
+        )
+        self.assertEqual(
+            self.parser.parse_args(["--sku", *choices]).sku, choices
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--sku", "sku-1", "sku-50000"])
+        self.assertIn("allowed choices: sku-50000s", str(context.exception))
+
+    def test_on_typed_choices(self):
+        self.parser.add_argument(
+            "--number", action=ChoicesAction, action_values=[1, 2], type=int
+        )
+        self.assertEqual(self.parser.parse_args(["--number", "2"]).number, 2)
+        with self.assertRaises(ValueError):
+            self.parser.parse_args(["--number", "3"])
+
+
+class TestChoicesFromFileAction(ActionHeroTestCase):
+    actions = [ChoicesFromFileAction, ChoicesFromSortedFileAction]
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "colors.txt")
+        with open(self.path, "w") as f:
+            f.write("black\nblue\ngreen\nred\nwhite\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_on_choices(self):
+        for index, action in enumerate(self.actions):
+            self.parser.add_argument(
+                "--color{}".format(index),
+                nargs="+",
+                action=action,
+                action_values=[self.path],
+            )
+        self.assertEqual(
+            self.parser.parse_args(
+                ["--color0", "red", "blue", "--color1", "white"]
+            ),
+            argparse.Namespace(color0=["red", "blue"], color1=["white"]),
+        )
+
+    def test_on_sorted_file_unmapped_after_parse(self):
+        action = self.parser.add_argument(
+            "--color",
+            action=ChoicesFromSortedFileAction,
+            action_values=[self.path],
+        )
+        self.parser.parse_args(["--color", "red"])
+        self.assertIsNone(action._action_values_index._mmap)
+
+    def test_on_suggestions(self):
+        for index, action in enumerate(self.actions):
+            option = "--color{}".format(index)
+            self.parser.add_argument(
+                option, nargs="+", action=action, action_values=[self.path]
+            )
+            with self.assertRaises(ValueError) as context:
+                self.parser.parse_args([option, "red", "gren", "purple"])
+            self.assertIn(
+                "allowed choices: gren (did you mean green?), purple",
+                str(context.exception),
+            )
+
+    def test_on_invalid_action_values(self):
+        for action in self.actions:
+            for action_values in [[self.path, self.path], [5]]:
+                with self.assertRaises(ValueError):
+                    self.parser.add_argument(
+                        "--color", action=action, action_values=action_values
+                    )
+
+    def test_on_type_other_than_str(self):
+        for action in self.actions:
+            with self.assertRaises(ValueError):
+                self.parser.add_argument(
+                    "--color",
+                    action=action,
+                    action_values=[self.path],
+                    type=int,
+                )
+
 
 class TestNotifyAndContinueAction(ActionHeroTestCase):
     def test_on_adding_to_parser(self):
@@ -0,0 +1,128 @@
+import concurrent.futures
+import os
+import tempfile
+import unittest
+
+from action_hero.misc_utils import FileChoices, SortedFileChoices, trigrams
+from action_hero.utils import parse_scope
+
+
+class TestTrigrams(unittest.TestCase):
+    def test_on_trigrams(self):
+        self.assertEqual(trigrams("ab"), {"  a", " ab", "ab "})
+        self.assertEqual(trigrams(""), {"   "})
+
+
+class ChoicesTestCase(unittest.TestCase):
+    choices = sorted(
+        ["apple", "banana", "cherry", "sku-0001", "sku-0002", "sku-0010", "é"],
+        key=lambda choice: choice.encode("utf-8"),
+    )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "choices.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.choices) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class TestFileChoices(ChoicesTestCase):
+    def test_on_membership(self):
+        choices = FileChoices(self.path)
+        for choice in self.choices:
+            self.assertIn(choice, choices)
+        for value in ["", "appl", "apples", "sku-0003"]:
+            self.assertNotIn(value, choices)
+
+    def test_on_loaded_lazily(self):
+        choices = FileChoices(os.path.join(self.directory.name, "missing"))
+        with self.assertRaises(FileNotFoundError):
+            "apple" in choices
+
+    def test_on_suggestions(self):
+        choices = FileChoices(self.path)
+        self.assertEqual(choices.suggest("bananna"), ["banana"])
+        self.assertIn("sku-0010", choices.suggest("sku-0011"))
+        self.assertEqual(choices.suggest("zzzzzz"), [])
+
+
+class TestSortedFileChoices(ChoicesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sorted_choices = SortedFileChoices(self.path)
+
+    def tearDown(self):
+        self.sorted_choices.close()
+        super().tearDown()
+
+    def test_on_membership(self):
+        for choice in self.choices:
+            self.assertIn(choice, self.sorted_choices)
+        for value in ["", "a", "appl", "apples", "sku-0003", "zzz", 5]:
+            self.assertNotIn(value, self.sorted_choices)
+
+    def test_on_many_choices(self):
+        choices = ["{:06}".format(number) for number in range(0, 200000, 2)]
+        with open(self.path, "w") as f:
+            f.write("\n".join(choices))
+
+        sorted_choices = SortedFileChoices(self.path)
+        for number in range(0, 1000, 7):
+            self.assertEqual(
+                "{:06}".format(number) in sorted_choices, number % 2 == 0
+            )
+        self.assertIn(choices[-1], sorted_choices)
+        sorted_choices.close()
+
+    def test_on_windows_line_endings(self):
+        with open(self.path, "w", newline="") as f:
+            f.write("apple\r\nbanana\r\n")
+
+        sorted_choices = SortedFileChoices(self.path)
+        self.assertIn("banana", sorted_choices)
+        self.assertNotIn("banana\r", sorted_choices)
+        sorted_choices.close()
+
+    def test_on_empty_file(self):
+        open(self.path, "w").close()
+
+        sorted_choices = SortedFileChoices(self.path)
+        self.assertNotIn("apple", sorted_choices)
+        self.assertEqual(sorted_choices.suggest("apple"), [])
+
+    def test_on_unmapped_with_parse_scope(self):
+        with parse_scope():
+            self.assertIn("apple", self.sorted_choices)
+            data = self.sorted_choices._map()
+            self.assertIs(self.sorted_choices._map(), data)
+        self.assertTrue(data.closed)
+        self.assertIsNone(self.sorted_choices._mmap)
+        # Mapped again when used again
+        self.assertIn("apple", self.sorted_choices)
+
+    def test_on_parses_in_threads(self):
+        def parse(_):
+            with parse_scope():
+                return [
+                    choice in self.sorted_choices for choice in self.choices
+                ]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            for found in pool.map(parse, range(200)):
+                self.assertTrue(all(found))
+
+    def test_on_context_manager(self):
+        with SortedFileChoices(self.path) as sorted_choices:
+            self.assertIn("apple", sorted_choices)
+            self.assertIsNotNone(sorted_choices._mmap)
+        self.assertIsNone(sorted_choices._mmap)
+
+    def test_on_suggestions(self):
+        self.assertEqual(self.sorted_choices.suggest("bananna"), ["banana"])
+        self.assertEqual(
+            self.sorted_choices.suggest("sku-0003")[:2],
+            ["sku-0001", "sku-0002"],
+        )
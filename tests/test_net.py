@@ -1,3 +1,8 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
 from action_hero import (
     IPIsValidIPAddressAction,
     IPIsValidIPv4AddressAction,
@@ -8,10 +13,14 @@ from action_hero import (
     EmailIsValidAction,
 )
 
+from action_hero import net_utils
+from action_hero.net_cache_utils import URLCache
 from action_hero.utils import (
     ActionHeroTestCase,
+    parse_scope,
     run_only_when_when_internet_is_up,
 )
+from tests.http_server import LocalHTTPServer, UnresponsiveServer
 
 
 class TestEmailIsValidAction(ActionHeroTestCase):
@@ -331,3 +340,397 @@ class TestURLWithHTTPResponseStatusCodeAction(ActionHeroTestCase):
         unreachable = "AAA"
         with self.assertRaises(ValueError):
             self.parser.parse_args(["--url", unreachable])
+
+
+class TestURLActionConnectionPooling(ActionHeroTestCase):
+    def test_on_connections_reused_within_parse(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url", nargs="+", action=URLIsReachableAction
+            )
+            self.parser.add_argument(
+                "--code",
+                nargs="+",
+                action=URLWithHTTPResponseStatusCodeAction,
+                action_values=["200"],
+            )
+            urls = [server.url("/status/200") for _ in range(5)]
+            with parse_scope():
+                self.parser.parse_args(["--url", *urls, "--code", *urls])
+            self.assertEqual(len(server.requests), 10)
+            self.assertEqual(len(server.connections), 1)
+
+    def test_on_session_closed_when_scope_ends(self):
+        sessions = []
+
+        def session_factory(**kwargs):
+            session = net_utils.create_session(**kwargs)
+            session.close = mock.Mock(wraps=session.close)
+            sessions.append(session)
+            return session
+
+        self.parser.add_argument("--url", action=URLIsReachableAction)
+        with LocalHTTPServer() as server, mock.patch.object(
+            net_utils, "session_factory", session_factory
+        ):
+            self.parser.parse_args(["--url", server.url()])
+            self.assertEqual(sessions[0].close.call_count, 1)
+
+            with parse_scope():
+                self.parser.parse_args(["--url", server.url()])
+                self.assertEqual(sessions[1].close.call_count, 0)
+            self.assertEqual(sessions[1].close.call_count, 1)
+
+    def test_on_max_connections_per_host(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLIsReachableAction,
+                workers=8,
+                max_connections_per_host=2,
+            )
+            urls = [server.url("/slow/0.01") for _ in range(20)]
+            self.parser.parse_args(["--url", *urls])
+            self.assertLessEqual(len(server.connections), 2)
+
+    def test_on_invalid_max_connections_per_host(self):
+        with self.assertRaises(ValueError):
+            self.parser.add_argument(
+                "--url",
+                action=URLIsReachableAction,
+                max_connections_per_host=0,
+            )
+
+
+class TestURLActionProbe(ActionHeroTestCase):
+    LARGE_BODY_SIZE = 100 * 1024 * 1024
+
+    def test_on_head_probe_not_downloading_body(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url", nargs="+", action=URLIsReachableAction, probe="head"
+            )
+            url = server.url("/large/{}".format(self.LARGE_BODY_SIZE))
+            self.parser.parse_args(["--url", url, url])
+            self.assertEqual(server.bytes_sent, 0)
+            self.assertEqual(
+                [method for method, _ in server.requests], ["HEAD", "HEAD"]
+            )
+
+    def test_on_head_probe_falling_back_to_stream(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url",
+                action=URLWithHTTPResponseStatusCodeAction,
+                action_values=["200"],
+                probe="head",
+            )
+            url = server.url("/nohead/200")
+            self.parser.parse_args(["--url", url])
+            self.assertEqual(
+                [method for method, _ in server.requests], ["HEAD", "GET"]
+            )
+
+    def test_on_stream_probe_closing_after_headers(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url", action=URLIsReachableAction, probe="stream"
+            )
+            url = server.url("/large/{}".format(self.LARGE_BODY_SIZE))
+            self.parser.parse_args(["--url", url])
+            self.assertLess(server.bytes_sent, self.LARGE_BODY_SIZE / 2)
+
+    def test_on_head_probe_with_failing_status(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url", action=URLIsReachableAction, probe="head"
+            )
+            with self.assertRaises(ValueError):
+                self.parser.parse_args(["--url", server.url("/status/404")])
+
+    def test_on_head_probe_following_redirects(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url",
+                action=URLWithHTTPResponseStatusCodeAction,
+                action_values=["204"],
+                probe="head",
+            )
+            self.parser.parse_args(["--url", server.url("/redirect/204")])
+
+    def test_on_probe_of_each_argument_in_worker_processes(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--a",
+                nargs="+",
+                action=URLIsReachableAction,
+                probe="head",
+                processes=2,
+            )
+            self.parser.add_argument(
+                "--b",
+                nargs="+",
+                action=URLIsReachableAction,
+                probe="get",
+                processes=2,
+            )
+            with parse_scope():
+                self.parser.parse_args(
+                    ["--a", server.url("/a"), "--b", server.url("/b")]
+                )
+            self.assertEqual(
+                sorted(server.requests), [("GET", "/b"), ("HEAD", "/a")]
+            )
+
+    def test_on_invalid_probe(self):
+        with self.assertRaises(ValueError):
+            self.parser.add_argument(
+                "--url", action=URLIsReachableAction, probe="post"
+            )
+
+
+class TestURLActionTimeouts(ActionHeroTestCase):
+    def test_on_unresponsive_server_timing_out(self):
+        with UnresponsiveServer() as server:
+            self.parser.add_argument(
+                "--url", action=URLIsReachableAction, timeout=0.2
+            )
+            start = time.monotonic()
+            with self.assertRaises(ValueError) as context:
+                self.parser.parse_args(["--url", server.url()])
+            self.assertLess(time.monotonic() - start, 5)
+            self.assertIn("Unreachable URL(s)", str(context.exception))
+
+    def test_on_deadline_reporting_values_not_checked(self):
+        with UnresponsiveServer() as server:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLIsReachableAction,
+                timeout=(5, 5),
+                deadline=0.3,
+            )
+            urls = [server.url("/{}".format(index)) for index in range(5)]
+            start = time.monotonic()
+            with self.assertRaises(ValueError) as context:
+                self.parser.parse_args(["--url", *urls])
+            self.assertLess(time.monotonic() - start, 3)
+            self.assertIn(
+                "Value(s) not checked (deadline): {}".format(", ".join(urls)),
+                str(context.exception),
+            )
+
+    def test_on_deadline_reporting_checked_failures(self):
+        with LocalHTTPServer() as server, UnresponsiveServer() as blackhole:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLWithHTTPResponseStatusCodeAction,
+                action_values=["200"],
+                deadline=0.5,
+            )
+            urls = [
+                server.url("/status/200"),
+                server.url("/status/404"),
+                blackhole.url(),
+                server.url("/status/200"),
+            ]
+            with self.assertRaises(ValueError) as context:
+                self.parser.parse_args(["--url", *urls])
+            message = str(context.exception)
+            self.assertIn(
+                "URL(s) with unexpected status codes: {};".format(urls[1]),
+                message,
+            )
+            self.assertIn(
+                "not checked (deadline): {}, {}".format(urls[2], urls[3]),
+                message,
+            )
+
+    def test_on_deadline_not_reached(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url", nargs="+", action=URLIsReachableAction, deadline=10
+            )
+            self.parser.parse_args(["--url", server.url(), server.url()])
+
+    def test_on_invalid_timeout(self):
+        for timeout in [0, -1, (1,), (1, 0), "1"]:
+            with self.assertRaises(ValueError):
+                self.parser.add_argument(
+                    "--url", action=URLIsReachableAction, timeout=timeout
+                )
+
+    def test_on_invalid_deadline(self):
+        with self.assertRaises(ValueError):
+            self.parser.add_argument(
+                "--url", action=URLIsReachableAction, deadline=0
+            )
+
+
+class TestURLActionAsyncioEngine(ActionHeroTestCase):
+    def test_on_reachable_urls(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLIsReachableAction,
+                engine="asyncio",
+            )
+            urls = [server.url("/"), server.url("/redirect/200")]
+            self.assertEqual(
+                self.parser.parse_args(["--url", *urls]).url, urls
+            )
+
+    def test_on_urls_quoted(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLIsReachableAction,
+                engine="asyncio",
+            )
+            urls = [server.url("/café"), server.url("/a b?c=d e")]
+            self.parser.parse_args(["--url", *urls])
+            self.assertEqual(
+                sorted(path for _, path in server.requests),
+                ["/a%20b?c=d%20e", "/caf%C3%A9"],
+            )
+
+    def test_on_unreachable_urls(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLIsReachableAction,
+                engine="asyncio",
+            )
+            urls = [server.url("/"), server.url("/status/500")]
+            with self.assertRaisesRegex(
+                ValueError, "Unreachable URL\\(s\\): {}".format(urls[1])
+            ):
+                self.parser.parse_args(["--url", *urls])
+
+    def test_on_status_codes(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLWithHTTPResponseStatusCodeAction,
+                action_values=["200", "404"],
+                engine="asyncio",
+            )
+            urls = [server.url("/status/404"), server.url("/status/418")]
+            with self.assertRaisesRegex(
+                ValueError, "unexpected status codes: {}".format(urls[1])
+            ):
+                self.parser.parse_args(["--url", *urls])
+
+    def test_on_urls_requested_concurrently(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLIsReachableAction,
+                engine="asyncio",
+                max_connections_per_host=20,
+            )
+            urls = [server.url("/slow/0.2?{}".format(i)) for i in range(20)]
+            start = time.monotonic()
+            self.parser.parse_args(["--url", *urls])
+            self.assertLess(time.monotonic() - start, 2)
+            self.assertEqual(len(server.requests), len(urls))
+
+    def test_on_deadline(self):
+        with LocalHTTPServer() as server, UnresponsiveServer() as blackhole:
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLIsReachableAction,
+                engine="asyncio",
+                deadline=0.3,
+            )
+            urls = [server.url(), blackhole.url()]
+            with self.assertRaisesRegex(
+                ValueError, "not checked \\(deadline\\): {}".format(urls[1])
+            ):
+                self.parser.parse_args(["--url", *urls])
+
+    def test_on_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            self.parser.add_argument(
+                "--url", action=URLIsReachableAction, engine="curl"
+            )
+
+    def test_on_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            self.parser.add_argument(
+                "--url", action=URLIsReachableAction, concurrency=0
+            )
+
+
+class TestURLActionCache(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = URLCache(
+            os.path.join(self.directory.name, "urls.sqlite3")
+        )
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_on_repeated_parses_skipping_network(self):
+        with LocalHTTPServer() as server:
+            urls = [server.url(), server.url("/status/404")]
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLWithHTTPResponseStatusCodeAction,
+                action_values=["200", "404"],
+                cache=self.cache,
+            )
+            for _ in range(3):
+                self.parser.parse_args(["--url", *urls])
+            self.assertEqual(len(server.requests), 2)
+
+    def test_on_asyncio_engine(self):
+        with LocalHTTPServer() as server:
+            urls = [server.url(), server.url("/redirect/200")]
+            self.parser.add_argument(
+                "--url",
+                nargs="+",
+                action=URLIsReachableAction,
+                engine="asyncio",
+                cache=self.cache,
+            )
+            for _ in range(3):
+                self.parser.parse_args(["--url", *urls])
+            self.assertEqual(len(server.requests), 3)
+
+    def test_on_keyed_by_probe(self):
+        with LocalHTTPServer() as server:
+            self.parser.add_argument(
+                "--get", action=URLIsReachableAction, cache=self.cache
+            )
+            self.parser.add_argument(
+                "--head",
+                action=URLIsReachableAction,
+                probe="head",
+                cache=self.cache,
+            )
+            self.parser.parse_args(
+                ["--get", server.url(), "--head", server.url()]
+            )
+            self.assertEqual(
+                [method for method, _ in server.requests], ["GET", "HEAD"]
+            )
+
+    def test_on_invalid_cache(self):
+        with self.assertRaises(ValueError):
+            self.parser.add_argument(
+                "--url", action=URLIsReachableAction, cache="urls.sqlite3"
+            )
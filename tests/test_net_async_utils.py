@@ -0,0 +1,96 @@
+import asyncio
+import time
+import unittest
+
+from action_hero.net_async_utils import fetch_status_codes
+from action_hero.net_utils import request_options
+from tests.http_server import LocalHTTPServer, UnresponsiveServer
+
+
+class TestFetchStatusCodes(unittest.TestCase):
+    def test_on_status_codes(self):
+        with LocalHTTPServer() as server:
+            urls = [
+                server.url("/"),
+                server.url("/status/404"),
+                server.url("/status/500"),
+            ]
+            self.assertEqual(
+                fetch_status_codes(urls), dict(zip(urls, [200, 404, 500]))
+            )
+
+    def test_on_unrequestable_urls(self):
+        urls = ["nonsense", "ftp://example.com", "http://127.0.0.1:1/"]
+        self.assertEqual(
+            fetch_status_codes(urls), dict.fromkeys(urls, None)
+        )
+
+    def test_on_redirect_followed(self):
+        with LocalHTTPServer() as server:
+            url = server.url("/redirect/204")
+            self.assertEqual(fetch_status_codes([url]), {url: 204})
+            self.assertEqual(
+                [path for _, path in server.requests],
+                ["/redirect/204", "/status/204"],
+            )
+
+    def test_on_head_probe(self):
+        with LocalHTTPServer() as server:
+            url = server.url("/large/{}".format(10 * 1024 * 1024))
+            with request_options(probe="head"):
+                self.assertEqual(fetch_status_codes([url]), {url: 200})
+            self.assertEqual(server.requests[0][0], "HEAD")
+            self.assertEqual(server.bytes_sent, 0)
+
+    def test_on_head_rejected(self):
+        with LocalHTTPServer() as server:
+            url = server.url("/nohead/204")
+            with request_options(probe="head"):
+                self.assertEqual(fetch_status_codes([url]), {url: 204})
+            self.assertEqual(
+                [method for method, _ in server.requests], ["HEAD", "GET"]
+            )
+
+    def test_on_duplicate_urls_requested_once(self):
+        with LocalHTTPServer() as server:
+            fetch_status_codes([server.url()] * 5)
+            self.assertEqual(len(server.requests), 1)
+
+    def test_on_concurrent_requests(self):
+        with LocalHTTPServer() as server:
+            urls = [server.url("/slow/0.2?{}".format(i)) for i in range(20)]
+            start = time.monotonic()
+            with request_options(max_connections_per_host=20):
+                status_codes = fetch_status_codes(urls)
+            self.assertLess(time.monotonic() - start, 2)
+            self.assertEqual(status_codes, dict.fromkeys(urls, 200))
+
+    def test_on_per_host_limit(self):
+        with LocalHTTPServer() as server:
+            urls = [server.url("/slow/0.1?{}".format(i)) for i in range(4)]
+            start = time.monotonic()
+            with request_options(max_connections_per_host=1):
+                fetch_status_codes(urls)
+            self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+    def test_on_timeout(self):
+        with UnresponsiveServer() as server:
+            url = server.url()
+            with request_options(timeout=0.2):
+                self.assertEqual(fetch_status_codes([url]), {url: None})
+
+    def test_on_deadline_leaving_urls_out(self):
+        with LocalHTTPServer() as server, UnresponsiveServer() as blackhole:
+            with request_options(deadline=time.monotonic() + 0.3):
+                status_codes = fetch_status_codes(
+                    [server.url(), blackhole.url()]
+                )
+            self.assertEqual(status_codes, {server.url(): 200})
+
+    def test_on_running_event_loop(self):
+        with LocalHTTPServer() as server:
+
+            async def check():
+                return fetch_status_codes([server.url()])
+
+            self.assertEqual(asyncio.run(check()), {server.url(): 200})
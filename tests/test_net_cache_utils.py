@@ -0,0 +1,189 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from action_hero.net_cache_utils import URLCache, user_cache_directory
+from action_hero.net_utils import (
+    is_reachable_url,
+    request_options,
+    status_code_from_response_to_request_url,
+)
+from tests.http_server import LocalHTTPServer
+
+
+class TestURLCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "urls.sqlite3")
+        self.cache = URLCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_on_miss(self):
+        with self.assertRaises(KeyError):
+            self.cache.get("http://example.com", "get")
+
+    def test_on_hit(self):
+        self.cache.set("http://example.com", "get", 200)
+        self.cache.set("http://example.org", "get", None)
+        self.assertEqual(self.cache.get("http://example.com", "get"), 200)
+        self.assertIsNone(self.cache.get("http://example.org", "get"))
+
+    def test_on_keyed_by_probe(self):
+        self.cache.set("http://example.com", "get", 200)
+        with self.assertRaises(KeyError):
+            self.cache.get("http://example.com", "head")
+
+    def test_on_persisting_across_instances(self):
+        self.cache.set("http://example.com", "get", 200)
+        self.cache.close()
+
+        cache = URLCache(self.path)
+        self.assertEqual(cache.get("http://example.com", "get"), 200)
+        cache.close()
+
+    def test_on_expired_entries(self):
+        cache = URLCache(self.path, ttl=0.2, negative_ttl=0.1)
+        cache.set("http://example.com", "get", 200)
+        cache.set("http://example.org", "get", 404)
+        cache.set("http://example.net", "get", None)
+        time.sleep(0.15)
+        self.assertEqual(cache.get("http://example.com", "get"), 200)
+        for url in ["http://example.org", "http://example.net"]:
+            with self.assertRaises(KeyError):
+                cache.get(url, "get")
+        time.sleep(0.1)
+        with self.assertRaises(KeyError):
+            cache.get("http://example.com", "get")
+        cache.close()
+
+    def test_on_least_recently_used_evicted(self):
+        cache = URLCache(self.path, max_entries=2)
+        cache.set("http://a.com", "get", 200)
+        cache.set("http://b.com", "get", 200)
+        cache.get("http://a.com", "get")
+        cache.set("http://c.com", "get", 200)
+        self.assertEqual(len(cache), 2)
+        cache.get("http://a.com", "get")
+        cache.get("http://c.com", "get")
+        with self.assertRaises(KeyError):
+            cache.get("http://b.com", "get")
+        cache.close()
+
+    def test_on_evicting_only_beyond_max_entries(self):
+        cache = URLCache(self.path, max_entries=10)
+        statements = []
+        cache._connect().set_trace_callback(statements.append)
+        for index in range(10):
+            cache.set("http://{}.com".format(index), "get", 200)
+        self.assertFalse(
+            [sql for sql in statements if sql.startswith("DELETE")]
+        )
+
+        cache.set("http://10.com", "get", 200)
+        # Down to nine tenths, so the next entries don't evict again
+        self.assertEqual(len(cache), 9)
+        cache.close()
+
+    def test_on_hits_written_in_one_go(self):
+        self.cache.set("http://example.com", "get", 200)
+        statements = []
+        self.cache._connect().set_trace_callback(statements.append)
+        for _ in range(3):
+            self.cache.get("http://example.com", "get")
+        self.assertFalse(
+            [sql for sql in statements if sql.startswith("UPDATE")]
+        )
+
+        self.cache.close()
+        self.assertEqual(
+            len([sql for sql in statements if sql.startswith("UPDATE")]), 1
+        )
+
+    def test_on_clear(self):
+        self.cache.set("http://example.com", "get", 200)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_on_unusable_path(self):
+        file_path = os.path.join(self.directory.name, "file")
+        open(file_path, "w").close()
+        cache = URLCache(os.path.join(file_path, "urls.sqlite3"))
+        cache.set("http://example.com", "get", 200)
+        with self.assertRaises(KeyError):
+            cache.get("http://example.com", "get")
+
+    def test_on_hits_of_default_cache_written_at_exit(self):
+        script = (
+            "from action_hero.net_cache_utils import default_url_cache\n"
+            "default_url_cache().get('http://example.com', 'get')\n"
+        )
+        environment = dict(os.environ, XDG_CACHE_HOME=self.directory.name)
+        self.cache.close()
+        self.cache = URLCache(
+            os.path.join(self.directory.name, "action_hero", "urls.sqlite3")
+        )
+        self.cache.set("http://example.com", "get", 200)
+        self.cache.close()
+        started = time.time()
+
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env=environment,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(__file__)),
+        )
+        connection = sqlite3.connect(self.cache.path)
+        self.addCleanup(connection.close)
+        (accessed,) = connection.execute(
+            "SELECT accessed FROM urls"
+        ).fetchone()
+        self.assertGreaterEqual(accessed, started)
+
+    def test_on_default_path_in_user_cache_directory(self):
+        self.assertEqual(
+            URLCache().path,
+            os.path.join(user_cache_directory(), "urls.sqlite3"),
+        )
+
+
+class TestURLCacheConsulted(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = URLCache(
+            os.path.join(self.directory.name, "urls.sqlite3")
+        )
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_on_repeated_requests_skipped(self):
+        with LocalHTTPServer() as server:
+            with request_options(cache=self.cache):
+                for _ in range(3):
+                    self.assertTrue(is_reachable_url(server.url()))
+                    self.assertEqual(
+                        status_code_from_response_to_request_url(
+                            server.url("/status/404")
+                        ),
+                        "404",
+                    )
+            self.assertEqual(len(server.requests), 2)
+
+    def test_on_cached_result_used_without_network(self):
+        with LocalHTTPServer() as server:
+            url = server.url()
+            with request_options(cache=self.cache):
+                self.assertTrue(is_reachable_url(url))
+
+        # Server is down now
+        with request_options(cache=self.cache):
+            self.assertTrue(is_reachable_url(url))
+        self.assertFalse(is_reachable_url(url))
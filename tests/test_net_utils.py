@@ -1,9 +1,14 @@
+import time
 import unittest
 
 import requests
 
 from action_hero.utils import run_only_when_when_internet_is_up
 from action_hero.net_utils import (
+    DeadlineExceeded,
+    current_request_options,
+    get_session,
+    request_options,
     is_valid_ip_address,
     is_valid_ipv4_address,
     is_valid_ipv6_address,
@@ -11,6 +16,7 @@ from action_hero.net_utils import (
     status_code_from_response_to_request_url,
     is_valid_email,
 )
+from tests.http_server import LocalHTTPServer
 
 
 class TestIsEmailValid(unittest.TestCase):
@@ -116,3 +122,60 @@ class TestStatusCodeFromResponseToRequestURL(unittest.TestCase):
     def test_on_malformed_url_returns_none_on_request_failure(self):
         url1 = "AAA"
         self.assertIsNone(status_code_from_response_to_request_url(url1))
+
+
+class TestRequestOptions(unittest.TestCase):
+    def test_on_options_within_context(self):
+        default = current_request_options().max_connections_per_host
+        with request_options(max_connections_per_host=default + 1):
+            self.assertEqual(
+                current_request_options().max_connections_per_host,
+                default + 1,
+            )
+        self.assertEqual(
+            current_request_options().max_connections_per_host, default
+        )
+
+    def test_on_unknown_option(self):
+        with self.assertRaises(ValueError):
+            with request_options(unknown_option=1):
+                pass
+
+    def test_on_timeout_capped_by_deadline(self):
+        with request_options(
+            timeout=(10, 30), deadline=time.monotonic() + 5
+        ):
+            connect, read = current_request_options().remaining_timeout()
+            self.assertLessEqual(connect, 5)
+            self.assertLessEqual(read, 5)
+
+    def test_on_timeout_without_deadline(self):
+        with request_options(timeout=(1, 2)):
+            self.assertEqual(
+                current_request_options().remaining_timeout(), (1, 2)
+            )
+
+    def test_on_deadline_passed(self):
+        with request_options(deadline=time.monotonic() - 1):
+            with self.assertRaises(DeadlineExceeded):
+                current_request_options().remaining_timeout()
+            with LocalHTTPServer() as server:
+                with self.assertRaises(DeadlineExceeded):
+                    is_reachable_url(server.url())
+                self.assertEqual(server.requests, [])
+
+
+class TestSession(unittest.TestCase):
+    def test_on_no_session_outside_parse(self):
+        self.assertIsNone(get_session())
+
+    def test_on_requests_outside_parse(self):
+        with LocalHTTPServer() as server:
+            self.assertTrue(is_reachable_url(server.url()))
+            self.assertEqual(
+                status_code_from_response_to_request_url(
+                    server.url("/status/404")
+                ),
+                "404",
+            )
+            self.assertFalse(is_reachable_url(server.url("/status/500")))
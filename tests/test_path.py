@@ -1,7 +1,8 @@
+import argparse
 import os
 import tempfile
 
-from action_hero.utils import ActionHeroTestCase
+from action_hero.utils import ActionHeroTestCase, MemoCache, parse_scope
 from action_hero import (
     DirectoryDoesNotExistAction,
     DirectoryExistsAction,
@@ -38,6 +39,7 @@ from action_hero import (
 )
 from action_hero.path_utils import (
     add_execute_permission,
+    get_stat_cache,
     is_empty_file,
     is_executable_directory,
     is_executable_file,
@@ -1590,3 +1592,83 @@ class TestFileHasExtensionAction(ActionHeroTestCase):
         )
         with self.assertRaises(ValueError):
             self.parser.parse_args(["--filename", "config.yml", "README.rst"])
+
+
+class TestStatCacheAcrossActions(ActionHeroTestCase):
+    def test_on_same_path_in_several_arguments(self):
+        self.parser.add_argument("--exists", action=FileExistsAction)
+        self.parser.add_argument("--readable", action=FileIsReadableAction)
+        self.parser.add_argument("--empty", action=FileIsEmptyAction)
+        with tempfile.NamedTemporaryFile() as file1, parse_scope():
+            self.parser.parse_args(
+                [
+                    "--exists",
+                    file1.name,
+                    "--readable",
+                    file1.name,
+                    "--empty",
+                    file1.name,
+                ]
+            )
+            counts = get_stat_cache().counts
+            self.assertEqual(counts["stat"], 1)
+            # root always asks os.access, as its capabilities decide
+            is_root = hasattr(os, "geteuid") and os.geteuid() == 0
+            self.assertEqual(counts["access"], 1 if is_root else 0)
+            self.assertEqual(counts["hits"], 2)
+
+    def test_on_cache_not_shared_between_parses(self):
+        self.parser.add_argument("--exists", action=FileExistsAction)
+        with tempfile.NamedTemporaryFile() as file1:
+            with parse_scope():
+                self.parser.parse_args(["--exists", file1.name])
+                cache1 = get_stat_cache()
+            with parse_scope():
+                self.parser.parse_args(["--exists", file1.name])
+                cache2 = get_stat_cache()
+            self.assertIsNot(cache1, cache2)
+            self.assertEqual(cache2.counts["stat"], 1)
+
+    def test_on_cache_not_kept_for_reused_namespace(self):
+        self.parser.add_argument("--exists", action=FileExistsAction)
+        namespace = argparse.Namespace()
+        with tempfile.TemporaryDirectory() as dir1:
+            file1 = os.path.join(dir1, "FILE")
+            open(file1, "w").close()
+            self.parser.parse_args(["--exists", file1], namespace=namespace)
+            os.remove(file1)
+            with self.assertRaises(ValueError):
+                self.parser.parse_args(
+                    ["--exists", file1], namespace=namespace
+                )
+
+    def test_on_ensure_file_invalidating_cache(self):
+        self.parser.add_argument("--ensure", action=EnsureFileAction)
+        self.parser.add_argument("--exists", action=FileExistsAction)
+        with tempfile.TemporaryDirectory() as dir1:
+            file1 = os.path.join(dir1, "FILE")
+            with parse_scope():
+                self.parser.parse_args(["--ensure", file1, "--exists", file1])
+                self.assertEqual(get_stat_cache().counts["stat"], 2)
+
+    def test_on_ensure_directory_invalidating_cache(self):
+        self.parser.add_argument("--ensure", action=EnsureDirectoryAction)
+        self.parser.add_argument("--exists", action=DirectoryExistsAction)
+        with tempfile.TemporaryDirectory() as dir1:
+            dir2 = os.path.join(dir1, "DIR")
+            self.parser.parse_args(["--ensure", dir2, "--exists", dir2])
+            self.assertTrue(os.path.isdir(dir2))
+
+
+class TestMemoizedPathChecks(ActionHeroTestCase):
+    def test_on_ensure_file_invalidating_memoized_results(self):
+        cache = MemoCache()
+        self.parser.add_argument("--ensure", action=EnsureFileAction)
+        self.parser.add_argument(
+            "--exists", action=FileExistsAction, memoize=cache
+        )
+        with tempfile.TemporaryDirectory() as dir1:
+            file1 = os.path.join(dir1, "FILE")
+            self.assertFalse(cache.call(is_existing_file, file1))
+            self.parser.parse_args(["--ensure", file1, "--exists", file1])
+            self.assertEqual(cache.counts["hits"], 0)
@@ -2,12 +2,16 @@ import unittest
 import tempfile
 import shutil
 import os
+from unittest import mock
 
 from action_hero.path_utils import (
+    PathStatus,
+    StatCache,
     add_execute_permission,
     create_directory,
     create_file,
     get_extension,
+    get_path_status,
     is_empty_file,
     is_executable_directory,
     is_executable_file,
@@ -299,6 +303,71 @@ class TestExistingOrCreatablePath(unittest.TestCase):
         with tempfile.NamedTemporaryFile() as file1:
             self.assertTrue(is_existing_or_creatable_path(file1.name))
 
+    def test_on_creatable_file_not_being_created(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            file1 = os.path.join(dir1, "SOMEFILE")
+            self.assertTrue(is_existing_or_creatable_path(file1))
+            self.assertEqual(os.listdir(dir1), [])
+
+    def test_on_creatable_path_with_missing_ancestors(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            file1 = os.path.join(dir1, "A", "B", "SOMEFILE")
+            self.assertTrue(is_existing_or_creatable_path(file1))
+
+    def test_on_path_below_a_file(self):
+        with tempfile.NamedTemporaryFile() as file1:
+            path = os.path.join(file1.name, "SOMEFILE")
+            self.assertFalse(is_existing_or_creatable_path(path))
+
+    def test_on_too_long_name(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            path = os.path.join(dir1, "A" * 4096)
+            self.assertFalse(is_existing_or_creatable_path(path))
+
+    def test_on_null_character(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            path = os.path.join(dir1, "SOME\0FILE")
+            self.assertFalse(is_existing_or_creatable_path(path))
+
+    @unittest.skipIf(
+        hasattr(os, "geteuid") and os.geteuid() == 0,
+        "root can write to any directory",
+    )
+    def test_on_unwritable_ancestor(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            remove_write_permission(dir1)
+            # Restore write permission so dir1 can be cleaned up
+            self.addCleanup(os.chmod, dir1, 0o700)
+            path = os.path.join(dir1, "SOMEFILE")
+            self.assertFalse(is_existing_or_creatable_path(path))
+
+    def test_on_parent_of_missing_directory(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            path = os.path.join(dir1, "MISSING", os.pardir, "SOMEFILE")
+            self.assertFalse(is_existing_or_creatable_path(path))
+            with self.assertRaises(OSError):
+                open(path, "w")
+
+    def test_on_parent_of_existing_directory(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            os.mkdir(os.path.join(dir1, "EXISTING"))
+            path = os.path.join(dir1, "EXISTING", os.pardir, "A", "SOMEFILE")
+            self.assertTrue(is_existing_or_creatable_path(path))
+
+    def test_on_relative_path(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            cwd = os.getcwd()
+            os.chdir(dir1)
+            try:
+                self.assertTrue(is_existing_or_creatable_path("SOMEFILE"))
+                self.assertFalse(
+                    is_existing_or_creatable_path(
+                        os.path.join("MISSING", os.pardir, "SOMEFILE")
+                    )
+                )
+            finally:
+                os.chdir(cwd)
+
     def test_on_nonexisting_creatable_file(self):
         # Create and delete a temp file so we know that it is a valid path
         file1 = tempfile.mkstemp()[1]
@@ -426,3 +495,137 @@ class TestFileIsEmpty(unittest.TestCase):
             with open(file1.name, "a") as file_for_writing:
                 file_for_writing.write("SOME TEXT")
             self.assertFalse(is_empty_file(file1.name))
+
+
+class TestPathStatus(unittest.TestCase):
+    def test_on_existing_file(self):
+        with tempfile.NamedTemporaryFile() as file1:
+            status = PathStatus(file1.name)
+            self.assertTrue(status.exists)
+            self.assertTrue(status.is_file)
+            self.assertFalse(status.is_directory)
+            self.assertTrue(status.is_empty_file)
+
+    def test_on_existing_directory(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            status = PathStatus(dir1)
+            self.assertTrue(status.exists)
+            self.assertTrue(status.is_directory)
+            self.assertFalse(status.is_file)
+            self.assertFalse(status.is_empty_file)
+
+    def test_on_nonexisting_path(self):
+        dir1 = tempfile.mkdtemp()
+        os.rmdir(dir1)
+        status = PathStatus(dir1)
+        self.assertFalse(status.exists)
+        self.assertIsNone(status.stat_result)
+        self.assertFalse(status.is_readable)
+        self.assertFalse(status.is_writable)
+        self.assertFalse(status.is_executable)
+
+    def test_on_path_with_null_character(self):
+        self.assertFalse(PathStatus("nul\0char").exists)
+
+    def test_on_permissions_agreeing_with_os_access(self):
+        with tempfile.TemporaryDirectory() as dir1:
+            file1 = os.path.join(dir1, "FILE")
+            create_file(file1)
+            for mode in [0o000, 0o100, 0o200, 0o400, 0o500, 0o644, 0o755]:
+                for path in [file1, dir1]:
+                    os.chmod(path, mode | (0o700 if path == dir1 else 0))
+                    status = PathStatus(path)
+                    self.assertEqual(
+                        status.is_readable, os.access(path, os.R_OK)
+                    )
+                    self.assertEqual(
+                        status.is_writable, os.access(path, os.W_OK)
+                    )
+                    self.assertEqual(
+                        status.is_executable, os.access(path, os.X_OK)
+                    )
+
+    @unittest.skipIf(
+        hasattr(os, "geteuid") and os.geteuid() == 0,
+        "root's access depends on its capabilities",
+    )
+    def test_on_owned_path_not_calling_os_access(self):
+        with tempfile.NamedTemporaryFile() as file1:
+            with mock.patch("os.access", side_effect=AssertionError):
+                self.assertTrue(is_readable_file(file1.name))
+                os.chmod(file1.name, 0o400)
+                self.assertFalse(is_writable_file(file1.name))
+
+    def test_on_writing_denied_by_mount(self):
+        # e.g. a read only bind mount, sharing st_dev with a writable one
+        with tempfile.NamedTemporaryFile() as file1:
+            with mock.patch("os.access", return_value=False) as access:
+                self.assertFalse(is_writable_file(file1.name))
+                access.assert_called_once_with(file1.name, os.W_OK)
+
+    def test_on_root_calling_os_access(self):
+        with tempfile.NamedTemporaryFile() as file1:
+            os.chmod(file1.name, 0o000)
+            with mock.patch(
+                "action_hero.path_utils._process_uid", return_value=0
+            ), mock.patch("os.access", return_value=False) as access:
+                self.assertFalse(is_readable_file(file1.name))
+                self.assertFalse(is_writable_file(file1.name))
+                self.assertEqual(access.call_count, 2)
+
+    def test_on_only_user_id_fetched(self):
+        with tempfile.NamedTemporaryFile() as file1:
+            with mock.patch(
+                "os.getgroups", side_effect=AssertionError
+            ), mock.patch("os.getgid", side_effect=AssertionError):
+                self.assertTrue(is_readable_file(file1.name))
+                self.assertTrue(is_writable_file(file1.name))
+
+    def test_on_single_stat_per_predicate(self):
+        with tempfile.NamedTemporaryFile() as file1:
+            for predicate in [
+                is_empty_file,
+                is_readable_file,
+                is_writable_directory,
+                is_executable_file,
+            ]:
+                with mock.patch("os.stat", wraps=os.stat) as stat:
+                    predicate(file1.name)
+                    self.assertEqual(stat.call_count, 1)
+
+    def test_on_get_path_status(self):
+        with tempfile.NamedTemporaryFile() as file1:
+            self.assertIsInstance(get_path_status(file1.name), PathStatus)
+
+
+class TestStatCache(unittest.TestCase):
+    def test_on_repeated_status(self):
+        cache = StatCache()
+        with tempfile.NamedTemporaryFile() as file1:
+            self.assertIs(cache.status(file1.name), cache.status(file1.name))
+            self.assertEqual(cache.counts["stat"], 1)
+            self.assertEqual(cache.counts["hits"], 1)
+
+    def test_on_repeated_access(self):
+        cache = StatCache()
+        with tempfile.NamedTemporaryFile() as file1:
+            cache.access(file1.name, os.R_OK)
+            cache.access(file1.name, os.R_OK)
+            self.assertEqual(cache.counts["access"], 1)
+            self.assertEqual(cache.syscalls, 1)
+
+    def test_on_invalidate(self):
+        cache = StatCache()
+        dir1 = tempfile.mkdtemp()
+        self.assertTrue(cache.status(dir1).exists)
+        os.rmdir(dir1)
+        self.assertTrue(cache.status(dir1).exists)
+        cache.invalidate(dir1)
+        self.assertFalse(cache.status(dir1).exists)
+        self.assertEqual(cache.counts["stat"], 2)
+
+    def test_on_no_caching_outside_parse(self):
+        with tempfile.NamedTemporaryFile() as file1:
+            self.assertIsNot(
+                get_path_status(file1.name), get_path_status(file1.name)
+            )
@@ -0,0 +1,209 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from action_hero.profile_utils import profile_registry
+from action_hero.utils import (
+    ActionHeroTestCase,
+    CheckAction,
+    MapAndReplaceAction,
+    PipelineAction,
+)
+from action_hero import FileExistsAction
+
+
+class IsEvenAction(CheckAction):
+    def func(value):
+        return int(value) % 2 == 0
+
+    error_message = "Odd"
+
+
+class HalfAction(MapAndReplaceAction):
+    def func(value):
+        return str(int(value) // 2)
+
+
+class TestProfileRegistry(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+        profile_registry.clear()
+        profile_registry.enable()
+
+    def tearDown(self):
+        profile_registry.disable()
+        profile_registry.clear()
+        super().tearDown()
+
+    def profiles(self):
+        return {
+            profile.name: profile for profile in profile_registry.profiles()
+        }
+
+    def test_on_calls_recorded(self):
+        self.parser.add_argument("--n", nargs="+", action=IsEvenAction)
+        self.parser.parse_args(["--n", "2", "4"])
+        self.parser.parse_args(["--n", "6"])
+
+        profile = self.profiles()["--n IsEvenAction"]
+        self.assertEqual(profile.calls, 2)
+        self.assertEqual(profile.values, 3)
+        self.assertEqual(profile.failures, 0)
+        self.assertGreater(profile.seconds, 0)
+        self.assertAlmostEqual(profile.seconds_per_value, profile.seconds / 3)
+
+    def test_on_failures_recorded(self):
+        self.parser.add_argument("--n", nargs="+", action=IsEvenAction)
+        with self.assertRaises(ValueError):
+            self.parser.parse_args(["--n", "1", "2", "3"])
+        self.assertEqual(self.profiles()["--n IsEvenAction"].failures, 2)
+
+    def test_on_nothing_recorded_when_disabled(self):
+        profile_registry.disable()
+        self.parser.add_argument("--n", nargs="+", action=IsEvenAction)
+        self.parser.parse_args(["--n", "2"])
+        self.assertEqual(profile_registry.profiles(), [])
+
+    def test_on_cache_hits_recorded(self):
+        self.parser.add_argument(
+            "--n", nargs="+", action=IsEvenAction, memoize="parse"
+        )
+        self.parser.parse_args(["--n", "2", "2", "2"])
+        self.assertEqual(self.profiles()["--n IsEvenAction"].cache_hits, 2)
+
+    def test_on_overridden_call_recorded_once(self):
+        class LoudIsEvenAction(IsEvenAction):
+            def __call__(self, *args, **kwargs):
+                super().__call__(*args, **kwargs)
+
+        self.parser.add_argument("--n", nargs="+", action=LoudIsEvenAction)
+        self.parser.parse_args(["--n", "2"])
+        self.assertEqual(list(self.profiles()), ["--n LoudIsEvenAction"])
+
+    def test_on_call_of_mixin_recorded(self):
+        class SlowMixin:
+            def __call__(self, *args, **kwargs):
+                time.sleep(0.05)
+                super().__call__(*args, **kwargs)
+
+        class SlowIsEvenAction(SlowMixin, IsEvenAction):
+            pass
+
+        self.parser.add_argument("--n", nargs="+", action=SlowIsEvenAction)
+        self.parser.parse_args(["--n", "2"])
+        profile = self.profiles()["--n SlowIsEvenAction"]
+        self.assertEqual(profile.calls, 1)
+        self.assertGreaterEqual(profile.seconds, 0.05)
+
+    def test_on_pipeline_children_recorded(self):
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=PipelineAction,
+            action_values=[HalfAction, IsEvenAction],
+        )
+        self.parser.add_argument(
+            "--file",
+            action=PipelineAction,
+            action_values=[FileExistsAction, IsTruthyStubAction],
+        )
+        with tempfile.NamedTemporaryFile() as file1:
+            self.parser.parse_args(["--n", "4", "8", "--file", file1.name])
+
+        profiles = self.profiles()
+        self.assertEqual(
+            set(profiles),
+            {
+                "--n PipelineAction",
+                "--n PipelineAction > HalfAction",
+                "--n PipelineAction > IsEvenAction",
+                "--file PipelineAction",
+                "--file PipelineAction > FileExistsAction",
+                "--file PipelineAction > IsTruthyStubAction",
+            },
+        )
+        self.assertEqual(profiles["--n PipelineAction > HalfAction"].values, 2)
+        self.assertEqual(
+            profiles["--file PipelineAction > IsTruthyStubAction"].calls, 1
+        )
+
+    def test_on_lazy_streamed_pipeline_recorded(self):
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=PipelineAction,
+            action_values=[HalfAction, IsEvenAction],
+            stream_values=True,
+            lazy_values=True,
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "numbers.txt")
+            with open(path, "w") as f:
+                f.write("4\n8\n12\n")
+            args = self.parser.parse_args(["--n", "@" + path])
+            self.assertEqual(list(args.n), ["2", "4", "6"])
+
+        profiles = self.profiles()
+        # The parse and the chunk mapped while iterating
+        self.assertEqual(profiles["--n PipelineAction"].calls, 2)
+        self.assertEqual(profiles["--n PipelineAction"].values, 4)
+        self.assertEqual(profiles["--n PipelineAction > HalfAction"].values, 3)
+
+    def test_on_table_and_json(self):
+        self.parser.add_argument("--n", nargs="+", action=IsEvenAction)
+        self.parser.parse_args(["--n", "2"])
+
+        header, row = profile_registry.format_table().splitlines()
+        self.assertTrue(header.startswith("action "))
+        self.assertTrue(row.startswith("--n IsEvenAction"))
+
+        (profile,) = json.loads(profile_registry.to_json())
+        self.assertEqual(profile["name"], "--n IsEvenAction")
+        self.assertEqual(profile["values"], 1)
+
+
+class IsTruthyStubAction(CheckAction):
+    func = bool
+    error_message = "Falsy"
+
+    # Has a __call__ of its own so is called instead of streamed through
+    def __call__(self, parser, namespace, values, option_string=None):
+        super().__call__(parser, namespace, values, option_string)
+
+
+class TestProfileRegistryFromEnvironment(unittest.TestCase):
+    def run_cli(self, profile, output):
+        script = (
+            "import argparse\n"
+            "from action_hero import FileExistsAction\n"
+            "parser = argparse.ArgumentParser()\n"
+            "parser.add_argument('--file', action=FileExistsAction)\n"
+            "parser.parse_args(['--file', {!r}])\n"
+        ).format(__file__)
+        environment = dict(
+            os.environ,
+            ACTION_HERO_PROFILE=profile,
+            ACTION_HERO_PROFILE_FILE=output,
+        )
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env=environment,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(__file__)),
+        )
+        with open(output) as f:
+            return f.read()
+
+    def test_on_summary_written_at_exit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "profile")
+
+            (profile,) = json.loads(self.run_cli("json", output))
+            self.assertEqual(profile["name"], "--file FileExistsAction")
+
+            table = self.run_cli("table", output)
+            self.assertIn("--file FileExistsAction", table)
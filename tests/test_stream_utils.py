@@ -0,0 +1,138 @@
+import gc
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from action_hero.stream_utils import (
+    StreamedValues,
+    ValuesSpill,
+    chunked,
+    has_value_source,
+    is_value_source,
+    iter_values,
+    spill_values,
+    streamed_source,
+)
+
+
+class TestValueSources(unittest.TestCase):
+    def test_on_value_sources(self):
+        for value in ["-", "@paths.txt", "@-"]:
+            self.assertTrue(is_value_source(value))
+        for value in ["@", "paths.txt", "a-b", "", None, 1]:
+            self.assertFalse(is_value_source(value))
+
+    def test_on_has_value_source(self):
+        self.assertTrue(has_value_source(["a", "-"]))
+        self.assertTrue(has_value_source("@paths.txt"))
+        self.assertFalse(has_value_source(["a", "b"]))
+
+    def test_on_chunked(self):
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunked([], 2)), [])
+
+
+class StreamTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "values.txt")
+        with open(self.path, "w") as f:
+            f.write("a\nb\r\n\nc")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class TestIterValues(StreamTestCase):
+    def test_on_file_and_stdin_sources(self):
+        with mock.patch("sys.stdin", io.StringIO("d\ne\n")):
+            self.assertEqual(
+                list(iter_values(["x", "@" + self.path, "-"])),
+                ["x", "a", "b", "c", "d", "e"],
+            )
+
+    def test_on_one_value(self):
+        self.assertEqual(list(iter_values("@" + self.path)), ["a", "b", "c"])
+        self.assertEqual(list(iter_values("x")), ["x"])
+
+
+class TestStreamedValues(StreamTestCase):
+    def test_on_iterating_again(self):
+        values = StreamedValues([self.path, self.path])
+        self.assertEqual(list(values), ["a", "b", "c"] * 2)
+        self.assertEqual(list(values), ["a", "b", "c"] * 2)
+
+    def test_on_func_called_with_chunks(self):
+        chunks = []
+
+        def upper(chunk):
+            chunks.append(chunk)
+            return [value.upper() for value in chunk]
+
+        values = StreamedValues([self.path], func=upper, chunk_size=2)
+        self.assertEqual(list(values), ["A", "B", "C"])
+        self.assertEqual(chunks, [["a", "b"], ["c"]])
+
+    def test_on_temporary_files_removed(self):
+        spill = ValuesSpill()
+        spill.write([1, 2])
+        values = spill.finish()
+        self.assertEqual(list(values), [1, 2])
+        values.close()
+        self.assertFalse(os.path.exists(spill.path))
+
+        spill = ValuesSpill()
+        spill.finish()
+        gc.collect()
+        self.assertFalse(os.path.exists(spill.path))
+
+    def test_on_source_files_kept(self):
+        StreamedValues([self.path]).close()
+        self.assertTrue(os.path.exists(self.path))
+
+
+class TestSpillValues(StreamTestCase):
+    def test_on_values_kept_as_written(self):
+        values = spill_values(
+            ["@" + self.path],
+            lambda chunk: [(value, value + "\n1") for value in chunk],
+            chunk_size=2,
+        )
+        self.assertEqual(
+            list(values), [("a", "a\n1"), ("b", "b\n1"), ("c", "c\n1")]
+        )
+
+    def test_on_chunks_run_and_spilled(self):
+        values = spill_values(
+            ["@" + self.path, "d"],
+            lambda chunk: [value * 2 for value in chunk],
+            chunk_size=3,
+        )
+        self.assertEqual(list(values), ["aa", "bb", "cc", "dd"])
+        self.assertNotEqual(values.paths, [self.path])
+
+    def test_on_failing_chunk_discarded(self):
+        def fail(chunk):
+            raise RuntimeError
+
+        spills = os.path.join(self.directory.name, "spills")
+        os.mkdir(spills)
+        with mock.patch("tempfile.tempdir", spills):
+            with self.assertRaises(RuntimeError):
+                spill_values(["a"], fail)
+        self.assertEqual(os.listdir(spills), [])
+
+
+class TestStreamedSource(StreamTestCase):
+    def test_on_files_read_in_place(self):
+        values = streamed_source(["@" + self.path, "@" + self.path])
+        self.assertEqual(values.paths, [self.path, self.path])
+        self.assertEqual(list(values), ["a", "b", "c"] * 2)
+
+    def test_on_stdin_copied(self):
+        with mock.patch("sys.stdin", io.StringIO("d\ne\n")):
+            values = streamed_source(["-", "f"], func=list)
+        self.assertEqual(list(values), ["d", "e", "f"])
+        self.assertEqual(list(values), ["d", "e", "f"])
@@ -1,7 +1,15 @@
 import argparse
+import concurrent.futures
+import io
+import json
+import multiprocessing
 import os
+import random
 import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 
 from action_hero.utils import (
     ActionHeroAction,
@@ -9,19 +17,49 @@ from action_hero.utils import (
     BaseAction,
     CheckAction,
     CheckPresentInValuesAction,
+    DebugAction,
     DisplayMessageAndExitAction,
     ExitCapturedArgumentParser,
+    FailedValuesError,
     MapAction,
     MapAndReplaceAction,
+    MemoCache,
+    ParseScope,
     PipelineAction,
+    capture_output,
+    current_parse_scope,
+    default_memo_cache,
+    get_memo_cache,
+    invalidate_memoized,
+    parse_scope,
     run_only_when_modules_loaded,
     run_only_when_when_internet_is_up,
 )
 from action_hero import (
+    CollectIntoDictAction,
+    FileDoesNotExistAction,
     FileExistsAction,
+    FileHasExtensionAction,
     FileIsEmptyAction,
     FileIsWritableAction,
+    LoadJSONFromFileAction,
+    ResolvePathAction,
 )
+from action_hero.stream_utils import StreamedValues
+from tests.http_server import LocalHTTPServer
+
+
+def _process_id(value):
+    return os.getpid()
+
+
+def _is_even(value):
+    return int(value) % 2 == 0
+
+
+class _Unpicklable(str):
+    def __reduce__(self):
+        raise TypeError("can't pickle")
 
 
 class TestRunOnlyWhenWhenInternetIsUp(ActionHeroTestCase):
@@ -33,6 +71,48 @@ class TestRunOnlyWhenWhenInternetIsUp(ActionHeroTestCase):
         # Should not run this func since the url is invalid and unreachable
         func()
 
+    def test_on_result_reused_within_ttl(self):
+        calls = []
+
+        with LocalHTTPServer() as server:
+            url = server.url()
+
+            @run_only_when_when_internet_is_up(urls=[url], ttl=60)
+            def func():
+                calls.append(None)
+
+            func()
+
+        # Server is down now but the result of the first check stands
+        func()
+        self.assertEqual(len(calls), 2)
+
+    def test_on_result_expired(self):
+        calls = []
+
+        with LocalHTTPServer() as server:
+            url = server.url()
+
+            @run_only_when_when_internet_is_up(urls=[url], ttl=0)
+            def func():
+                calls.append(None)
+
+            func()
+
+        func()
+        self.assertEqual(len(calls), 1)
+
+    def test_on_any_url_unreachable(self):
+        with LocalHTTPServer() as server:
+
+            @run_only_when_when_internet_is_up(
+                urls=[server.url(), "http://127.0.0.1:1/"]
+            )
+            def func():
+                raise ValueError
+
+            func()
+
 
 class TestRunOnlyWhenModuleLoaded(unittest.TestCase):
     def test_on_available_module_unittest(self):
@@ -194,12 +274,11 @@ class TestCheckPresentInValuesAction(ActionHeroTestCase):
 
             error_message = "E"
 
-        self.parser.add_argument(
-            "--number", action=Action1, action_values=[4, 5, 6]
-        )
-
+        # Checked when added, instead of on every parse
         with self.assertRaises(ValueError):
-            self.parser.parse_args(["--number", "5"])
+            self.parser.add_argument(
+                "--number", action=Action1, action_values=[4, 5, 6]
+            )
 
     def test_on_action_values_with_mixed_type_specified(self):
         class Action1(CheckPresentInValuesAction):
@@ -220,12 +299,52 @@ class TestCheckPresentInValuesAction(ActionHeroTestCase):
 
             error_message = "E"
 
-        self.parser.add_argument(
-            "--number", action=Action1, action_values=["four"], type=int
+        # Checked when added, instead of on every parse
+        with self.assertRaises(ValueError):
+            self.parser.add_argument(
+                "--number", action=Action1, action_values=["four"], type=int
+            )
+
+
+class TestCheckPresentInValuesActionIndex(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+
+        class Action1(CheckPresentInValuesAction):
+            def func(value):
+                return value
+
+            error_message = "E"
+
+        self.Action1 = Action1
+
+    def test_on_index_built_once(self):
+        action = self.parser.add_argument(
+            "--word", action=self.Action1, action_values=["a", "b"]
         )
+        self.assertEqual(action._action_values_index, frozenset(["a", "b"]))
 
+    def test_on_rebuilt_index(self):
+        action = self.parser.add_argument(
+            "--word", action=self.Action1, action_values=["a"]
+        )
+        action.action_values = ["b"]
+        action._build_action_values_index()
+        self.parser.parse_args(["--word", "b"])
+        with self.assertRaises(ValueError):
+            self.parser.parse_args(["--word", "a"])
+
+    def test_on_unhashable_action_values(self):
+        action = self.parser.add_argument(
+            "--letters",
+            action=self.Action1,
+            action_values=[{"a", "b"}],
+            type=set,
+        )
+        self.assertIsInstance(action._action_values_index, tuple)
+        self.parser.parse_args(["--letters", "ba"])
         with self.assertRaises(ValueError):
-            self.parser.parse_args(["--number", "4"])
+            self.parser.parse_args(["--letters", "bc"])
 
 
 class TestActionHeroAction(ActionHeroTestCase):
@@ -234,10 +353,6 @@ class TestActionHeroAction(ActionHeroTestCase):
 
 
 class TestPipelineAction(ActionHeroTestCase):
-    """Known issue with testing PipelineActions using actions w/ action_values
-    tends to cause errors where some test cases do not have any content for
-    values"""
-
     def test_if_is_subclass_of_actionheroaction(self):
         self.assertTrue(issubclass(PipelineAction, ActionHeroAction))
 
@@ -392,3 +507,1209 @@ class TestDisplayMessageAndExitAction(ActionHeroTestCase):
         self.assertTrue(
             issubclass(DisplayMessageAndExitAction, ActionHeroAction)
         )
+
+
+class Resource:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestParseScope(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+        self.scopes = []
+        self.resources = []
+
+        class Action1(CheckAction):
+            def func(value):
+                scope = current_parse_scope()
+                self.scopes.append(scope)
+                self.resources.append(scope.get("resource", Resource))
+                return True
+
+            error_message = "E"
+
+        self.Action1 = Action1
+
+    def test_on_resource_created_once(self):
+        scope = ParseScope()
+        self.assertIs(scope.get("key", list), scope.get("key", list))
+
+    def test_on_scope_per_action_call(self):
+        self.parser.add_argument("--a", action=self.Action1)
+        self.parser.add_argument("--b", action=self.Action1)
+        args = self.parser.parse_args(["--a", "1", "--b", "2"])
+        self.assertIsNot(self.scopes[0], self.scopes[1])
+        self.assertIsNone(current_parse_scope())
+
+        # Closed when the call returned, while args is still around
+        self.assertTrue(all(resource.closed for resource in self.resources))
+        self.assertEqual(args.a, "1")
+
+    def test_on_scope_shared_within_parse_scope(self):
+        self.parser.add_argument("--a", action=self.Action1)
+        self.parser.add_argument("--b", action=self.Action1)
+        with parse_scope() as scope:
+            self.parser.parse_args(["--a", "1", "--b", "2"])
+            self.assertEqual(self.scopes, [scope] * 2)
+            self.assertFalse(self.resources[0].closed)
+        self.assertTrue(self.resources[0].closed)
+        self.assertIsNone(current_parse_scope())
+
+    def test_on_nested_parse_scope(self):
+        with parse_scope() as scope:
+            with parse_scope() as nested:
+                self.assertIs(nested, scope)
+            self.assertIs(current_parse_scope(), scope)
+
+    def test_on_nothing_kept_for_reused_namespace(self):
+        self.parser.add_argument("--a", action=self.Action1)
+        namespace = argparse.Namespace()
+        self.parser.parse_args(["--a", "1"], namespace=namespace)
+        self.parser.parse_args(["--a", "2"], namespace=namespace)
+        self.assertIsNot(self.scopes[0], self.scopes[1])
+
+
+class TestWorkers(ActionHeroTestCase):
+    def test_on_invalid_workers(self):
+        class Action1(CheckAction):
+            func = bool
+            error_message = "E"
+
+        for workers in [0, -1, "2"]:
+            with self.assertRaises(ValueError):
+                self.parser.add_argument(
+                    "--value", action=Action1, workers=workers
+                )
+
+    def test_on_failure_order_with_workers(self):
+        class Action1(CheckAction):
+            def func(value):
+                # Finish in a different order than submitted
+                time.sleep(random.random() / 100)
+                return int(value) % 2 == 0
+
+            error_message = "Odd"
+
+        self.parser.add_argument(
+            "--number", nargs="+", action=Action1, workers=8
+        )
+        numbers = [str(number) for number in range(50)]
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--number", *numbers])
+        self.assertIn(
+            "Odd: {}".format(", ".join(numbers[1::2])), str(context.exception)
+        )
+
+    def test_on_bounded_values_in_flight(self):
+        lock = threading.Lock()
+        in_flight = [0]
+        most_in_flight = [0]
+
+        class Action1(MapAction):
+            def func(value):
+                with lock:
+                    in_flight[0] += 1
+                    most_in_flight[0] = max(most_in_flight[0], in_flight[0])
+                time.sleep(0.001)
+                with lock:
+                    in_flight[0] -= 1
+
+        self.parser.add_argument(
+            "--value", nargs="+", action=Action1, workers=2
+        )
+        self.parser.parse_args(["--value", *map(str, range(100))])
+        self.assertLessEqual(most_in_flight[0], 2)
+
+    def test_on_map_and_replace_with_executor(self):
+        class Action1(MapAndReplaceAction):
+            def func(value):
+                return value.upper()
+
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            self.parser.add_argument(
+                "--word", nargs="+", action=Action1, executor=executor
+            )
+            args = self.parser.parse_args(["--word", "a", "b", "c"])
+        self.assertEqual(args.word, ["A", "B", "C"])
+
+    def test_on_check_present_in_values_with_workers(self):
+        class Action1(CheckPresentInValuesAction):
+            def func(value):
+                return value
+
+            error_message = "E"
+
+        self.parser.add_argument(
+            "--color",
+            nargs="+",
+            action=Action1,
+            action_values=["red", "blue"],
+            workers=4,
+        )
+        self.parser.parse_args(["--color", "red", "blue", "red"])
+        with self.assertRaises(ValueError):
+            self.parser.parse_args(["--color", "red", "green"])
+
+    def test_on_parse_scope_in_worker_threads(self):
+        scopes = set()
+
+        class Action1(CheckAction):
+            def func(value):
+                scopes.add(current_parse_scope())
+                return True
+
+            error_message = "E"
+
+        self.parser.add_argument(
+            "--value", nargs="+", action=Action1, workers=4
+        )
+        with parse_scope() as scope:
+            self.parser.parse_args(["--value", *map(str, range(20))])
+        self.assertEqual(scopes, {scope})
+
+
+class TestPipelineActionCompiled(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+        self.calls = calls = []
+
+        class IsShortAction(CheckAction):
+            def func(value):
+                calls.append(("short", value))
+                return len(value) < 3
+
+            error_message = "Long"
+
+        class IsLowerAction(CheckAction):
+            def func(value):
+                calls.append(("lower", value))
+                return value.islower()
+
+            error_message = "Upper"
+
+        class UpperAction(MapAndReplaceAction):
+            def func(value):
+                return value.upper()
+
+        class PrintAction(MapAction):
+            def func(value):
+                pass
+
+        self.IsShortAction = IsShortAction
+        self.IsLowerAction = IsLowerAction
+        self.UpperAction = UpperAction
+        self.PrintAction = PrintAction
+
+    def child(self, action, **kwargs):
+        return action(option_strings=["--value"], dest="value", **kwargs)
+
+    def stages(self, *actions):
+        (step,) = PipelineAction._compile(
+            argparse.Namespace(children=[self.child(a) for a in actions])
+        )
+        return step
+
+    def test_on_consecutive_stages_fused(self):
+        children = [
+            self.child(self.IsShortAction),
+            self.child(self.UpperAction),
+            self.child(self.PrintAction),
+            self.child(self.IsLowerAction),
+        ]
+        steps = PipelineAction._compile(argparse.Namespace(children=children))
+        self.assertEqual(len(steps), 3)
+        self.assertEqual([c for c, _, _ in steps[0]], children[:2])
+        self.assertEqual([kind for _, kind, _ in steps[0]], ["check", "map"])
+        self.assertIs(steps[1], children[2])
+        self.assertEqual([c for c, _, _ in steps[2]], children[3:])
+
+    def test_on_children_with_own_call_not_fused(self):
+        class OwnCallAction(CheckAction):
+            func = bool
+            error_message = "E"
+
+            def __call__(self, parser, namespace, values, option_string=None):
+                super().__call__(parser, namespace, values, option_string)
+
+        self.assertIsNone(self.child(OwnCallAction)._pipeline_stage())
+
+    def test_on_values_passing(self):
+        stages = self.stages(self.IsShortAction, self.IsLowerAction)
+        self.assertEqual(
+            PipelineAction._run_stages(stages, ["a", "bc"]), ["a", "bc"]
+        )
+        self.assertEqual(PipelineAction._run_stages(stages, "a"), "a")
+
+    def test_on_lowest_failing_stage_reported(self):
+        stages = self.stages(self.IsShortAction, self.IsLowerAction)
+        with self.assertRaises(argparse.ArgumentError) as context:
+            PipelineAction._run_stages(stages, ["A", "abcd", "B", "efgh"])
+        self.assertEqual(context.exception.message, "Long: abcd, efgh")
+
+    def test_on_short_circuit(self):
+        stages = self.stages(self.IsShortAction, self.IsLowerAction)
+        with self.assertRaises(argparse.ArgumentError):
+            PipelineAction._run_stages(stages, ["A", "abcd", "B"])
+        self.assertEqual(
+            self.calls,
+            [
+                ("short", "A"),
+                ("lower", "A"),
+                ("short", "abcd"),
+                # Failures of IsLowerAction won't be reported anymore
+                ("short", "B"),
+            ],
+        )
+
+    def test_on_map_stage_result(self):
+        stages = self.stages(self.IsShortAction, self.UpperAction)
+        self.assertEqual(
+            PipelineAction._run_stages(stages, ["a", "b"]), ["A", "B"]
+        )
+
+        # Stages get the results of the stages before them
+        stages = self.stages(self.UpperAction, self.IsLowerAction)
+        with self.assertRaises(argparse.ArgumentError) as context:
+            PipelineAction._run_stages(stages, ["a", "b"])
+        self.assertEqual(context.exception.message, "Upper: A, B")
+
+    def test_on_check_present_in_values_stage(self):
+        class LengthAction(CheckPresentInValuesAction):
+            def func(value):
+                return str(len(value))
+
+            error_message = "Bad length"
+
+        child = self.child(LengthAction, action_values=["1"])
+        stage = (child, *child._pipeline_stage())
+        self.assertEqual(PipelineAction._run_stages([stage], ["a"]), ["a"])
+        with self.assertRaises(argparse.ArgumentError) as context:
+            PipelineAction._run_stages([stage], ["a", "bc"])
+        self.assertEqual(context.exception.message, "Bad length: bc")
+
+
+class TestPipelineActionChildren(ActionHeroTestCase):
+    def test_on_children_per_instance(self):
+        first = self.parser.add_argument(
+            "--first", action=PipelineAction, action_values=[FileExistsAction]
+        )
+        second = self.parser.add_argument(
+            "--second",
+            nargs="+",
+            action=PipelineAction,
+            action_values=[
+                (FileHasExtensionAction, ["md"]),
+                FileDoesNotExistAction,
+            ],
+        )
+        self.assertEqual(len(first.children), 1)
+        self.assertEqual(len(second.children), 2)
+        self.assertEqual(
+            self.parser.parse_args(["--second", "a.md", "b.md"]).second,
+            ["a.md", "b.md"],
+        )
+        with self.assertRaisesRegex(ValueError, "unexpected extensions: c"):
+            self.parser.parse_args(["--second", "a.md", "c.txt"])
+
+    def test_on_map_and_replace_result(self):
+        self.parser.add_argument(
+            "--path",
+            action=PipelineAction,
+            action_values=[FileDoesNotExistAction, ResolvePathAction],
+        )
+        self.assertEqual(
+            self.parser.parse_args(["--path", "nonexistent"]).path,
+            os.path.realpath("nonexistent"),
+        )
+
+    def test_on_parsing_from_threads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for index in range(20):
+                path = os.path.join(directory, "{}.md".format(index))
+                open(path, "w").close()
+                paths.append(path)
+
+            self.parser.add_argument(
+                "--file",
+                nargs="+",
+                action=PipelineAction,
+                action_values=[
+                    FileExistsAction,
+                    (FileHasExtensionAction, ["md"]),
+                ],
+            )
+
+            def parse(index):
+                if index % 2:
+                    return self.parser.parse_args(["--file", *paths]).file
+                with self.assertRaises(ValueError):
+                    self.parser.parse_args(["--file", *paths, "x.md"])
+
+            with concurrent.futures.ThreadPoolExecutor(8) as executor:
+                results = list(executor.map(parse, range(100)))
+            self.assertEqual(results[1::2], [paths] * 50)
+
+
+class TestPipelineActionValueFlow(ActionHeroTestCase):
+    def test_on_checks_of_resolved_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "file.md")
+            open(path, "w").close()
+            os.symlink(path, os.path.join(directory, "link"))
+
+            self.parser.add_argument(
+                "--path",
+                nargs="+",
+                action=PipelineAction,
+                action_values=[
+                    ResolvePathAction,
+                    FileExistsAction,
+                    (FileHasExtensionAction, ["md"]),
+                ],
+            )
+            link = os.path.join(directory, "link")
+            self.assertEqual(
+                self.parser.parse_args(["--path", link]).path,
+                [os.path.realpath(path)],
+            )
+
+    def test_on_loading_checked_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for index in range(3):
+                path = os.path.join(directory, "{}.json".format(index))
+                with open(path, "w") as f:
+                    json.dump({"index": index}, f)
+                paths.append(path)
+
+            self.parser.add_argument(
+                "--config",
+                nargs="+",
+                action=PipelineAction,
+                action_values=[
+                    ResolvePathAction,
+                    FileExistsAction,
+                    LoadJSONFromFileAction,
+                ],
+            )
+            self.assertEqual(
+                self.parser.parse_args(["--config", *paths]).config,
+                [{"index": index} for index in range(3)],
+            )
+
+            missing = os.path.join(directory, "missing.json")
+            with self.assertRaisesRegex(ValueError, "missing.json"):
+                self.parser.parse_args(["--config", *paths, missing])
+
+    def test_on_values_after_barrier(self):
+        class AppendXAction(MapAndReplaceAction):
+            def func(value):
+                return value + "x"
+
+        class EchoAction(MapAction):
+            def func(value):
+                pass
+
+        self.parser.add_argument(
+            "--word",
+            nargs="+",
+            action=PipelineAction,
+            action_values=[AppendXAction, EchoAction, AppendXAction],
+        )
+        self.assertEqual(
+            self.parser.parse_args(["--word", "a", "b"]).word, ["axx", "bxx"]
+        )
+
+    def test_on_load_stage_compiled(self):
+        action = self.parser.add_argument(
+            "--config",
+            action=PipelineAction,
+            action_values=[FileExistsAction, LoadJSONFromFileAction],
+        )
+        (step,) = action._compile()
+        self.assertEqual([kind for _, kind, _ in step], ["check", "map"])
+
+
+class TestMaxFailures(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+        self.checked = checked = []
+
+        class IsEvenAction(CheckAction):
+            def func(value):
+                checked.append(value)
+                return int(value) % 2 == 0
+
+            error_message = "Odd"
+
+        class IsKnownAction(CheckPresentInValuesAction):
+            def func(value):
+                checked.append(value)
+                return value
+
+            error_message = "Unknown"
+
+        self.IsEvenAction = IsEvenAction
+        self.IsKnownAction = IsKnownAction
+
+    def test_on_stopping_at_max_failures(self):
+        self.parser.add_argument(
+            "--number", nargs="+", action=self.IsEvenAction, max_failures=2
+        )
+        numbers = [str(number) for number in range(10000)]
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--number", *numbers])
+        self.assertIn(
+            "Odd: 1, 3 …and 9,996 more value(s) not checked",
+            str(context.exception),
+        )
+        self.assertEqual(self.checked, numbers[:4])
+
+    def test_on_fewer_failures(self):
+        self.parser.add_argument(
+            "--number", nargs="+", action=self.IsEvenAction, max_failures=5
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--number", "1", "2", "3"])
+        self.assertIn("Odd: 1, 3s", str(context.exception))
+        self.assertNotIn("not checked", str(context.exception))
+
+    def test_on_last_value_failing(self):
+        self.parser.add_argument(
+            "--number", nargs="+", action=self.IsEvenAction, max_failures=1
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--number", "2", "3"])
+        self.assertNotIn("not checked", str(context.exception))
+
+    def test_on_check_present_in_values(self):
+        self.parser.add_argument(
+            "--word",
+            nargs="+",
+            action=self.IsKnownAction,
+            action_values=["a"],
+            max_failures=1,
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--word", "a", "b", "c", "d"])
+        self.assertIn(
+            "Unknown: b …and 2 more value(s) not checked",
+            str(context.exception),
+        )
+        self.assertEqual(self.checked, ["a", "b"])
+
+    def test_on_workers(self):
+        self.parser.add_argument(
+            "--number",
+            nargs="+",
+            action=self.IsEvenAction,
+            max_failures=1,
+            workers=4,
+        )
+        numbers = [str(number) for number in range(10000)]
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--number", *numbers])
+        self.assertIn(
+            "Odd: 1 …and 9,998 more value(s) not checked",
+            str(context.exception),
+        )
+        # Only values in flight when checking stopped were checked after
+        self.assertLess(len(self.checked), 100)
+
+    def test_on_invalid_max_failures(self):
+        for max_failures in [0, -1, "1"]:
+            with self.assertRaises(ValueError):
+                self.parser.add_argument(
+                    "--number",
+                    action=self.IsEvenAction,
+                    max_failures=max_failures,
+                )
+
+
+class TestMemoCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = calls = []
+
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        self.double = double
+        self.cache = MemoCache(maxsize=2)
+
+    def test_on_hits_and_misses(self):
+        for value in [1, 2, 1, 1]:
+            self.assertEqual(self.cache.call(self.double, value), value * 2)
+        self.assertEqual(self.calls, [1, 2])
+        self.assertEqual(
+            self.cache.counts, {"hits": 2, "misses": 2, "evictions": 0}
+        )
+
+    def test_on_keyed_by_func_and_type(self):
+        self.cache.call(self.double, 1)
+        self.cache.call(self.double, 1.0)
+        self.cache.call(str, 1)
+        self.assertEqual(self.calls, [1, 1.0])
+        self.assertEqual(self.cache.counts["misses"], 3)
+
+    def test_on_least_recently_used_evicted(self):
+        for value in [1, 2, 1, 3, 1, 2]:
+            self.cache.call(self.double, value)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.counts["evictions"], 2)
+
+    def test_on_unhashable_values(self):
+        self.assertEqual(self.cache.call(self.double, [1]), [1, 1])
+        self.cache.call(self.double, [1])
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(self.cache), 0)
+        self.cache.invalidate([1])
+
+    def test_on_exceptions_not_memoized(self):
+        def fail(value):
+            self.calls.append(value)
+            raise RuntimeError(value)
+
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                self.cache.call(fail, 1)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_on_invalidate(self):
+        self.cache.call(self.double, 1)
+        self.cache.call(str, 1)
+        self.cache.invalidate(1, func=str)
+        self.cache.call(self.double, 1)
+        self.assertEqual(self.cache.counts["hits"], 1)
+        self.cache.invalidate(1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_on_clear(self):
+        self.cache.call(self.double, 1)
+        self.cache.clear()
+        self.cache.call(self.double, 1)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_on_invalid_maxsize(self):
+        for maxsize in [0, "1", None]:
+            with self.assertRaises(ValueError):
+                MemoCache(maxsize=maxsize)
+
+
+class TestMemoize(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+        self.checked = checked = []
+
+        class IsEvenAction(CheckAction):
+            def func(value):
+                checked.append(value)
+                return int(value) % 2 == 0
+
+            error_message = "Odd"
+
+        self.IsEvenAction = IsEvenAction
+
+    def test_on_not_memoized_by_default(self):
+        self.parser.add_argument("--n", nargs="+", action=self.IsEvenAction)
+        self.parser.parse_args(["--n", "2", "2"])
+        self.assertEqual(self.checked, ["2", "2"])
+
+    def test_on_memoized_per_parse(self):
+        self.parser.add_argument(
+            "--a", nargs="+", action=self.IsEvenAction, memoize="parse"
+        )
+        self.parser.add_argument(
+            "--b", nargs="+", action=self.IsEvenAction, memoize="parse"
+        )
+        with parse_scope():
+            self.parser.parse_args(["--a", "2", "4", "2", "--b", "4"])
+            self.assertEqual(get_memo_cache().counts["hits"], 2)
+        self.assertEqual(self.checked, ["2", "4"])
+        self.assertIsNone(get_memo_cache())
+
+        self.parser.parse_args(["--a", "2"])
+        self.assertEqual(self.checked, ["2", "4", "2"])
+
+    def test_on_memoized_per_process(self):
+        self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, memoize="process"
+        )
+        value = "{}".format(random.randrange(10 ** 9) * 2)
+        try:
+            self.parser.parse_args(["--n", value])
+            self.parser.parse_args(["--n", value])
+            self.assertEqual(self.checked, [value])
+        finally:
+            default_memo_cache().invalidate(value)
+
+    def test_on_own_memo_cache(self):
+        cache = MemoCache(maxsize=10)
+        self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, memoize=cache
+        )
+        self.parser.parse_args(["--n", "2", "2"])
+        self.assertEqual(cache.counts["hits"], 1)
+
+        invalidate_memoized("2")
+        self.parser.parse_args(["--n", "2"])
+        self.assertEqual(self.checked, ["2", "2"])
+
+    def test_on_run_user_func_as_classmethod(self):
+        cache = MemoCache()
+        self.assertTrue(self.IsEvenAction._run_user_func("2"))
+        self.assertTrue(self.IsEvenAction._run_user_func("2", cache))
+        self.assertTrue(self.IsEvenAction._run_user_func("2", cache))
+        self.assertEqual(self.checked, ["2", "2"])
+
+    def test_on_memoized_with_workers(self):
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=self.IsEvenAction,
+            memoize="parse",
+            workers=4,
+        )
+        self.parser.parse_args(["--n", *["2"] * 50])
+        self.assertLess(len(self.checked), 50)
+
+    def test_on_failures_memoized(self):
+        self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, memoize="parse"
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--n", "3", "3"])
+        self.assertIn("Odd: 3, 3", str(context.exception))
+        self.assertEqual(self.checked, ["3"])
+
+    def test_on_map_actions(self):
+        mapped = []
+
+        class DoubleAction(MapAndReplaceAction):
+            def func(value):
+                mapped.append(value)
+                return value * 2
+
+        self.parser.add_argument(
+            "--n", nargs="+", action=DoubleAction, memoize="parse"
+        )
+        args = self.parser.parse_args(["--n", "a", "a"])
+        self.assertEqual(args.n, ["aa", "aa"])
+        self.assertEqual(mapped, ["a"])
+
+    def test_on_invalid_memoize(self):
+        for memoize in ["forever", True, 1]:
+            with self.assertRaises(ValueError):
+                self.parser.add_argument(
+                    "--n", action=self.IsEvenAction, memoize=memoize
+                )
+
+
+class TestProcesses(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+
+        class ProcessIdAction(MapAndReplaceAction):
+            func = _process_id
+
+        class IsEvenAction(CheckAction):
+            func = _is_even
+            error_message = "Odd"
+
+        self.ProcessIdAction = ProcessIdAction
+        self.IsEvenAction = IsEvenAction
+
+    def test_on_running_in_worker_processes(self):
+        self.parser.add_argument(
+            "--a", nargs="+", action=self.ProcessIdAction, processes=2
+        )
+        self.parser.add_argument(
+            "--b", nargs="+", action=self.ProcessIdAction, processes=2
+        )
+        with parse_scope():
+            args = self.parser.parse_args(
+                ["--a", *"abcdefgh", "--b", *"abcdefgh"]
+            )
+        process_ids = set(args.a) | set(args.b)
+        self.assertNotIn(os.getpid(), process_ids)
+        # Both arguments share the same worker processes
+        self.assertLessEqual(len(process_ids), 2)
+
+    def test_on_worker_processes_shut_down_after_call(self):
+        self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, processes=2
+        )
+        args = self.parser.parse_args(["--n", "2", "4", "6"])
+        self.assertEqual(multiprocessing.active_children(), [])
+        self.assertEqual(args.n, ["2", "4", "6"])
+
+        with parse_scope():
+            self.parser.parse_args(["--n", "2", "4", "6"])
+            self.assertNotEqual(multiprocessing.active_children(), [])
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_on_failures_in_order(self):
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=self.IsEvenAction,
+            processes=2,
+            chunksize=3,
+        )
+        numbers = [str(number) for number in range(20)]
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--n", *numbers])
+        self.assertIn(
+            "Odd: 1, 3, 5, 7, 9, 11, 13, 15, 17, 19", str(context.exception)
+        )
+
+    def test_on_func_raising(self):
+        self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, processes=2
+        )
+        with self.assertRaisesRegex(ValueError, "invalid literal"):
+            self.parser.parse_args(["--n", "2", "x"])
+
+    def test_on_unpicklable_func(self):
+        class ProcessIdAction(MapAndReplaceAction):
+            def func(value):
+                return os.getpid()
+
+        self.parser.add_argument(
+            "--n", nargs="+", action=ProcessIdAction, processes=2
+        )
+        args = self.parser.parse_args(["--n", "a", "b"])
+        self.assertEqual(args.n, [os.getpid()] * 2)
+
+    def test_on_unpicklable_values(self):
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            action = self.ProcessIdAction(["--n"], "n", executor=executor)
+            self.assertEqual(
+                list(action._map_user_func([_Unpicklable("a"), "b"])),
+                [os.getpid()] * 2,
+            )
+
+    def test_on_process_pool_executor(self):
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            self.parser.add_argument(
+                "--n",
+                nargs="+",
+                action=self.ProcessIdAction,
+                executor=executor,
+            )
+            args = self.parser.parse_args(["--n", "a", "b"])
+        self.assertNotIn(os.getpid(), args.n)
+
+    def test_on_loading_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files = []
+            for index in range(5):
+                files.append(os.path.join(directory, "{}.json".format(index)))
+                with open(files[-1], "w") as f:
+                    json.dump({"index": index}, f)
+
+            self.parser.add_argument(
+                "--json",
+                nargs="+",
+                action=LoadJSONFromFileAction,
+                processes=2,
+                chunksize=2,
+            )
+            args = self.parser.parse_args(["--json", *files])
+            self.assertEqual(args.json, [{"index": i} for i in range(5)])
+
+            with open(files[3], "w") as f:
+                f.write("{")
+            with self.assertRaises(ValueError) as context:
+                self.parser.parse_args(["--json", *files])
+            self.assertIn("JSONDecodeError in file", str(context.exception))
+
+    def test_on_invalid_options(self):
+        for options in [
+            {"processes": 0},
+            {"processes": "2"},
+            {"processes": 2, "workers": 2},
+            {"processes": 2, "chunksize": 0},
+            {"processes": 2, "memoize": "parse"},
+        ]:
+            with self.assertRaises(ValueError):
+                self.parser.add_argument(
+                    "--n", action=self.IsEvenAction, **options
+                )
+
+
+class TestDebugAction(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=PipelineAction,
+            action_values=[UpperAction, DebugAction],
+        )
+        self.values = ["v{}".format(i) for i in range(1000)]
+
+    def debug(self, output, **environment):
+        with mock.patch.dict(
+            os.environ, dict(environment, ACTION_HERO_DEBUG=output)
+        ):
+            return capture_output(
+                self.parser.parse_args, ["--n", *self.values]
+            )
+
+    def test_on_text(self):
+        output = self.debug("text")
+        self.assertIn("│ dest: n", output)
+        self.assertIn(
+            "│ values(list): ['V0', 'V111', 'V222', 'V333', 'V444', 'V555', "
+            "'V666', 'V777', 'V888', 'V999'] (10 of 1,000 values)",
+            output,
+        )
+        self.assertIn("│ pipeline step: 2 of 2", output)
+        self.assertNotIn("V1,", output)
+
+    def test_on_json(self):
+        with tempfile.TemporaryFile() as f:
+            self.assertEqual(
+                self.debug("json", ACTION_HERO_DEBUG_FD=str(f.fileno())), ""
+            )
+            f.seek(0)
+            (line,) = f.read().decode("utf-8").splitlines()
+
+        record = json.loads(line)
+        self.assertEqual(record["dest"], "n")
+        self.assertEqual(record["values"]["count"], 1000)
+        self.assertEqual(len(record["values"]["sample"]), 10)
+        self.assertEqual(record["namespace"]["n"]["count"], 1000)
+        self.assertEqual(record["attributes"]["nargs"], "+")
+        self.assertEqual(record["pipeline"]["index"], 1)
+        self.assertEqual(
+            record["pipeline"]["previous"], "UpperAction"
+        )
+        self.assertGreaterEqual(
+            record["parse_elapsed"], record["pipeline"]["elapsed"]
+        )
+
+    def test_on_json_written_in_parts(self):
+        write = os.write
+        with tempfile.TemporaryFile() as f, mock.patch(
+            "os.write", side_effect=lambda fd, data: write(fd, data[:100])
+        ):
+            self.debug("json", ACTION_HERO_DEBUG_FD=str(f.fileno()))
+            f.seek(0)
+            (line,) = f.read().decode("utf-8").splitlines()
+
+        self.assertEqual(json.loads(line)["dest"], "n")
+
+    def test_on_off(self):
+        self.assertEqual(self.debug("off"), "")
+
+    def test_on_outside_pipeline(self):
+        parser = ExitCapturedArgumentParser()
+        parser.add_argument("--d", action=DebugAction)
+        output = capture_output(parser.parse_args, ["--d", "x"])
+        self.assertIn("│ values(str): x", output)
+        self.assertNotIn("pipeline", output)
+
+
+class UpperAction(MapAndReplaceAction):
+    def func(value):
+        return value.upper()
+
+
+class TestFailureReport(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+
+        class IsEvenAction(CheckAction):
+            func = _is_even
+            error_message = "Odd"
+
+        class IsKnownAction(CheckPresentInValuesAction):
+            def func(value):
+                return value
+
+            error_message = "Unknown"
+
+        self.IsEvenAction = IsEvenAction
+        self.IsKnownAction = IsKnownAction
+        self.odd = [str(number) for number in range(1, 1000, 2)]
+
+    def test_on_failures_shown_bounded(self):
+        self.parser.add_argument("--n", nargs="+", action=self.IsEvenAction)
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--n", *self.odd])
+        message = str(context.exception)
+        self.assertIn(
+            "Odd: {} …and 400 more failing value(s)".format(
+                ", ".join(self.odd[:100])
+            ),
+            message,
+        )
+        self.assertNotIn(self.odd[100], message)
+
+    def test_on_failures_shown(self):
+        self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, failures_shown=2
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--n", "1", "2", "3", "5"])
+        self.assertIn(
+            "Odd: 1, 3 …and 1 more failing value(s)", str(context.exception)
+        )
+
+    def test_on_failures_with_values_not_checked(self):
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=self.IsEvenAction,
+            failures_shown=1,
+            max_failures=2,
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--n", "1", "3", "5"])
+        self.assertIn(
+            "Odd: 1 …and 1 more failing value(s) …and 1 more value(s) not "
+            "checked",
+            str(context.exception),
+        )
+
+    def test_on_failures_on_error(self):
+        action = self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction
+        )
+        with self.assertRaises(FailedValuesError) as context:
+            action(self.parser, argparse.Namespace(), ["2", *self.odd])
+        self.assertIsInstance(context.exception, argparse.ArgumentError)
+        self.assertEqual(context.exception.failures, self.odd)
+        self.assertEqual(context.exception.not_checked, 0)
+        self.assertIsNone(context.exception.failures_file)
+
+    def test_on_failures_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "failures.txt")
+            for index, failures_file in enumerate([path, True]):
+                action = self.parser.add_argument(
+                    "--n{}".format(index),
+                    nargs="+",
+                    action=self.IsEvenAction,
+                    failures_file=failures_file,
+                )
+                with self.assertRaises(FailedValuesError) as context:
+                    action(self.parser, argparse.Namespace(), self.odd)
+
+                written = context.exception.failures_file
+                self.assertIn(
+                    "(all failing values are listed in {})".format(written),
+                    str(context.exception),
+                )
+                with open(written) as f:
+                    self.assertEqual(f.read().splitlines(), self.odd)
+                if failures_file is True:
+                    os.remove(written)
+                else:
+                    self.assertEqual(written, path)
+
+    def test_on_failures_file_only_when_failures_not_shown(self):
+        action = self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, failures_file=True
+        )
+        with self.assertRaises(FailedValuesError) as context:
+            action(self.parser, argparse.Namespace(), ["1"])
+        self.assertIsNone(context.exception.failures_file)
+
+    def test_on_check_present_in_values(self):
+        action = self.parser.add_argument(
+            "--word",
+            nargs="+",
+            action=self.IsKnownAction,
+            action_values=["a"],
+            failures_shown=1,
+        )
+        with self.assertRaises(FailedValuesError) as context:
+            action(self.parser, argparse.Namespace(), ["b", "a", "c"])
+        self.assertIn("Unknown: b …and 1 more", str(context.exception))
+        self.assertEqual(context.exception.failures, ["b", "c"])
+
+    def test_on_collect_into_dict(self):
+        action = self.parser.add_argument(
+            "--pairs",
+            nargs="+",
+            action=CollectIntoDictAction,
+            action_values=["="],
+            failures_shown=1,
+        )
+        with self.assertRaises(FailedValuesError) as context:
+            action(self.parser, argparse.Namespace(), ["a", "b=c", "d"])
+        self.assertIn(
+            'Delimiter(s) "=" not present in: a …and 1 more failing value(s)',
+            str(context.exception),
+        )
+        self.assertEqual(context.exception.failures, ["a", "d"])
+
+    def test_on_invalid_options(self):
+        for options in [
+            {"failures_shown": 0},
+            {"failures_shown": "1"},
+            {"failures_file": 1},
+        ]:
+            with self.assertRaises(ValueError):
+                self.parser.add_argument(
+                    "--n", action=self.IsEvenAction, **options
+                )
+
+
+class TestStreamValues(ActionHeroTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "numbers.txt")
+        with open(self.path, "w") as f:
+            f.write("".join("{}\n".format(number) for number in range(25)))
+
+        class IsEvenAction(CheckAction):
+            func = _is_even
+            error_message = "Odd"
+            stream_chunk_size = 10
+
+        class DoubleAction(MapAndReplaceAction):
+            def func(value):
+                return int(value) * 2
+
+            stream_chunk_size = 10
+
+        self.IsEvenAction = IsEvenAction
+        self.DoubleAction = DoubleAction
+
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_on_check_of_file(self):
+        self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, stream_values=True
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--n", "@" + self.path])
+        self.assertIn(
+            "Odd: 1, 3, 5, 7, 9, 11, 13, 15, 17, 19, 21, 23",
+            str(context.exception),
+        )
+
+    def test_on_checked_values_stored(self):
+        with open(self.path, "w") as f:
+            f.write("2\n4\n")
+        self.parser.add_argument(
+            "--n", nargs="+", action=self.IsEvenAction, stream_values=True
+        )
+        with mock.patch("sys.stdin", io.StringIO("6\n8\n")):
+            args = self.parser.parse_args(["--n", "@" + self.path, "-"])
+        self.assertIsInstance(args.n, StreamedValues)
+        self.assertEqual(list(args.n), ["2", "4", "6", "8"])
+        self.assertEqual(list(args.n), ["2", "4", "6", "8"])
+
+    def test_on_checked_values_kept_when_file_changes(self):
+        with open(self.path, "w") as f:
+            f.write("2\n4\n")
+        self.parser.add_argument(
+            "--n", action=self.IsEvenAction, stream_values=True
+        )
+        args = self.parser.parse_args(["--n", "@" + self.path])
+        with open(self.path, "w") as f:
+            f.write("1\n")
+        self.assertEqual(list(args.n), ["2", "4"])
+
+    def test_on_max_failures_over_chunks(self):
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=self.IsEvenAction,
+            stream_values=True,
+            max_failures=7,
+        )
+        with self.assertRaises(ValueError) as context:
+            self.parser.parse_args(["--n", "@" + self.path])
+        self.assertIn(
+            "Odd: 1, 3, 5, 7, 9, 11, 13 …and 11 more value(s) not checked",
+            str(context.exception),
+        )
+
+    def test_on_map_of_stdin(self):
+        self.parser.add_argument(
+            "--n", action=self.DoubleAction, stream_values=True
+        )
+        with mock.patch("sys.stdin", io.StringIO("1\n2\n")):
+            args = self.parser.parse_args(["--n", "-"])
+        self.assertEqual(list(args.n), [2, 4])
+
+    def test_on_mapped_values_kept_as_returned(self):
+        class SplitAction(MapAndReplaceAction):
+            def func(value):
+                return {value: "{}\n{}".format(value, value)}
+
+        self.parser.add_argument(
+            "--n", nargs="+", action=SplitAction, stream_values=True
+        )
+        with mock.patch("sys.stdin", io.StringIO("1\n2\n")):
+            args = self.parser.parse_args(["--n", "-"])
+        self.assertEqual(list(args.n), [{"1": "1\n1"}, {"2": "2\n2"}])
+
+    def test_on_lazy_map(self):
+        calls = []
+
+        class CountedDoubleAction(self.DoubleAction):
+            def func(value):
+                calls.append(value)
+                return int(value) * 2
+
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=CountedDoubleAction,
+            stream_values=True,
+            lazy_values=True,
+        )
+        args = self.parser.parse_args(["--n", "@" + self.path])
+        self.assertEqual(calls, [])
+        self.assertEqual(list(args.n), [number * 2 for number in range(25)])
+        self.assertEqual(len(calls), 25)
+
+    def test_on_pipeline(self):
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=PipelineAction,
+            action_values=[self.DoubleAction, self.IsEvenAction],
+            stream_values=True,
+        )
+        args = self.parser.parse_args(["--n", "@" + self.path])
+        self.assertEqual(list(args.n), [number * 2 for number in range(25)])
+
+    def test_on_lazy_pipeline(self):
+        self.parser.add_argument(
+            "--n",
+            nargs="+",
+            action=PipelineAction,
+            action_values=[self.IsEvenAction, self.DoubleAction],
+            stream_values=True,
+            lazy_values=True,
+        )
+        args = self.parser.parse_args(["--n", "@" + self.path])
+        with self.assertRaises(FailedValuesError):
+            list(args.n)
+
+    def test_on_sources_not_streamed_by_default(self):
+        self.parser.add_argument("--n", nargs="+", action=self.DoubleAction)
+        with self.assertRaises(ValueError):
+            self.parser.parse_args(["--n", "@" + self.path])
+
+    def test_on_lazy_values_without_stream_values(self):
+        with self.assertRaises(ValueError):
+            self.parser.add_argument(
+                "--n", action=self.DoubleAction, lazy_values=True
+            )